@@ -1,161 +1,555 @@
 ### PYTHON PROGRAM TO IMPLEMENT A* SEARCH ALGORITHM
 
-import math
+from array import array
 import heapq
+import math
+import random
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+INF = float("inf")
+SQRT2 = math.sqrt(2)
+
+# (row step, column step) of the moves, straight moves first
+STRAIGHT_MOVES = ((0, -1), (0, 1), (1, 0), (-1, 0))
+DIAGONAL_MOVES = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+Cell = Tuple[int, int]
+
+
+# Define the grid
+class Grid:
+    """
+    Occupancy grid of any size, stored row-major in one flat bytearray (non-zero = free, 0 = blocked),
+    so a million-cell map takes one megabyte instead of a million Cell objects.
+    Cell (row, col) is at position row * cols + col.
+    """
+
+    __slots__ = ("rows", "cols", "cells")
+
+    def __init__(self, rows: int, cols: int, cells: bytearray):
+        if len(cells) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cells, got {len(cells)}")
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+
+    @classmethod
+    def from_data(cls, data) -> "Grid":
+        """
+        This function builds a grid from a list of rows or a 2-D NumPy-like array
+        (anything with a 2-D `shape` that compares element-wise, e.g. numpy.ndarray).
+        Non-zero values are free cells, zeros are blocked. NumPy itself is not imported.
+
+        Args:
+            data: The occupancy values.
+
+        Returns:
+            Grid: The grid.
+        """
+        if isinstance(data, Grid):
+            return data
+
+        shape = getattr(data, "shape", None)
+        if shape is not None:
+            if len(shape) != 2:
+                raise ValueError(f"Expected a 2-D array, got shape {tuple(shape)}")
+            rows, cols = (int(size) for size in shape)
+            # Element-wise comparison gives a boolean array; its bytes are 0/1 in row-major order
+            return cls(rows, cols, bytearray((data != 0).tobytes(order="C")))
+
+        cells = bytearray()
+        cols = None
+        for row in data:
+            row_cells = bytes(map(bool, row))
+            if cols is None:
+                cols = len(row_cells)
+            elif len(row_cells) != cols:
+                raise ValueError("All rows of the grid must have the same length")
+            cells += row_cells
+        cols = cols or 0
+        return cls(len(cells) // cols if cols else 0, cols, cells)
+
+    # Check if a cell is valid (within the grid)
+    def is_valid(self, row: int, col: int) -> bool:
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    # Check if a cell is unblocked
+    def is_unblocked(self, row: int, col: int) -> bool:
+        return self.cells[row * self.cols + col] != 0
+
+
+# Calculate the heuristic value of a cell
+def octile_distance(row: int, col: int, dest: Cell) -> float:
+    """
+    This function returns the octile distance to the destination: the cost of the shortest
+    path on an empty 8-connected grid (straight moves cost 1, diagonal moves sqrt(2)).
+    """
+    d_row = abs(row - dest[0])
+    d_col = abs(col - dest[1])
+    return d_row + d_col + (SQRT2 - 2) * min(d_row, d_col)
+
+
+def manhattan_distance(row: int, col: int, dest: Cell) -> float:
+    """
+    This function returns the Manhattan distance to the destination (4-connected grids).
+    """
+    return abs(row - dest[0]) + abs(col - dest[1])
 
-# Define Cell class
-class Cell:
-    def __init__(self):
-        # Parent cell's row index
-        self.parent_i = 0
-        # Parent cell's column index
-        self.parent_j = 0
-        # Total cost of the cell (g + h)
-        self.f = float("inf")
-        # Cost from start to this cell
-        self.g = float("inf")
-        # Heuristic cost from this cell to destination
-        self.h = 0
-
-# Define the size of the grid
-ROW = 9
-COL = 10
-
-# Check if a cell is valid (within the grid)
-def is_valid(row, col):
-    return (row >= 0) and (row < ROW) and (col >= 0) and (col < COL)
-
-# Check if a cell is unblocked
-def is_unblocked(grid, row, col):
-    return grid[row][col] == 1
-
-# Check if a cell is the destination
-def is_destination(row, col, dest):
-    return row == dest[0] and col == dest[1]
-
-# Calculate the heuristic value of a cell (Euclidean distance to destination)
-def calculate_h_value(row, col, dest):
-    return ((row - dest[0]) ** 2 + (col - dest[1]) ** 2) ** 0.5
 
 # Trace the path from source to destination
-def trace_path(cell_details, dest):
-    print("The path is ")
+def trace_path(parents: array, cols: int, dest_index: int) -> List[Cell]:
+    """
+    This function traces the path back from the destination through the flat parent array.
+
+    Args:
+        parents (array): Parent position of every reached cell (-1 for the source).
+        cols (int): The number of columns of the grid.
+        dest_index (int): The position of the destination cell.
+
+    Returns:
+        List[Cell]: The (row, col) cells from the source to the destination.
+    """
     path = []
-    row = dest[0]
-    col = dest[1]
-
-    # Trace the path from destination to source using parent cells
-    while not (cell_details[row][col].parent_i == row and
-               cell_details[row][col].parent_j == col):
-        path.append((row, col))
-        temp_row = cell_details[row][col].parent_i
-        temp_col = cell_details[row][col].parent_j
-        row = temp_row
-        col = temp_col
-
-    # Add the source cell to the path
-    path.append((row, col))
-    
+    current = dest_index
+    while current >= 0:
+        path.append(divmod(current, cols))
+        current = parents[current]
+
     # Reverse the path to get the path from source to destination
     path.reverse()
+    return path
 
-    # Print the path
-    for i in path:
-        print("->", i, end=" ")
-    print()
 
-    # Implement the A* (Star) Search Algorithm
-def a_star_search(grid, src, dest):
+def path_cost(path: Sequence[Cell]) -> float:
+    """
+    This function returns the cost of a path (1 per straight move, sqrt(2) per diagonal move).
+    """
+    return sum(SQRT2 if first[0] != second[0] and first[1] != second[1] else 1.0
+               for first, second in zip(path, path[1:]))
+
+
+def _check_endpoints(grid: Grid, src: Sequence[int], dest: Sequence[int]) -> None:
     # Check if the source and destination are valid
-    if not is_valid(src[0], src[1]) or not is_valid(dest[0], dest[1]):
-        print("Source or destination is invalid")
-        return
-    
+    if not grid.is_valid(src[0], src[1]) or not grid.is_valid(dest[0], dest[1]):
+        raise ValueError("Source or destination is invalid")
+
+
+# Implement the A* (Star) Search Algorithm
+def a_star_search(grid, src: Sequence[int], dest: Sequence[int], connectivity: int = 8,
+                  corner_cutting: bool = False, stats: Optional[dict] = None,
+                  jump_points: bool = False) -> Optional[List[Cell]]:
+    """
+    This function finds a shortest path between two cells with the A* algorithm.
+
+    The g values, parents and closed flags are kept in flat typed arrays indexed by the cell
+    position, and the open list holds (f, position) tuples only, so no object is created per cell.
+
+    Args:
+        grid (Grid, list of rows or 2-D NumPy-like array): The map, non-zero cells are free.
+        src (Sequence[int]): The (row, col) of the source cell.
+        dest (Sequence[int]): The (row, col) of the destination cell.
+        connectivity (int): 4 (straight moves only, Manhattan heuristic) or 8 (diagonal moves
+            cost sqrt(2), octile heuristic).
+        corner_cutting (bool): Allow a diagonal move next to a blocked cell.
+        stats (dict, optional): Receives "expanded" and "pushes" counters.
+        jump_points (bool): Use Jump Point Search (see jump_point_search), 8-connectivity without corner cutting only.
+
+    Returns:
+        Optional[List[Cell]]: The cells from the source to the destination, or None if the
+        destination cannot be reached (or one of the two cells is blocked).
+
+    Raises:
+        ValueError: If the source or destination is outside the grid, or connectivity is not 4 or 8.
+    """
+    if connectivity not in (4, 8):
+        raise ValueError("connectivity must be 4 or 8")
+    if jump_points:
+        if connectivity != 8 or corner_cutting:
+            raise ValueError("Jump Point Search needs connectivity=8 and corner_cutting=False")
+        return jump_point_search(grid, src, dest, stats)
+    grid = Grid.from_data(grid)
+    _check_endpoints(grid, src, dest)
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    dest = (dest[0], dest[1])
+
     # Check if the source and destination are unblocked
-    if not is_unblocked(grid, src[0], src[1] or not is_unblocked(grid, dest[0], dest[1])):
-        print("Source or destination is blocked")
-        return
-    
-    # Check if we are already at the destination
-    if is_destination(src[0], src[1], dest):
-        print("We are already at he destination")
-        return
-    
-    # Initialize the closed list (visited cells)
-    closed_list = [[False for _ in range(COL)] for _ in range(ROW)]
-
-    # Initialize the details of each cell
-    cell_details = [[Cell() for _ in range(COL)] for _ in range(ROW)]
-
-    # Initialize the start cell details
-    i = src[0]
-    j = src[1]
-    cell_details[i][j].f = 0
-    cell_details[i][j].g= 0
-    cell_details[i][j].h = 0
-    cell_details[i][j].parent_i = i
-    cell_details[i][j].parent_j = j
+    if not grid.is_unblocked(src[0], src[1]) or not grid.is_unblocked(dest[0], dest[1]):
+        return None
 
-    # Initialize the open list (cells to be visited) with the start cell
-    open_list = []
-    heapq.heappush(open_list, (0.0, i, j))
+    heuristic = octile_distance if connectivity == 8 else manhattan_distance
+    moves = [(d_row, d_col, 1.0) for d_row, d_col in STRAIGHT_MOVES]
+    if connectivity == 8:
+        moves += [(d_row, d_col, SQRT2) for d_row, d_col in DIAGONAL_MOVES]
+
+    size = rows * cols
+    g = array("d", [INF]) * size
+    parents = array("i" if size < 2 ** 31 else "q", [-1]) * size
+    closed = bytearray(size)
+
+    src_index = src[0] * cols + src[1]
+    dest_index = dest[0] * cols + dest[1]
+    g[src_index] = 0.0
 
-    # Initialize the flag for whether destination is found
-    found_dest = False
+    # Initialize the open list (cells to be visited) with the start cell
+    open_list = [(heuristic(src[0], src[1], dest), src_index)]
+    expanded = 0
+    pushes = 1
+    path = None
 
     # Main loop of the A* (Star) Search Algorithm
-    while len(open_list) > 0:
+    while open_list:
         # Pop the cell with the lowest f value from the open list
-        p = heapq.heappop(open_list)
+        _, current = heapq.heappop(open_list)
+        if closed[current]:
+            continue # Outdated queue entry
+        closed[current] = 1
+        expanded += 1
+
+        if current == dest_index:
+            path = trace_path(parents, cols, dest_index)
+            break
 
-        # Mark the cell as visited
-        i = p[1]
-        j = p[2]
-        closed_list[i][j] = True
+        row, col = divmod(current, cols)
+        current_g = g[current]
 
         # For each direction, check the successors
-        directions = [(0, -1), (0, 1), (1, 0), (-1, 0),
-                      (1, 1), (1, -1), (-1, 1), (-1, -1)]
-        
-        for dir in directions:
-            new_i = i + dir[0]
-            new_j = j + dir[1]
-
-            # If the successor is valid, unblocked, and not visited
-            if is_valid(new_i, new_j) and is_unblocked(grid, new_i, new_j) and not closed_list[new_i][new_j]:
-                # If the successoris the destination
-                if is_destination(new_i, new_j, dest):
-                    # Set the parent of the destination cell
-                    cell_details[new_i][new_j].parent_i = i
-                    cell_details[new_i][new_j].parent_j = j
-                    print("The destination cell is found")
-
-                    #Trace and print the path from source to destination
-                    trace_path(cell_details, dest)
-                    found_dest = True
-                    return
-            else:
-                # Calculate the new f, g, and h values
-                g_new = cell_details[i][j].g + 1.0
-                h_new = calculate_h_value(new_i, new_j, dest)
-                f_new = g_new + h_new
-
-                # If the cell is not in the open list or the new f value is smaller
-                if cell_details[new_i][new_j].f == float("inf") or cell_details[new_i][new_j].f > f_new:
-                    
-                    # Add the cell to the open list
-                    heapq.heappush(open_list, (f_new, new_i, new_j))
-
-                    # Update the cell details
-                    cell_details[new_i][new_j].f = f_new
-                    cell_details[new_i][new_j].g = g_new
-                    cell_details[new_i][new_j].h = h_new
-                    cell_details[new_i][new_j].parent_i = i
-                    cell_details[new_i][new_j].parent_j = j
-
-    # If the destination is not found after visiting all cells
-    if not found_dest:
-        print("Failed to find the destination cell")
+        for d_row, d_col, cost in moves:
+            new_row = row + d_row
+            new_col = col + d_col
+            if not (0 <= new_row < rows and 0 <= new_col < cols):
+                continue
+            neighbor = new_row * cols + new_col
+            if not cells[neighbor] or closed[neighbor]:
+                continue
+            if d_row and d_col and not corner_cutting and \
+                    not (cells[row * cols + new_col] and cells[new_row * cols + col]):
+                continue # Diagonal move would squeeze past a blocked cell
+
+            g_new = current_g + cost
+            if g_new < g[neighbor]:
+                g[neighbor] = g_new
+                parents[neighbor] = current
+                heapq.heappush(open_list, (g_new + heuristic(new_row, new_col, dest), neighbor))
+                pushes += 1
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["pushes"] = pushes
+    return path
+
+# Jump Point Search (JPS)
+def _walkable(cells: bytearray, rows: int, cols: int, row: int, col: int) -> bool:
+    return 0 <= row < rows and 0 <= col < cols and cells[row * cols + col] != 0
+
+
+# Maps free cells (any non-zero value) to 0 and blocked cells to 1, so find(0) on the result finds a free cell
+_WALLS = bytes([1] + [0] * 255)
+
+
+class _ScanGrids:
+    """
+    The grid of a JPS search in the layouts its straight scans need: row-major for scans along a row and
+    transposed (column-major) for scans along a column, each with its inverse (walls), so a scan finds the
+    next blocked or free cell with bytearray.find / rfind instead of a Python loop over the cells.
+    """
+
+    __slots__ = ("cells", "walls", "columns", "column_walls")
+
+    def __init__(self, cells: bytearray, rows: int, cols: int):
+        self.cells = cells
+        self.walls = cells.translate(_WALLS)
+        self.columns = b"".join(cells[col::cols] for col in range(cols)) if rows else b""
+        self.column_walls = self.columns.translate(_WALLS)
+
+
+def _scan(cells, walls, width: int, height: int, line: int, start: int, step: int,
+          target: Optional[int]) -> Optional[int]:
+    """
+    This function scans row `line` of a row-major width x height grid from column `start` in direction
+    `step` (+1 or -1) and returns the column of the first jump point: the target column, or a cell with a
+    forced neighbor (an open side cell whose cell behind is blocked, so optimal paths can only reach it
+    through this cell). Returns None if the run ends at an obstacle or the border first.
+    """
+    if not 0 <= start < width:
+        return None
+    here = line * width
+    sides = [side * width for side in (line - 1, line + 1) if 0 <= side < height]
+
+    if step > 0:
+        blocked = cells.find(0, here + start, here + width)
+        end = (here + width if blocked < 0 else blocked) - here # First column after the run
+        best = target if target is not None and start <= target < end else end
+        for side in sides:
+            # First side cell that is open right after a blocked one (the cell behind start is start - 1)
+            wall = cells.find(0, side + start - 1, side + best)
+            if wall >= 0:
+                opened = walls.find(0, wall + 1, side + best)
+                if opened >= 0:
+                    best = opened - side
+        return best if best < end else None
+
+    blocked = cells.rfind(0, here, here + start + 1)
+    end = blocked - here if blocked >= 0 else -1 # Last column before the run
+    best = target if target is not None and end < target <= start else end
+    for side in sides:
+        wall = cells.rfind(0, side + best + 2, side + start + 2)
+        if wall >= 0:
+            opened = walls.rfind(0, side + best + 1, wall)
+            if opened >= 0:
+                best = opened - side
+    return best if best > end else None
+
+
+def _jump(grids: _ScanGrids, rows: int, cols: int, row: int, col: int, d_row: int, d_col: int,
+          dest: Cell) -> Optional[Cell]:
+    """
+    This function moves from (row, col) in the direction (d_row, d_col) until it reaches a jump point
+    (see _scan). Diagonal moves never cut corners, and a diagonal run stops where one of its two
+    straight components finds a jump point.
+
+    Returns:
+        Optional[Cell]: The jump point, or None if the direction runs into an obstacle or the border.
+    """
+    cells = grids.cells
+    dest_row, dest_col = dest
+    if not d_row:
+        found = _scan(cells, grids.walls, cols, rows, row, col, d_col, dest_col if dest_row == row else None)
+        return None if found is None else (row, found)
+    if not d_col:
+        found = _scan(grids.columns, grids.column_walls, rows, cols, col, row, d_row,
+                      dest_row if dest_col == col else None)
+        return None if found is None else (found, col)
+
+    walls, columns, column_walls = grids.walls, grids.columns, grids.column_walls
+    while 0 <= row < rows and 0 <= col < cols and cells[row * cols + col]:
+        if row == dest_row and col == dest_col:
+            return row, col
+        if _scan(columns, column_walls, rows, cols, col, row + d_row, d_row,
+                 dest_row if dest_col == col else None) is not None or \
+                _scan(cells, walls, cols, rows, row, col + d_col, d_col,
+                      dest_col if dest_row == row else None) is not None:
+            return row, col
+
+        # The next diagonal step needs both straight cells open
+        if not (_walkable(cells, rows, cols, row + d_row, col) and _walkable(cells, rows, cols, row, col + d_col)):
+            return None
+        row += d_row
+        col += d_col
+    return None
+
+
+def _pruned_neighbors(cells: bytearray, rows: int, cols: int, row: int, col: int,
+                      d_row: int, d_col: int) -> List[Cell]:
+    """
+    This function returns the neighbors JPS has to look at when it arrived at (row, col) moving in
+    direction (d_row, d_col); (0, 0) at the source returns every allowed neighbor.
+    """
+    def walkable(r: int, c: int) -> bool:
+        return _walkable(cells, rows, cols, r, c)
+
+    neighbors = []
+    if d_row and d_col:
+        if walkable(row + d_row, col):
+            neighbors.append((row + d_row, col))
+        if walkable(row, col + d_col):
+            neighbors.append((row, col + d_col))
+        if walkable(row + d_row, col) and walkable(row, col + d_col):
+            neighbors.append((row + d_row, col + d_col))
+    elif d_col:
+        next_open = walkable(row, col + d_col)
+        up_open = walkable(row - 1, col)
+        down_open = walkable(row + 1, col)
+        if next_open:
+            neighbors.append((row, col + d_col))
+            if up_open:
+                neighbors.append((row - 1, col + d_col))
+            if down_open:
+                neighbors.append((row + 1, col + d_col))
+        if up_open:
+            neighbors.append((row - 1, col))
+        if down_open:
+            neighbors.append((row + 1, col))
+    elif d_row:
+        next_open = walkable(row + d_row, col)
+        left_open = walkable(row, col - 1)
+        right_open = walkable(row, col + 1)
+        if next_open:
+            neighbors.append((row + d_row, col))
+            if left_open:
+                neighbors.append((row + d_row, col - 1))
+            if right_open:
+                neighbors.append((row + d_row, col + 1))
+        if left_open:
+            neighbors.append((row, col - 1))
+        if right_open:
+            neighbors.append((row, col + 1))
+    else:
+        for step_row, step_col in STRAIGHT_MOVES + DIAGONAL_MOVES:
+            if walkable(row + step_row, col + step_col) and \
+                    walkable(row + step_row, col) and walkable(row, col + step_col):
+                neighbors.append((row + step_row, col + step_col))
+    return neighbors
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+def jump_point_search(grid, src: Sequence[int], dest: Sequence[int],
+                      stats: Optional[dict] = None) -> Optional[List[Cell]]:
+    """
+    This function finds a shortest path on an 8-connected grid (no corner cutting) with Jump Point Search.
+
+    On uniform-cost grids many paths of equal cost differ only in the order of their moves. JPS
+    expands only "jump points" where the direction of an optimal path may have to change, and
+    skips the cells in between in straight or diagonal runs, so far fewer cells enter the open list.
+    The path has the same cost as the one of a_star_search(grid, src, dest).
+
+    Fewer expanded cells do not always mean less time here: the straight scans run in C
+    (bytearray.find), but a diagonal run still steps cell by cell in Python and scans both straight
+    directions at every step. On mazes JPS is faster than a_star_search; on open and cluttered maps,
+    where the diagonal runs are long or jump points are dense, it is slower in wall time (see benchmark).
+
+    Args:
+        grid (Grid, list of rows or 2-D NumPy-like array): The map, non-zero cells are free.
+        src (Sequence[int]): The (row, col) of the source cell.
+        dest (Sequence[int]): The (row, col) of the destination cell.
+        stats (dict, optional): Receives "expanded" (jump points) and "pushes" counters.
+
+    Returns:
+        Optional[List[Cell]]: Every cell from the source to the destination, or None if there is no path.
+
+    Raises:
+        ValueError: If the source or destination is outside the grid.
+    """
+    grid = Grid.from_data(grid)
+    _check_endpoints(grid, src, dest)
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    dest = (dest[0], dest[1])
+
+    if not grid.is_unblocked(src[0], src[1]) or not grid.is_unblocked(dest[0], dest[1]):
+        return None
+
+    size = rows * cols
+    g = array("d", [INF]) * size
+    parents = array("i" if size < 2 ** 31 else "q", [-1]) * size
+    closed = bytearray(size)
+
+    src_index = src[0] * cols + src[1]
+    dest_index = dest[0] * cols + dest[1]
+    g[src_index] = 0.0
+
+    grids = _ScanGrids(cells, rows, cols)
+    open_list = [(octile_distance(src[0], src[1], dest), src_index)]
+    expanded = 0
+    pushes = 1
+    path = None
+
+    while open_list:
+        _, current = heapq.heappop(open_list)
+        if closed[current]:
+            continue # Outdated queue entry
+        closed[current] = 1
+        expanded += 1
+
+        if current == dest_index:
+            # Fill in the cells between consecutive jump points
+            jump_points = trace_path(parents, cols, dest_index)
+            path = [jump_points[0]]
+            for row, col in jump_points[1:]:
+                step_row = _sign(row - path[-1][0])
+                step_col = _sign(col - path[-1][1])
+                while path[-1] != (row, col):
+                    path.append((path[-1][0] + step_row, path[-1][1] + step_col))
+            break
+
+        row, col = divmod(current, cols)
+        parent = parents[current]
+        if parent < 0:
+            d_row = d_col = 0
+        else:
+            parent_row, parent_col = divmod(parent, cols)
+            d_row = _sign(row - parent_row)
+            d_col = _sign(col - parent_col)
+
+        for next_row, next_col in _pruned_neighbors(cells, rows, cols, row, col, d_row, d_col):
+            jump_point = _jump(grids, rows, cols, next_row, next_col, next_row - row, next_col - col, dest)
+            if jump_point is None:
+                continue
+            neighbor = jump_point[0] * cols + jump_point[1]
+            if closed[neighbor]:
+                continue
+
+            # Jump points are reached by a straight or diagonal run, so the octile distance is the exact cost
+            g_new = g[current] + octile_distance(row, col, jump_point)
+            if g_new < g[neighbor]:
+                g[neighbor] = g_new
+                parents[neighbor] = current
+                heapq.heappush(open_list, (g_new + octile_distance(jump_point[0], jump_point[1], dest), neighbor))
+                pushes += 1
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["pushes"] = pushes
+    return path
+
+
+# Benchmark maps
+def open_map(rows: int, cols: int, obstacle_ratio: float = 0.1, seed: int = 0) -> Grid:
+    """
+    This function generates an open map with randomly scattered blocked cells.
+    """
+    rng = random.Random(seed)
+    return Grid(rows, cols, bytearray(0 if rng.random() < obstacle_ratio else 1 for _ in range(rows * cols)))
+
+
+def maze_map(rows: int, cols: int, seed: int = 0) -> Grid:
+    """
+    This function generates a maze (depth-first "recursive backtracker") with corridors one cell wide.
+    """
+    rng = random.Random(seed)
+    cells = bytearray(rows * cols)
+    cells[0] = 1
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + d_row, col + d_col, d_row // 2, d_col // 2)
+                   for d_row, d_col in ((0, 2), (0, -2), (2, 0), (-2, 0))
+                   if 0 <= row + d_row < rows and 0 <= col + d_col < cols
+                   and not cells[(row + d_row) * cols + col + d_col]]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col, half_row, half_col = rng.choice(options)
+        cells[(row + half_row) * cols + col + half_col] = 1
+        cells[next_row * cols + next_col] = 1
+        stack.append((next_row, next_col))
+    return Grid(rows, cols, cells)
+
+
+def benchmark(size: int = 301, seed: int = 0) -> None:
+    """
+    This function compares plain A* and JPS (expanded cells, heap pushes, time, path cost)
+    between the opposite corners of an open map, a cluttered map and a maze.
+    JPS expands and pushes far fewer cells, but on the open and cluttered maps it takes longer than
+    A* in wall time (its diagonal runs step through Python code); on the maze it is faster.
+    """
+    maps = (("open", open_map(size, size, 0.02, seed)),
+            ("clutter", open_map(size, size, 0.1, seed)),
+            ("maze", maze_map(size, size, seed)))
+    for name, grid in maps:
+        src, dest = (0, 0), (size - 1, size - 1)
+        grid.cells[0] = grid.cells[-1] = 1
+        for label, search in (("A*", a_star_search), ("JPS", jump_point_search)):
+            stats = {}
+            started = time.perf_counter()
+            path = search(grid, src, dest, stats=stats)
+            elapsed = time.perf_counter() - started
+            cost = "no path" if path is None else f"cost {path_cost(path):.2f}"
+            print(f"{name:<7} {label:<4} expanded {stats['expanded']:>8} pushes {stats['pushes']:>8} "
+                  f"{elapsed * 1000:9.1f} ms  {cost}")
 
 # Driver Code
 
@@ -178,10 +572,22 @@ def main():
     dest = [0, 0]
 
     # Run the A* (Star) Search Algorithm
-    a_star_search(grid, src, dest)
+    path = a_star_search(grid, src, dest, corner_cutting=True)
+    if path is None:
+        print("Failed to find the destination cell")
+        return
+
+    print("The destination cell is found")
+    print("The path is ")
+    for cell in path:
+        print("->", cell, end=" ")
+    print()
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        main()
 
 
 # Output will be
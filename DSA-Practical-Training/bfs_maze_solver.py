@@ -1,9 +1,15 @@
+from array import array
 from collections import deque
+import mmap
+import sys
 
 def bfs_maze_solver(maze, start, end):
     """
     BFS Maze Solver
 
+    Every queue entry keeps its own copy of the path, which is easy to follow but needs a lot of
+    memory on big mazes; use solve_maze for those.
+
     Args:
         maze (list of list): Maze matrix (0 -> passable, 1 -> obstacle)
         start (tuple): Start position (row, col)
@@ -18,18 +24,15 @@ def bfs_maze_solver(maze, start, end):
 
     # BFS queue (current position and the road so far)
     queue = deque([(start, [start])])
-    visited = set() # Already visited nodes
+    visited = {start} # Already queued nodes, marked when queued so no node is queued twice
 
     while queue:
         (current, path) = queue.popleft()
 
-        # Mark the current node as visited
-        visited.add(current)
-
         # Check if end is reached
         if current == end:
             return path
-        
+
         # Explore neighbors
         for direction in directions:
             neighbor = (current[0] + direction[0], current[1] + direction[1])
@@ -40,11 +43,236 @@ def bfs_maze_solver(maze, start, end):
                 maze[neighbor[0]][neighbor[1]] == 0 and # Check if not an obstacle
                 neighbor not in visited): # Check if already visited
 
+                visited.add(neighbor)
                 queue.append((neighbor, path + [neighbor]))
 
     # If no path is found, return None
     return None
 
+
+# Cell states used by solve_maze, one byte per cell
+OPEN = 0 # Passable, not reached yet
+WALL = 255
+SOURCE = 5
+# State code of a cell reached by a move up, down, left or right: 1, 2, 3, 4
+UP, DOWN, LEFT, RIGHT = 1, 2, 3, 4
+
+# Rows translated to cell states at a time when a maze is prepared (keeps the extra memory small)
+CHUNK_SIZE = 1 << 20
+
+
+class Maze:
+    """
+    Maze of any size stored as one byte (or pixel) per cell in row-major order.
+
+    `cells` may be a bytes object or a memoryview over a memory-mapped image, and `table` is a
+    256-byte translation table that maps every cell value to OPEN or WALL, so an 8-bit image
+    can be used as it is on disk.
+    """
+
+    __slots__ = ("rows", "cols", "cells", "table", "_mapped")
+
+    def __init__(self, rows: int, cols: int, cells, table: bytes, mapped=None):
+        if len(cells) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cells, got {len(cells)}")
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.table = table
+        self._mapped = mapped
+
+    @classmethod
+    def from_rows(cls, maze) -> "Maze":
+        """
+        This function builds a maze from a matrix like the one of bfs_maze_solver (0 -> passable, 1 -> obstacle).
+        """
+        cells = bytearray()
+        cols = len(maze[0]) if maze else 0
+        for row in maze:
+            if len(row) != cols:
+                raise ValueError("All rows of the maze must have the same length")
+            cells += bytes(1 if value else 0 for value in row)
+        return cls(len(maze), cols, bytes(cells), bytes([OPEN] + [WALL] * 255))
+
+    def states(self) -> bytearray:
+        """
+        This function returns a fresh state byte per cell (OPEN or WALL), translated chunk by chunk.
+        """
+        states = bytearray(len(self.cells))
+        for offset in range(0, len(self.cells), CHUNK_SIZE):
+            chunk = bytes(self.cells[offset:offset + CHUNK_SIZE])
+            states[offset:offset + len(chunk)] = chunk.translate(self.table)
+        return states
+
+    def close(self) -> None:
+        if self._mapped is not None:
+            self.cells = b""
+            self._mapped.close()
+            self._mapped = None
+
+
+def _header_tokens(data, count: int):
+    """
+    This function reads the first `count` whitespace-separated header tokens of a PBM/PGM file
+    (skipping # comments) and returns them with the offset of the pixel data.
+    """
+    tokens = []
+    position = 0
+    while len(tokens) < count:
+        while data[position:position + 1].isspace():
+            position += 1
+        if data[position:position + 1] == b"#":
+            while data[position:position + 1] not in (b"\n", b"\r", b""):
+                position += 1
+            continue
+        start = position
+        while position < len(data) and not data[position:position + 1].isspace():
+            position += 1
+        tokens.append(bytes(data[start:position]))
+    # Exactly one whitespace byte separates the header from binary pixel data
+    return tokens, position + 1
+
+
+def load_maze(path: str, threshold: int = 128) -> Maze:
+    """
+    This function opens a maze image in PBM or PGM format (export it from any image editor).
+
+    Binary 8-bit PGM files (P5) are memory-mapped and used in place: pixels darker than the threshold
+    are walls. Bit-packed PBM files (P4, black = wall) are unpacked to one byte per cell, and ASCII
+    P1/P2 files are parsed.
+
+    Args:
+        path (str): The path of the image.
+        threshold (int): Grey level from which a PGM pixel is passable.
+
+    Returns:
+        Maze: The maze (call close() to release the mapping).
+
+    Raises:
+        ValueError: If the file is not a supported PBM/PGM image.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic = mapped[:2]
+    if magic in (b"P4", b"P1"):
+        (_, width, height), offset = _header_tokens(mapped, 3)
+        cols, rows = int(width), int(height)
+        if magic == b"P4":
+            row_bytes = (cols + 7) // 8
+            # Every packed byte becomes 8 cell bytes, the padding bits at the end of a row are cut off
+            unpack = [bytes((value >> shift) & 1 for shift in range(7, -1, -1)) for value in range(256)]
+            cells = bytearray()
+            for row in range(rows):
+                start = offset + row * row_bytes
+                cells += b"".join(unpack[value] for value in mapped[start:start + row_bytes])[:cols]
+        else:
+            cells = bytearray(int(bit) for bit in mapped[offset - 1:].split() for bit in bit.decode())
+        mapped.close()
+        return Maze(rows, cols, bytes(cells[:rows * cols]), bytes([OPEN] + [WALL] * 255))
+
+    if magic in (b"P5", b"P2"):
+        (_, width, height, maxval), offset = _header_tokens(mapped, 4)
+        cols, rows, maxval = int(width), int(height), int(maxval)
+        if maxval > 255:
+            mapped.close()
+            raise ValueError(f"{path}: only 8-bit PGM images are supported")
+        table = bytes(WALL if value < threshold * maxval // 255 else OPEN for value in range(256))
+        if magic == b"P5":
+            if len(mapped) < offset + rows * cols:
+                mapped.close()
+                raise ValueError(f"{path} is truncated")
+            return Maze(rows, cols, memoryview(mapped)[offset:offset + rows * cols], table, mapped)
+        cells = bytes(int(value) for value in mapped[offset - 1:].split())
+        mapped.close()
+        return Maze(rows, cols, cells, table)
+
+    mapped.close()
+    raise ValueError(f"{path} is not a PBM/PGM image")
+
+
+def solve_maze(maze, start, end):
+    """
+    BFS maze solver for large mazes (millions of cells)
+
+    Instead of a path copy per queue entry, every cell gets one state byte: wall, not reached, or
+    the direction of the move that reached it (the predecessor). Cells are marked when they are
+    queued, so each one enters the frontier once. The search advances one whole frontier (BFS
+    level) at a time: the positions of a level are kept in a flat array and expanded direction
+    by direction. A 10k x 10k maze needs 100 MB of state plus the frontiers.
+
+    Unlike bfs_maze_solver, a start or end cell that is a wall gives None: bfs_maze_solver does not
+    check the start cell and walks out of it (and returns [start] when start == end).
+
+    Args:
+        maze (Maze or list of list): Maze object (see load_maze) or matrix (0 -> passable, 1 -> obstacle)
+        start (tuple): Start position (row, col)
+        end (tuple): End position (row, col)
+
+    Returns:
+        list: Shortest path from start to end (step by step), or None if there is none
+
+    Raises:
+        ValueError: If start or end is outside the maze
+    """
+    if not isinstance(maze, Maze):
+        maze = Maze.from_rows(maze)
+    rows, cols = maze.rows, maze.cols
+    for row, col in (start, end):
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError("Start or end is outside the maze")
+
+    states = maze.states()
+    size = rows * cols
+    source = start[0] * cols + start[1]
+    target = end[0] * cols + end[1]
+    if states[source] == WALL or states[target] == WALL:
+        return None
+
+    typecode = "i" if size < 2 ** 31 else "q"
+    states[source] = SOURCE
+    frontier = array(typecode, [source])
+
+    while frontier and states[target] == OPEN:
+        next_frontier = array(typecode)
+        append = next_frontier.append
+
+        # One direction at a time over the whole level: a short loop without per-move tuples
+        for position in frontier:
+            above = position - cols
+            if above >= 0 and states[above] == OPEN:
+                states[above] = UP
+                append(above)
+        for position in frontier:
+            below = position + cols
+            if below < size and states[below] == OPEN:
+                states[below] = DOWN
+                append(below)
+        for position in frontier:
+            if position % cols and states[position - 1] == OPEN:
+                states[position - 1] = LEFT
+                append(position - 1)
+        for position in frontier:
+            if (position + 1) % cols and states[position + 1] == OPEN:
+                states[position + 1] = RIGHT
+                append(position + 1)
+
+        frontier = next_frontier
+
+    if states[target] == OPEN:
+        return None
+
+    # Walk back against the stored moves
+    steps = {UP: -cols, DOWN: cols, LEFT: -1, RIGHT: 1}
+    path = []
+    position = target
+    while position != source:
+        path.append(divmod(position, cols))
+        position -= steps[states[position]]
+    path.append(divmod(source, cols))
+    path.reverse()
+    return path
+
 # Example maze
 maze = [
     [0, 1, 0, 0, 0],
@@ -60,9 +288,16 @@ end = (4, 4) # Right lower corner
 
 # Run BFS maze solver
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # python bfs_maze_solver.py maze.pgm: from the upper left to the lower right corner
+        image = load_maze(sys.argv[1])
+        shortest_path = solve_maze(image, (0, 0), (image.rows - 1, image.cols - 1))
+        image.close()
+        print("No path found" if shortest_path is None else f"Shortest path: {len(shortest_path) - 1} steps")
+        sys.exit()
+
     shortest_path = bfs_maze_solver(maze, start, end)
     if shortest_path:
         print("Shortest path:", shortest_path)
     else:
         print("No path found")
-
@@ -1,6 +1,7 @@
 '''
 Breadth First Search Graph Traversal
 '''
+from collections import deque
 
 graph = {
     "A": ["B", "C"],
@@ -12,27 +13,33 @@ graph = {
 }
 
 def bfs(graph, source):
-    queue = []
-    queue.append(source)
+    # deque.popleft is O(1), list.pop(0) shifts the whole list
+    queue = deque([source])
+    visited = {source} # Without it a cycle in the graph would be walked forever
     while queue:
-        current = queue.pop(0)
-        print(current)
+        current = queue.popleft()
+        yield current
         for node in graph[current]:
-            queue.append(node)
+            if node not in visited:
+                visited.add(node)
+                queue.append(node)
 
-bfs(graph, "A")
+for node in bfs(graph, "A"):
+    print(node)
 
 
 def BFS(root):
-    queue = []
-    queue.append(root)
+    # Level by level: every pass of the outer loop yields the values of one tree level
+    queue = deque([root])
 
     while queue:
         n = len(queue)
+        level = []
         for _ in range(n):
-            node = queue.pop(0)
-            print(node.val)
+            node = queue.popleft()
+            level.append(node.val)
             if node.left:
                 queue.append(node.left)
             if node.right:
-                queue.append(node.right)
\ No newline at end of file
+                queue.append(node.right)
+        yield level
@@ -0,0 +1,151 @@
+import heapq
+import math
+import random
+import unittest
+
+from a_star_algorithm_example import Grid, a_star_search, jump_point_search, maze_map, open_map, path_cost
+
+DEMO_GRID = [
+    [1, 0, 1, 1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 0, 1, 1, 1, 0, 1, 1],
+    [1, 1, 1, 0, 1, 1, 0, 1, 0, 1],
+    [0, 0, 1, 0, 1, 0, 0, 0, 0, 1],
+    [1, 1, 1, 0, 1, 1, 1, 0, 1, 0],
+    [1, 0, 1, 1, 1, 1, 0, 1, 0, 0],
+    [1, 0, 0, 0, 0, 1, 0, 0, 0, 1],
+    [1, 0, 1, 1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 0, 0, 0, 1, 0, 0, 1],
+]
+
+
+def reference_cost(grid, src, dest, connectivity=8, corner_cutting=False):
+    # Cell-by-cell Dijkstra over the list of rows, as the example computed paths before the flat arrays
+    rows, cols = len(grid), len(grid[0])
+    if not grid[src[0]][src[1]] or not grid[dest[0]][dest[1]]:
+        return None
+    moves = [(0, -1), (0, 1), (1, 0), (-1, 0)]
+    if connectivity == 8:
+        moves += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+    best = {tuple(src): 0.0}
+    queue = [(0.0, tuple(src))]
+    while queue:
+        cost, (row, col) = heapq.heappop(queue)
+        if (row, col) == tuple(dest):
+            return cost
+        if cost > best[row, col]:
+            continue
+        for d_row, d_col in moves:
+            new_row, new_col = row + d_row, col + d_col
+            if not (0 <= new_row < rows and 0 <= new_col < cols) or not grid[new_row][new_col]:
+                continue
+            if d_row and d_col and not corner_cutting and not (grid[row][new_col] and grid[new_row][col]):
+                continue
+            new_cost = cost + (math.sqrt(2) if d_row and d_col else 1.0)
+            if new_cost < best.get((new_row, new_col), math.inf):
+                best[new_row, new_col] = new_cost
+                heapq.heappush(queue, (new_cost, (new_row, new_col)))
+    return None
+
+
+def random_grid(rng: random.Random, rows: int, cols: int, blocked: float):
+    # Free cells get different non-zero values, every one of them must count as free
+    return [[0 if rng.random() < blocked else rng.choice((1, 1, 7, 255)) for _ in range(cols)] for _ in range(rows)]
+
+
+class PathTestCase(unittest.TestCase):
+    def assert_valid_path(self, grid, path, src, dest, connectivity=8, corner_cutting=False):
+        self.assertEqual((path[0], path[-1]), (tuple(src), tuple(dest)))
+        for (row, col), (new_row, new_col) in zip(path, path[1:]):
+            d_row, d_col = new_row - row, new_col - col
+            self.assertTrue(max(abs(d_row), abs(d_col)) == 1, (row, col, new_row, new_col))
+            self.assertTrue(grid[new_row][new_col])
+            if d_row and d_col:
+                self.assertEqual(connectivity, 8)
+                if not corner_cutting:
+                    self.assertTrue(grid[row][new_col] and grid[new_row][col], (row, col, new_row, new_col))
+
+
+class GridPathTest(PathTestCase):
+    def assert_matches_reference(self, grid, src, dest, connectivity, corner_cutting):
+        expected = reference_cost(grid, src, dest, connectivity, corner_cutting)
+        path = a_star_search(grid, src, dest, connectivity, corner_cutting)
+        if expected is None:
+            self.assertIsNone(path)
+            return
+        self.assert_valid_path(grid, path, src, dest, connectivity, corner_cutting)
+        self.assertAlmostEqual(path_cost(path), expected)
+
+    def test_demo_grid(self):
+        for connectivity in (4, 8):
+            for corner_cutting in (False, True):
+                self.assert_matches_reference(DEMO_GRID, (8, 0), (0, 0), connectivity, corner_cutting)
+                self.assert_matches_reference(DEMO_GRID, (0, 0), (8, 9), connectivity, corner_cutting)
+
+    def test_random_grids(self):
+        rng = random.Random(5)
+        for _ in range(150):
+            rows, cols = rng.randint(1, 14), rng.randint(1, 14)
+            grid = random_grid(rng, rows, cols, rng.choice((0.0, 0.2, 0.35)))
+            src = (rng.randrange(rows), rng.randrange(cols))
+            dest = (rng.randrange(rows), rng.randrange(cols))
+            for connectivity in (4, 8):
+                for corner_cutting in (False, True):
+                    self.assert_matches_reference(grid, src, dest, connectivity, corner_cutting)
+
+    def test_any_non_zero_value_is_free(self):
+        # A grid built straight from image bytes: 255 = free
+        cells = bytearray(255 if value else 0 for row in DEMO_GRID for value in row)
+        grid = Grid(9, 10, cells)
+        self.assertTrue(grid.is_unblocked(0, 0))
+        self.assertFalse(grid.is_unblocked(0, 1))
+        for corner_cutting in (False, True):
+            self.assertEqual(a_star_search(grid, (8, 0), (0, 0), corner_cutting=corner_cutting),
+                             a_star_search(DEMO_GRID, (8, 0), (0, 0), corner_cutting=corner_cutting))
+
+    def test_blocked_endpoint_and_invalid_arguments(self):
+        self.assertIsNone(a_star_search(DEMO_GRID, (0, 1), (0, 0)))
+        with self.assertRaises(ValueError):
+            a_star_search(DEMO_GRID, (9, 0), (0, 0))
+        with self.assertRaises(ValueError):
+            a_star_search(DEMO_GRID, (8, 0), (0, 0), connectivity=6)
+
+
+class JumpPointSearchTest(PathTestCase):
+    def assert_same_cost_as_a_star(self, grid, src, dest):
+        expected = a_star_search(grid, src, dest)
+        path = jump_point_search(grid, src, dest)
+        if expected is None:
+            self.assertIsNone(path)
+            return
+        rows = grid if isinstance(grid, list) else [grid.cells[row * grid.cols:(row + 1) * grid.cols]
+                                                    for row in range(grid.rows)]
+        self.assert_valid_path(rows, path, src, dest) # Also checks that no corner is cut
+        self.assertAlmostEqual(path_cost(path), path_cost(expected))
+
+    def test_random_grids(self):
+        rng = random.Random(9)
+        for _ in range(300):
+            rows, cols = rng.randint(1, 16), rng.randint(1, 16)
+            grid = random_grid(rng, rows, cols, rng.choice((0.0, 0.1, 0.25, 0.4)))
+            for _ in range(3):
+                src = (rng.randrange(rows), rng.randrange(cols))
+                dest = (rng.randrange(rows), rng.randrange(cols))
+                self.assert_same_cost_as_a_star(grid, src, dest)
+
+    def test_benchmark_maps(self):
+        for seed in range(3):
+            for grid in (open_map(41, 37, 0.02, seed), open_map(41, 37, 0.1, seed), maze_map(41, 37, seed)):
+                grid.cells[0] = grid.cells[-1] = 1
+                self.assert_same_cost_as_a_star(grid, (0, 0), (40, 36))
+                self.assert_same_cost_as_a_star(grid, (40, 36), (0, 0))
+
+    def test_demo_grid_and_blocked_endpoint(self):
+        self.assert_same_cost_as_a_star(DEMO_GRID, (8, 0), (0, 0))
+        self.assert_same_cost_as_a_star(DEMO_GRID, (0, 0), (8, 9))
+        self.assertIsNone(jump_point_search(DEMO_GRID, (0, 1), (0, 0)))
+        with self.assertRaises(ValueError):
+            a_star_search(DEMO_GRID, (8, 0), (0, 0), corner_cutting=True, jump_points=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
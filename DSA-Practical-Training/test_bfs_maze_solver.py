@@ -0,0 +1,111 @@
+import os
+import random
+import tempfile
+import unittest
+
+from bfs_maze_solver import Maze, bfs_maze_solver, load_maze, solve_maze
+
+# 11 columns, so the rows of a P4 file end in padding bits
+GRID = [
+    [0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0],
+    [1, 0, 1, 0, 1, 1, 1, 0, 1, 0, 1],
+    [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+    [0, 1, 1, 1, 1, 0, 1, 1, 1, 1, 0],
+    [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+]
+
+
+def image_bytes(magic: str, grid) -> bytes:
+    rows, cols = len(grid), len(grid[0])
+    if magic == "P1":
+        body = "\n".join(" ".join(str(value) for value in row) for row in grid)
+        return f"P1\n# wall = 1\n{cols} {rows}\n{body}\n".encode()
+    if magic == "P4":
+        packed = bytearray()
+        for row in grid:
+            bits = row + [0] * (-cols % 8)
+            packed += bytes(int("".join(map(str, bits[start:start + 8])), 2) for start in range(0, len(bits), 8))
+        return f"P4\n{cols} {rows}\n".encode() + bytes(packed)
+    if magic == "P2":
+        # maxval 15: the threshold scales with it, 0 is a wall and 15 is free
+        body = "\n".join(" ".join("0" if value else "15" for value in row) for row in grid)
+        return f"P2\n{cols} {rows}\n15\n{body}\n".encode()
+    return f"P5\n# comment\n{cols} {rows}\n255\n".encode() + bytes(0 if value else 255 for row in grid for value in row)
+
+
+def path_is_valid(grid, path, start, end) -> bool:
+    if path[0] != start or path[-1] != end:
+        return False
+    for (row, col), (new_row, new_col) in zip(path, path[1:]):
+        if abs(row - new_row) + abs(col - new_col) != 1 or grid[new_row][new_col]:
+            return False
+    return True
+
+
+class MazeImageTest(unittest.TestCase):
+    def open_image(self, magic: str, grid=GRID) -> Maze:
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "maze." + ("pbm" if magic in ("P1", "P4") else "pgm"))
+        with open(path, "wb") as file:
+            file.write(image_bytes(magic, grid))
+        maze = load_maze(path)
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(os.remove, path)
+        self.addCleanup(maze.close)
+        return maze
+
+    def test_every_format(self):
+        start, end = (0, 0), (4, 10)
+        expected = bfs_maze_solver(GRID, start, end)
+        for magic in ("P1", "P2", "P4", "P5"):
+            maze = self.open_image(magic)
+            self.assertEqual((maze.rows, maze.cols), (5, 11), magic)
+            self.assertEqual(maze.states(), Maze.from_rows(GRID).states(), magic)
+            path = solve_maze(maze, start, end)
+            self.assertTrue(path_is_valid(GRID, path, start, end), magic)
+            self.assertEqual(len(path), len(expected), magic)
+
+    def test_wall_at_start_or_end(self):
+        for magic in ("P1", "P2", "P4", "P5"):
+            maze = self.open_image(magic)
+            # bfs_maze_solver does not check the start cell and walks out of it, solve_maze refuses it
+            self.assertIsNotNone(bfs_maze_solver(GRID, (1, 0), (4, 10)))
+            self.assertIsNone(solve_maze(maze, (1, 0), (4, 10)), magic)
+            self.assertIsNone(solve_maze(maze, (0, 0), (0, 2)), magic)
+            self.assertIsNone(bfs_maze_solver(GRID, (0, 0), (0, 2)))
+
+    def test_not_an_image(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "maze.png")
+        with open(path, "wb") as file:
+            file.write(b"\x89PNG\r\n")
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(os.remove, path)
+        with self.assertRaises(ValueError):
+            load_maze(path)
+
+
+class SolveMazeTest(unittest.TestCase):
+    def test_matches_bfs_maze_solver(self):
+        rng = random.Random(2)
+        for _ in range(200):
+            rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+            grid = [[int(rng.random() < 0.3) for _ in range(cols)] for _ in range(rows)]
+            start = (rng.randrange(rows), rng.randrange(cols))
+            end = (rng.randrange(rows), rng.randrange(cols))
+            grid[start[0]][start[1]] = 0
+            expected = bfs_maze_solver(grid, start, end)
+            path = solve_maze(grid, start, end)
+            if expected is None:
+                self.assertIsNone(path)
+                continue
+            self.assertTrue(path_is_valid(grid, path, start, end))
+            self.assertEqual(len(path), len(expected))
+
+    def test_outside_the_maze(self):
+        with self.assertRaises(ValueError):
+            solve_maze(GRID, (0, 0), (5, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,22 +1,53 @@
-from collections import defaultdict, deque
-import heapq
-from typing import Dict, List, Tuple, Optional
+from collections import defaultdict
+import os
+import threading
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Optional
+
+from alternative_routes import k_shortest_routes
+from batch_queries import many_to_many_times
+from contraction_hierarchy import ContractionHierarchy, build_contraction_hierarchy
+from csr_graph import CSRGraph, build_csr
+from graph_traversal import bfs_levels
+from landmarks import LandmarkHeuristic, build_landmark_heuristic
+from route_cache import MISSING, RouteCache
+from network_snapshot import load_snapshot, save_snapshot
+from passenger_flow import PassengerFlowResult, simulate_passenger_flow
+import route_search
+from route_search import SearchStats
+from timetable_routing import Timetable, build_timetable
+from travel_time_matrix import TravelTimeMatrix, build_travel_time_matrix, open_travel_time_matrix
+
+# Search algorithms accepted by MetroNetwork.find_fastest_route
+FASTEST_ROUTE_METHODS = ("astar", "bidirectional", "ch")
 
 class Station:
-    def __init__(self, idx: str, name: str, line: str):        
+    # No per-instance __dict__, large networks hold hundreds of thousands of stations
+    __slots__ = ("idx", "name", "line", "index", "_neighbors", "_frozen")
+
+    def __init__(self, idx: str, name: str, line: str, index: int = 0):
         self.idx = idx
         self.name = name
         self.line = line
-        self.neighbors: List[Tuple["Station", int]] = [] # (Station, time) tuples
-
-        # Parent station's index (for backtracking)
-        self.parent_station = None
-        # Total time to the station (g + h)
-        self.f = float("inf")
-        # Time from start to this station
-        self.g = float("inf")
-        # Heuristic time from this station to destination
-        self.h = 0
+        # Position of the station in the network (0, 1, 2, ...), search state is keyed by it
+        self.index = index
+        self._neighbors: List[Tuple["Station", int]] = [] # (Station, time) tuples, used while building
+        # Frozen graph the neighbors are read from on first access (network loaded from a snapshot)
+        self._frozen: Optional[CSRGraph] = None
+
+    @property
+    def neighbors(self) -> List[Tuple["Station", int]]:
+        if self._frozen is not None:
+            graph = self._frozen
+            stations = graph.stations
+            self._neighbors = [(stations[target], time) for target, time in graph.neighbors(self.index)]
+            self._frozen = None
+        return self._neighbors
+
+    @neighbors.setter
+    def neighbors(self, neighbors: List[Tuple["Station", int]]) -> None:
+        self._neighbors = neighbors
+        self._frozen = None
 
     def add_neighbor(self, station: "Station", time: int):
         self.neighbors.append((station, time))
@@ -27,162 +58,787 @@ class Station:
 
     
 class MetroNetwork:
-    def __init__(self):
+    # Class of the station objects the network creates (a subclass adds e.g. the Turkish names of metro_simulation.Istasyon)
+    station_class = Station
+
+    def __init__(self, cache_size: int = 1024, cache_ttl: Optional[float] = None):
         self.stations: Dict[str, Station] = {}
         self.lines: Dict[str, List[Station]] = defaultdict(list)
+        # Increased on every change of the graph, precomputed tables compare against it
+        self.version = 0
+        self._csr: Optional[CSRGraph] = None
+        self._landmark_heuristic: Optional[LandmarkHeuristic] = None
+        self._travel_time_matrix: Optional[TravelTimeMatrix] = None
+        self._contraction_hierarchy: Optional[ContractionHierarchy] = None
+        self._timetable: Optional[Timetable] = None
+        # Memory map of the snapshot the network was loaded from (see load)
+        self._snapshot = None
+        # True while Station.neighbors lists are not filled yet (network loaded from a snapshot)
+        self._neighbors_pending = False
+        self._build_lock = threading.RLock()
+        # Results of find_fastest_route / find_least_transfer_route for popular station pairs
+        self.route_cache = RouteCache(cache_size, cache_ttl)
+        # Called as search_observer((start_id, dest_id, mode), SearchStats) after every route query,
+        # e.g. to log slow queries; None (the default) keeps the searches free of bookkeeping
+        self.search_observer: Optional[Callable[[Tuple[str, str, str], SearchStats], None]] = None
 
     def add_station(self, idx: str, name: str, line: str) -> None:
+        self._thaw()
         if idx not in self.stations:
-            station = Station(idx, name, line)
+            station = self.station_class(idx, name, line, len(self.stations))
             self.stations[idx] = station
             self.lines[line].append(station)
+            self.version += 1
 
     def add_connection(self, station1_id: str, station2_id: str, time: int) -> None:
+        self._thaw()
         station1 = self.stations[station1_id]
         station2 = self.stations[station2_id]
         station1.add_neighbor(station2, time)
         station2.add_neighbor(station1, time)
+        self.version += 1
+
+    def add_stations(self, stations: Iterable[Tuple[str, str, str]]) -> None:
+        """
+        This function adds many stations at once (see gtfs_loader.load_gtfs). The network version
+        is increased once for the whole batch instead of once per station.
+
+        Args:
+            stations (Iterable[Tuple[str, str, str]]): (idx, name, line) tuples.
+        """
+        self._thaw()
+        added = False
+        for idx, name, line in stations:
+            if idx not in self.stations:
+                station = self.station_class(idx, name, line, len(self.stations))
+                self.stations[idx] = station
+                self.lines[line].append(station)
+                added = True
+        if added:
+            self.version += 1
+
+    def add_connections(self, connections: Iterable[Tuple[str, str, int]]) -> None:
+        """
+        This function adds many two-way connections at once (see gtfs_loader.load_gtfs).
+        The network version is increased once for the whole batch.
+
+        Args:
+            connections (Iterable[Tuple[str, str, int]]): (station1_id, station2_id, time) tuples.
+        """
+        self._thaw()
+        stations = self.stations
+        added = False
+        for station1_id, station2_id, time in connections:
+            station1 = stations[station1_id]
+            station2 = stations[station2_id]
+            station1.neighbors.append((station2, time))
+            station2.neighbors.append((station1, time))
+            added = True
+        if added:
+            self.version += 1
+
+    def update_connection_time(self, station1_id: str, station2_id: str, time: int) -> None:
+        """
+        This function changes the travel time of the connection between two stations
+        (of every connection, if there are several between them).
+
+        The frozen graph, the landmark tables and the travel time matrix are repaired instead of
+        being built again, and only the cached routes the change can affect are dropped. Queries
+        running meanwhile keep the previous versions (see _change_connections).
+
+        Args:
+            station1_id (str): The index of one station.
+            station2_id (str): The index of the other station.
+            time (int): The new travel time.
+
+        Raises:
+            KeyError: If a station is unknown or the stations are not connected.
+        """
+        self._change_connections([(station1_id, station2_id)], time)
+
+    def remove_connection(self, station1_id: str, station2_id: str) -> None:
+        """
+        This function removes the connection between two stations (every connection, if there are
+        several between them). Precomputed tables are repaired as in update_connection_time.
+
+        Args:
+            station1_id (str): The index of one station.
+            station2_id (str): The index of the other station.
+
+        Raises:
+            KeyError: If a station is unknown or the stations are not connected.
+        """
+        self._change_connections([(station1_id, station2_id)], None)
+
+    def close_station(self, idx: str) -> None:
+        """
+        This function closes a station by removing all of its connections. The station stays in
+        the network and on its line, but no route can pass through it any more.
+
+        Args:
+            idx (str): The index of the station.
+
+        Raises:
+            KeyError: If the station is unknown.
+        """
+        station = self.stations[idx]
+        self._thaw()
+        neighbor_ids = dict.fromkeys(neighbor.idx for neighbor, _ in station.neighbors if neighbor is not station)
+        self._change_connections([(idx, neighbor_id) for neighbor_id in neighbor_ids], None)
+
+    def _change_connections(self, pairs: List[Tuple[str, str]], time: Optional[int]) -> None:
+        """
+        This function sets the time of the connections between the given station pairs (None removes
+        them) and repairs the structures built for the current version, then increases the version.
+
+        The CSR weights are patched (removed connections become inf tombstones), the landmark tables
+        and the travel time matrix are repaired with dynamic_updates.repair_distances, and the route
+        cache keeps every entry the change cannot affect. The contraction hierarchy and the timetable
+        cannot be repaired cheaply; they are built again the next time they are used.
+
+        Queries do not take the lock, so the repairs run on copies (CSRGraph.copy, LandmarkHeuristic.copy,
+        TravelTimeMatrix.copy) that replace the current structures only when they are complete. A query
+        running meanwhile keeps the consistent previous graph and tables it already holds.
+        """
+        with self._build_lock:
+            self._thaw()
+            connected = []
+            for station1_id, station2_id in pairs:
+                station1 = self.stations[station1_id]
+                station2 = self.stations[station2_id]
+                if not any(neighbor is station2 for neighbor, _ in station1.neighbors):
+                    raise KeyError(f"{station1_id} and {station2_id} are not connected")
+                connected.append((station1, station2))
+
+            # Only structures that are up to date can be repaired, stale ones are built again anyway
+            graph = self._csr if self._csr is not None and self._csr.version == self.version else None
+            heuristic = self._landmark_heuristic
+            matrix = self._travel_time_matrix
+            if graph is not None:
+                graph = graph.copy()
+                heuristic = heuristic.copy() if heuristic is not None and heuristic.version == self.version else None
+                matrix = matrix.copy() if matrix is not None and matrix.version == self.version else None
+            repairable = [structure for structure in (heuristic, matrix) if graph is not None and structure is not None]
+
+            new_time = float("inf") if time is None else time
+            faster = False
+            for station1, station2 in connected:
+                old_times = [old_time for neighbor, old_time in station1.neighbors if neighbor is station2]
+                if time is None:
+                    station1.neighbors = [entry for entry in station1.neighbors if entry[0] is not station2]
+                    station2.neighbors = [entry for entry in station2.neighbors if entry[0] is not station1]
+                else:
+                    station1.neighbors = [(neighbor, time if neighbor is station2 else old_time)
+                                          for neighbor, old_time in station1.neighbors]
+                    station2.neighbors = [(neighbor, time if neighbor is station1 else old_time)
+                                          for neighbor, old_time in station2.neighbors]
+
+                for occurrence, old_time in enumerate(old_times):
+                    faster = faster or new_time < old_time
+                    if graph is None:
+                        continue
+                    # A removed connection disappears from the live slots, so the next one is again number 0
+                    graph.set_connection_time(station1.index, station2.index,
+                                              0 if time is None else occurrence, new_time)
+                    for structure in repairable:
+                        structure.repair(graph, station1.index, station2.index, old_time, new_time)
+
+            # The repaired copies are published before the version, so a query never pairs the new
+            # version with an old structure (freeze and the other getters then wait for the lock)
+            version = self.version + 1
+            if graph is not None:
+                graph.version = version
+                self._csr = graph
+            for structure in repairable:
+                structure.version = version
+            if heuristic in repairable:
+                self._landmark_heuristic = heuristic
+            if matrix in repairable:
+                matrix.fingerprint = graph.fingerprint()
+                self._travel_time_matrix = matrix
+            self._contraction_hierarchy = None
+            self.version = version
+
+            changed = {frozenset((station1.idx, station2.idx)) for station1, station2 in connected}
+
+            def uses_changed(route) -> bool:
+                return any(frozenset((first.idx, second.idx)) in changed for first, second in zip(route, route[1:]))
+
+            def keep(key: Tuple[str, str, str], value) -> bool:
+                # Changing or removing connections never connects stations, so "no route" stays valid
+                if value is None:
+                    return True
+                if key[2].startswith("fastest"):
+                    # A slower connection only changes the fastest routes that use it,
+                    # a faster one may give a better route to any pair
+                    return not faster and not uses_changed(value[0])
+                # Transfers do not depend on travel times, only a removal can break the route
+                return time is not None or not uses_changed(value[0])
+
+            self.route_cache.retain(self.version, keep)
+
+    def save(self, path: str) -> None:
+        """
+        This function writes the network to a compact binary snapshot (see network_snapshot).
+
+        Args:
+            path (str): The path of the snapshot file.
+        """
+        save_snapshot(self.freeze(), path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "MetroNetwork":
+        """
+        This function opens a network saved with save(). The adjacency arrays are memory-mapped, so
+        the number of connections does not add to the opening time and processes that open the same
+        file share its pages; the Station objects are still created (see network_snapshot.load_snapshot).
+
+        Args:
+            path (str): The path of the snapshot file.
+            **kwargs: Arguments of MetroNetwork (cache_size, cache_ttl).
+
+        Returns:
+            MetroNetwork: The loaded network.
+        """
+        return load_snapshot(path, cls(**kwargs))
+
+    def attach_frozen_graph(self, graph: CSRGraph, snapshot=None) -> None:
+        """
+        This function makes a prebuilt CSR view the frozen graph of the network (used by load).
+        Station.neighbors lists are filled from it when they are first read or the network is changed.
+
+        Args:
+            graph (CSRGraph): The frozen graph, its stations must be the stations of this network.
+            snapshot (mmap, optional): The memory map the arrays of the graph point into.
+        """
+        graph.version = self.version
+        self._csr = graph
+        self._snapshot = snapshot
+        for station in graph.stations:
+            station._frozen = graph
+        self._neighbors_pending = True
+
+    def _thaw(self) -> None:
+        """
+        This function fills the Station.neighbors lists from the attached frozen graph, so the
+        builder API can change a network that was loaded from a snapshot.
+        """
+        if not self._neighbors_pending:
+            return
+
+        for station in self._csr.stations:
+            station.neighbors # Reading the list fills it
+        self._neighbors_pending = False
+
+    def freeze(self) -> CSRGraph:
+        """
+        This function returns the compact array-backed (CSR) view of the network that the searches run on.
+        The view is built again only if the graph was changed since the last build.
+
+        Returns:
+            CSRGraph: The up-to-date frozen graph.
+        """
+        graph = self._csr
+        if graph is None or graph.version != self.version:
+            with self._build_lock: # Concurrent queries build the view only once
+                graph = self._csr
+                if graph is None or graph.version != self.version:
+                    graph = build_csr(self)
+                    self._csr = graph
+        return graph
+
+    def landmark_heuristic(self) -> LandmarkHeuristic:
+        """
+        This function returns the landmark tables of the network, building them again
+        only if the graph was changed since the last build.
+
+        Returns:
+            LandmarkHeuristic: The up-to-date landmark heuristic.
+        """
+        heuristic = self._landmark_heuristic
+        if heuristic is None or heuristic.version != self.version:
+            with self._build_lock: # Concurrent queries build the tables only once
+                heuristic = self._landmark_heuristic
+                if heuristic is None or heuristic.version != self.version:
+                    heuristic = build_landmark_heuristic(self.freeze())
+                    self._landmark_heuristic = heuristic
+        return heuristic
+
+    def contraction_hierarchy(self) -> ContractionHierarchy:
+        """
+        This function returns the contraction hierarchy used by find_fastest_route(method="ch").
+        Building it is the expensive preprocessing step, so call it once after the network is built;
+        it is built again only if the graph was changed since.
+
+        Returns:
+            ContractionHierarchy: The up-to-date hierarchy.
+        """
+        hierarchy = self._contraction_hierarchy
+        if hierarchy is None or hierarchy.version != self.version:
+            with self._build_lock:
+                hierarchy = self._contraction_hierarchy
+                if hierarchy is None or hierarchy.version != self.version:
+                    hierarchy = build_contraction_hierarchy(self.freeze())
+                    self._contraction_hierarchy = hierarchy
+        return hierarchy
+
+    def travel_time_matrix(self, cache_path: Optional[str] = None) -> TravelTimeMatrix:
+        """
+        This function returns the station-to-station fastest travel time matrix.
+
+        The matrix is computed with one Dijkstra run per station over the CSR arrays. If a cache path
+        is given, a matrix saved there for the same graph is memory-mapped instead of recomputed, and a
+        newly computed matrix is streamed to that `.npy` file.
+
+        Args:
+            cache_path (str, optional): The `.npy` file used as a disk cache.
+
+        Returns:
+            TravelTimeMatrix: The up-to-date matrix.
+        """
+        matrix = self._travel_time_matrix
+        if matrix is not None and matrix.version == self.version:
+            return matrix
+
+        with self._build_lock:
+            matrix = self._travel_time_matrix
+            if matrix is not None and matrix.version == self.version:
+                return matrix
+
+            graph = self.freeze()
+            matrix = None
+            if cache_path is not None and os.path.exists(cache_path) and os.path.exists(cache_path + ".json"):
+                cached = open_travel_time_matrix(cache_path, graph.version)
+                if cached.fingerprint == graph.fingerprint():
+                    matrix = cached
+                else:
+                    cached.close() # Saved for another graph, compute it again
+
+            if matrix is None:
+                matrix = build_travel_time_matrix(graph, cache_path)
+
+            if self._travel_time_matrix is not None:
+                self._travel_time_matrix.close()
+            self._travel_time_matrix = matrix
+        return matrix
+
+    def travel_time(self, start_id: str, dest_id: str) -> Optional[float]:
+        """
+        This function looks up the fastest travel time between two stations in the travel time matrix (O(1), no search).
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+
+        Returns:
+            Optional[float]: The travel time or None if a station is unknown or the destination cannot be reached.
+        """
+        if start_id not in self.stations or dest_id not in self.stations:
+            return None
+
+        time = self.travel_time_matrix().time(self.stations[start_id].index, self.stations[dest_id].index)
+        return None if time == float("inf") else time
 
     def find_least_transfer(self, start_id: str, dest_id: str) -> Optional[List[Station]]:
-        """BFS algoritması kullanarak en az aktarmalı rotayı bulur
-        
-        Bu fonksiyonu tamamlayın:
-        1. Başlangıç ve hedef istasyonların varlığını kontrol edin
-        2. BFS algoritmasını kullanarak en az aktarmalı rotayı bulun
-        3. Rota bulunamazsa None, bulunursa istasyon listesi döndürün
-        4. Fonksiyonu tamamladıktan sonra, # TODO ve pass satırlarını kaldırın
-        
-        İpuçları:
-        - collections.deque kullanarak bir kuyruk oluşturun, HINT: kuyruk = deque([(baslangic, [baslangic])])
-        - Ziyaret edilen istasyonları takip edin
-        - Her adımda komşu istasyonları keşfedin
-        """
-
-        # TODO: Implement this function
-        pass
+        """
+        This function finds the route with the minimum number of line changes between two stations
+        (see find_least_transfer_route, which also returns the number of transfers).
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+
+        Returns:
+            Optional[List[Station]]: The stations of the route or None if no route exists.
+        """
+        result = self.find_least_transfer_route(start_id, dest_id)
+        if result is None:
+            return None
+        return result[0]
+
+    def find_least_transfer_route(self, start_id: str, dest_id: str,
+                                  stats: Optional[SearchStats] = None) -> Optional[Tuple[List[Station], int]]:
+        """
+        This function finds the route with the minimum number of line changes between two stations.
+        A transfer is counted every time the route moves to a station of another line (Station.line).
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+            stats (SearchStats, optional): Filled in with the work done by the query (see search_observer).
+
+        Returns:
+            Optional[Tuple[List[Station], int]]: (route, number of transfers) or None if no route exists.
+        """
         if start_id not in self.stations or dest_id not in self.stations:
             return None
-        start_station = self.stations[start_id]
-        dest_station = self.stations[dest_id]
-
-        queue = deque([(start_station, [start_station])])
-        visited = set()
-
-        while queue:
-            (current_station, path) = queue.popleft()
-
-            # Mark the current station (node) as visited
-            visited.add(current_station)
-
-            # Check if destination is arrived
-            if current_station == dest_station:
-                return path
-            
-            # Explore neighbor stations
-            for neighbor, travel_time in current_station.neighbors:
-                if neighbor not in visited:
-                    queue.append((neighbor, path + [neighbor]))
-
-            # Checking if neighbor_station is valid and not already visited
-            if neighbor not in visited:
-                queue.append((neighbor, path + [neighbor]))
-
-        # If no path is found, return None
-        return None
-
-
-    def find_fastest_route(self, start_id: str, dest_id: str) -> Optional[Tuple[List[Station], int]]:
-        """A* algoritması kullanarak en hızlı rotayı bulur
-        
-        Bu fonksiyonu tamamlayın:
-        1. Başlangıç ve hedef istasyonların varlığını kontrol edin
-        2. A* algoritmasını kullanarak en hızlı rotayı bulun
-        3. Rota bulunamazsa None, bulunursa (istasyon_listesi, toplam_sure) tuple'ı döndürün
-        4. Fonksiyonu tamamladıktan sonra, # TODO ve pass satırlarını kaldırın
-        
-        İpuçları:
-        - heapq modülünü kullanarak bir öncelik kuyruğu oluşturun, HINT: pq = [(0, id(baslangic), baslangic, [baslangic])]
-        - Ziyaret edilen istasyonları takip edin
-        - Her adımda toplam süreyi hesaplayın
-        - En düşük süreye sahip rotayı seçin
-        """
-
-        # TODO: Implement this function
-        pass
+
+        if stats is None and self.search_observer is not None:
+            stats = SearchStats()
+        started = perf_counter() if stats is not None else 0.0
+
+        key = (start_id, dest_id, "least_transfer")
+        cached = self.route_cache.get(key, self.version)
+        if cached is not MISSING:
+            self._report_search(key, stats, started, cached=True)
+            return None if cached is None else (list(cached[0]), cached[1])
+
+        graph = self.freeze()
+        version = graph.version # Taken before the search, a result of an older graph is not cached as current
+        result = route_search.least_transfers(graph, self.stations[start_id].index, self.stations[dest_id].index,
+                                              stats)
+        if result is not None:
+            route, transfers = result
+            result = ([graph.stations[index] for index in route], transfers)
+        self._report_search(key, stats, started)
+        return self._cache_route(key, version, result)
+
+    def find_fastest_route(self, start_id: str, dest_id: str, method: str = "astar",
+                           stats: Optional[SearchStats] = None) -> Optional[Tuple[List[Station], int]]:
+        """
+        This function finds the fastest route between two stations. Results are kept in route_cache
+        until the network changes.
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+            method (str): "astar" (A* with the landmark heuristic, the default), "bidirectional"
+                (bidirectional Dijkstra, expands fewer stations on long trips) or "ch" (contraction
+                hierarchy, preprocessed with contraction_hierarchy() on first use). All three find
+                the same total time.
+            stats (SearchStats, optional): Filled in with the work done by the query (expanded stations,
+                queue size, heuristic time...; see search_observer).
+
+        Returns:
+            Optional[Tuple[List[Station], int]]: (route, total_time) or None if no route exists.
+
+        Raises:
+            ValueError: If the method is unknown.
+        """
+        if method not in FASTEST_ROUTE_METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {FASTEST_ROUTE_METHODS}")
+
         if start_id not in self.stations or dest_id not in self.stations:
             return None
-        
-        start_station = self.stations[start_id]
-        dest_station = self.stations[dest_id]
-        visited = set()
-
-        # Reseting the f, g, and h values for the start station
-        for station in self.stations.values():
-            station.f = float("inf")
-            station.g = float("inf")
-            station.h = 0
-            station.parent_station = None
-
-        start_station.g = 0
-        start_station.h = self.calculate_heuristic(start_station, dest_station)
-        start_station.f = start_station.g + start_station.h
-
-        open_list = [] # Priority queue for the A* (Star) Algo
-        heapq.heappush(open_list, (start_station.f, start_station)) # including the start_station in the priority queue
-
-        while open_list:
-            f, current_station = heapq.heappop(open_list) # Extracting the station with the lowest f value from the priority queue
-            visited.add(current_station) # Mark the current station as visited
-
-            # Check if destination is reached and return the path
-            if current_station == dest_station:
-                path = self.trace_path(current_station)
-                total_time = current_station.g
-                return path, total_time
-
-            for neighbor_station, travel_time in current_station.neighbors:
-                if neighbor_station not in visited:
-                    g_new = current_station.g + travel_time
-                    h_new = self.calculate_heuristic(neighbor_station, dest_station)
-                    f_new = g_new + h_new
-
-                    if f_new < neighbor_station.f:
-                        heapq.heappush(open_list, (f_new, neighbor_station))
-                        neighbor_station.f = f_new
-                        neighbor_station.g = g_new
-                        neighbor_station.h = h_new
-                        neighbor_station.parent_station = current_station
-            
-        # print(f"Checking station: {current_station.name}, f: {f}, g: {current_station.g}, h: {current_station.h}")
-
-        # If no path is found, return None
-        return None
-
-    def trace_path(self, destination):
+
+        if stats is None and self.search_observer is not None:
+            stats = SearchStats()
+        started = perf_counter() if stats is not None else 0.0
+
+        key = (start_id, dest_id, "fastest:" + method)
+        cached = self.route_cache.get(key, self.version)
+        if cached is not MISSING:
+            self._report_search(key, stats, started, cached=True)
+            return None if cached is None else (list(cached[0]), cached[1])
+
+        graph = self.freeze()
+        version = graph.version
+        start = self.stations[start_id].index
+        dest = self.stations[dest_id].index
+
+        # The searches keep their own state, so queries may run concurrently on one network
+        if method == "bidirectional":
+            result = route_search.bidirectional_dijkstra(graph, start, dest, stats)
+        elif method == "ch":
+            result = self.contraction_hierarchy().query(start, dest, stats)
+        else:
+            heuristic = self.landmark_heuristic()
+            if heuristic.version != version:
+                # The network changed between the two calls, the lock gives a graph and tables of one version
+                with self._build_lock:
+                    graph = self.freeze()
+                    version = graph.version
+                    heuristic = self.landmark_heuristic()
+            result = route_search.a_star(graph, start, dest, heuristic.estimate, stats)
+        if result is not None:
+            route, total_time = result
+            result = ([graph.stations[index] for index in route], total_time)
+        self._report_search(key, stats, started)
+        return self._cache_route(key, version, result)
+
+    def find_pareto_routes(self, start_id: str, dest_id: str) -> List[Tuple[List[Station], float, int]]:
+        """
+        This function finds every route that is best in some trade-off of travel time and line changes
+        (the Pareto front), in one search instead of separate find_fastest_route and
+        find_least_transfer calls.
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+
+        Returns:
+            List[Tuple[List[Station], float, int]]: (route, total_time, transfers), fastest first.
+            The first entry is a fastest route and the last one a least-transfer route.
+        """
+        if start_id not in self.stations or dest_id not in self.stations:
+            return []
+
+        graph = self.freeze()
+        routes = route_search.pareto_routes(graph, self.stations[start_id].index, self.stations[dest_id].index)
+        return [([graph.stations[index] for index in route], total_time, transfers)
+                for route, total_time, transfers in routes]
+
+    def find_alternative_routes(self, start_id: str, dest_id: str, k: int = 3,
+                                max_overlap: Optional[float] = None) -> List[Tuple[List[Station], float]]:
+        """
+        This function finds up to k fastest routes without repeated stations between two stations,
+        e.g. to offer alternatives to a crowded segment (see alternative_routes.k_shortest_routes).
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+            k (int): The maximum number of routes.
+            max_overlap (float, optional): The largest share (0..1) of a route's travel time that may be
+                shared with a faster returned route, no limit by default.
+
+        Returns:
+            List[Tuple[List[Station], float]]: (route, total_time) pairs, fastest first.
+        """
+        if start_id not in self.stations or dest_id not in self.stations:
+            return []
+
+        graph = self.freeze()
+        routes = k_shortest_routes(graph, self.stations[start_id].index, self.stations[dest_id].index, k, max_overlap)
+        return [([graph.stations[index] for index in route], total_time) for route, total_time in routes]
+
+    def stations_within_hops(self, start_id: str, hops: Optional[int] = None) -> Iterator[Tuple[Station, int]]:
+        """
+        This function streams the stations that are at most `hops` stops away from a station
+        (nearest first), with their number of stops. The breadth-first search runs level by level
+        on the frozen graph and stops when the caller stops iterating.
+
+        Args:
+            start_id (str): The index of the start station.
+            hops (int, optional): The maximum number of stops, every reachable station by default.
+
+        Returns:
+            Iterator[Tuple[Station, int]]: (station, stops) pairs, starting with (start station, 0).
+        """
+        if start_id not in self.stations:
+            return
+
+        graph = self.freeze()
+        for stops, level in enumerate(bfs_levels(graph, self.stations[start_id].index, hops)):
+            for index in level:
+                yield graph.stations[index], stops
+
+    def reachable_within(self, start_id: str, minutes: float) -> Iterator[Tuple[Station, float]]:
+        """
+        This function streams the stations that can be reached from a station within a time budget
+        (e.g. an isochrone: "everything within 20 minutes"), nearest first. The Dijkstra search stops
+        at the budget, and also when the caller stops iterating.
+
+        Args:
+            start_id (str): The index of the start station.
+            minutes (float): The time budget.
+
+        Returns:
+            Iterator[Tuple[Station, float]]: (station, travel time) pairs, starting with (start station, 0).
+        """
+        if start_id not in self.stations:
+            return
+
+        graph = self.freeze()
+        for index, time in route_search.times_within(graph, self.stations[start_id].index, minutes):
+            yield graph.stations[index], time
+
+    def reachable_within_many(self, start_ids: Sequence[str], minutes: float) -> Dict[str, Dict[str, float]]:
+        """
+        This function answers reachable_within for many start stations with the same time budget.
+        If the travel time matrix is up to date, the rows of the start stations are filtered (no search),
+        otherwise one bounded Dijkstra runs per start station (see route_search.times_within).
+
+        Args:
+            start_ids (Sequence[str]): The start stations.
+            minutes (float): The time budget.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Travel time per reachable station id, per start station.
+
+        Raises:
+            KeyError: If a station is unknown.
+        """
+        sources = [self.stations[start_id].index for start_id in start_ids]
+        graph = self.freeze()
+        station_ids = [station.idx for station in graph.stations]
+
+        matrix = self._travel_time_matrix
+        if matrix is not None and matrix.version == self.version:
+            rows = [{index: time for index, time in enumerate(matrix.row(source)) if time <= minutes}
+                    for source in sources]
+        else:
+            rows = [dict(route_search.times_within(graph, source, minutes)) for source in sources]
+
+        return {start_id: {station_ids[index]: time for index, time in row.items()}
+                for start_id, row in zip(start_ids, rows)}
+
+    def one_to_many(self, start_id: str,
+                    dest_ids: Optional[Iterable[str]] = None) -> Dict[str, Tuple[List[Station], float]]:
+        """
+        This function finds the fastest routes from one station to many stations with a single
+        Dijkstra run (one shortest path tree answers every destination).
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_ids (Iterable[str], optional): The destination stations, every station by default.
+
+        Returns:
+            Dict[str, Tuple[List[Station], float]]: (route, total_time) per reachable destination.
+        """
+        if start_id not in self.stations:
+            return {}
+
+        graph = self.freeze()
+        times, parents = route_search.shortest_path_tree(graph, self.stations[start_id].index)
+
+        if dest_ids is None:
+            dest_ids = self.stations
+        routes = {}
+        for dest_id in dest_ids:
+            station = self.stations.get(dest_id)
+            if station is None or times[station.index] == float("inf"):
+                continue
+            route = route_search.tree_path(parents, station.index)
+            routes[dest_id] = ([graph.stations[index] for index in route], times[station.index])
+        return routes
+
+    def many_to_many(self, start_ids: Sequence[str], dest_ids: Sequence[str],
+                     workers: Optional[int] = None) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        This function computes the fastest travel times between two sets of stations
+        (e.g. for isochrone maps or fare-zone analysis). The start stations are spread over a
+        process pool that shares the network read-only through a memory-mapped snapshot.
+
+        Args:
+            start_ids (Sequence[str]): The start stations.
+            dest_ids (Sequence[str]): The destination stations.
+            workers (int, optional): The number of processes, os.cpu_count() by default (1 = no pool).
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: Travel time (None if unreachable) per start and destination.
+
+        Raises:
+            KeyError: If a station is unknown.
+        """
+        sources = [self.stations[start_id].index for start_id in start_ids]
+        targets = [self.stations[dest_id].index for dest_id in dest_ids]
+        rows = many_to_many_times(self, sources, targets, workers)
+
+        result = {}
+        for start_id, source in zip(start_ids, sources):
+            row = rows[source]
+            result[start_id] = {dest_id: (None if time == float("inf") else time)
+                                for dest_id, time in zip(dest_ids, row)}
+        return result
+
+    def build_timetable(self, headways: Optional[Dict[str, float]] = None, **kwargs) -> Timetable:
+        """
+        This function generates the day's trains of every line (see timetable_routing.build_timetable)
+        and makes them the timetable used by earliest_arrival.
+
+        Args:
+            headways (Dict[str, float], optional): Minutes between two trains, per line name.
+            **kwargs: default_headway, service_start, service_end (minutes after midnight).
+
+        Returns:
+            Timetable: The timetable.
+        """
+        timetable = build_timetable(self, headways, **kwargs)
+        self._timetable = timetable
+        return timetable
+
+    def simulate_passenger_flow(self, demand: Iterable[Tuple[str, str, float]], minutes: float,
+                                **kwargs) -> PassengerFlowResult:
+        """
+        This function simulates riders and trains on the network (see passenger_flow.PassengerFlowSimulation).
+
+        Args:
+            demand (Iterable[Tuple[str, str, float]]): (origin id, destination id, riders per hour) triples.
+            minutes (float): The simulated time.
+            **kwargs: headways, capacities (riders per train), default_headway, default_capacity, step, seed.
+
+        Returns:
+            PassengerFlowResult: The totals and crowding figures of the run.
+        """
+        return simulate_passenger_flow(self, demand, minutes, **kwargs)
+
+    def earliest_arrival(self, start_id: str, dest_id: str,
+                         departure_time: float) -> Optional[Tuple[List[Station], float]]:
+        """
+        This function finds the journey that arrives first when leaving the start station at the given
+        time, taking train departures into account (Connection Scan Algorithm over the timetable).
+        A timetable with the default headways is generated if build_timetable was not called,
+        and it is generated again with the same headways if the network changed since.
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+            departure_time (float): Minutes after midnight, e.g. 8 * 60 + 30 for 08:30.
+
+        Returns:
+            Optional[Tuple[List[Station], float]]: (route, arrival time in minutes after midnight) or None.
+        """
+        if start_id not in self.stations or dest_id not in self.stations:
+            return None
+
+        timetable = self._timetable
+        if timetable is None:
+            timetable = self.build_timetable()
+        elif timetable.version != self.version:
+            timetable = self.build_timetable(**timetable.parameters) # Same headways as before the change
+
+        result = timetable.earliest_arrival(self.stations[start_id].index, self.stations[dest_id].index,
+                                            departure_time)
+        if result is None:
+            return None
+        route, arrival_time = result
+        graph = self.freeze()
+        return [graph.stations[index] for index in route], arrival_time
+
+    def _report_search(self, key: Tuple[str, str, str], stats: Optional[SearchStats], started: float,
+                       cached: bool = False) -> None:
+        """
+        This function completes the stats of a query and passes them to the search observer.
+        """
+        if stats is None:
+            return
+        stats.seconds = perf_counter() - started
+        stats.cached = cached
+        if self.search_observer is not None:
+            self.search_observer(key, stats)
+
+    def _cache_route(self, key: Tuple[str, str, str], version: int, result: Optional[tuple]) -> Optional[tuple]:
+        """
+        This function stores a query result in the route cache. The route is stored as a tuple,
+        so callers that change the returned list do not change the cached route.
+        """
+        if result is None:
+            self.route_cache.put(key, version, None)
+            return None
+        route, value = result
+        self.route_cache.put(key, version, (tuple(route), value))
+        return result
+
+    def trace_path(self, destination: Station, parents: Dict[int, int]) -> List[Station]:
         """
         This function traces the path from destination station to the start station
-        using the parent station information of each station. (Backtracking)
+        using the parent mapping produced by a search. (Backtracking)
 
         Args:
             destination (Station): The destination station.
+            parents (Dict[int, int]): Parent station index of every reached station, keyed by station index.
 
         Returns:
-            List[Station]: The path from the destination station to the start station.
+            List[Station]: The path from the start station to the destination station.
         """
-        path = []
-        current_station = destination
-
-        while current_station is not None:
-            path.append(current_station)
-            current_station = current_station.parent_station # go back to the parent station
-        
-        path.reverse() # Reverse the path to get the path from start to destination
+        graph = self.freeze()
+        return [graph.stations[index] for index in route_search.trace_path(parents, destination.index)]
 
-        return path
-    
     def calculate_heuristic(self, current_station: "Station", dest_station: "Station") -> float:
         """
         This function calculates the heuristic time from the current station to the destination station.
+        The estimate is a lower bound taken from the precomputed landmark tables (ALT), so it is O(1)
+        per call and never overestimates the real travel time.
 
         Args:
             current_station (Station): The current station.
@@ -191,21 +847,7 @@ class MetroNetwork:
         Returns:
             float: The heuristic time from the current station to the destination station.
         """
-        visited = set()
-        queue = deque([(current_station, 0)]) # (station, accumulated_time)
-
-        while queue:
-            station, accumulated_time = queue.popleft()
-            if station == dest_station:
-                return accumulated_time
-        
-            visited.add(station)
-            for neighbor_station, travel_time in station.neighbors:
-                if neighbor_station not in visited:
-                    queue.append((neighbor_station, accumulated_time + travel_time))
-        
-        # If destination cannot be reached
-        return float("inf")
+        return self.landmark_heuristic().estimate(current_station.index, dest_station.index)
 
 
 # Example Usage
@@ -0,0 +1,184 @@
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+from route_search import shortest_path_tree
+
+INF = float("inf")
+
+# Paths a k_shortest_routes call may take from the candidate queue for each requested route
+# (bounds the work when max_overlap rejects most of the candidates)
+MAX_PATHS_PER_ROUTE = 10
+
+
+def _connection_time(graph: "CSRGraph", u: int, v: int) -> float:
+    """
+    This function returns the time of the fastest (not removed) connection from u to v.
+    """
+    weights = graph.weights
+    targets = graph.targets
+    best = INF
+    for slot in range(graph.offsets[u], graph.offsets[u + 1]):
+        if targets[slot] == v and weights[slot] < best:
+            best = weights[slot]
+    return best
+
+
+def _tree_spur(parents, spur: int, blocked_nodes: bytearray,
+               blocked_edges: Set[Tuple[int, int]]) -> Optional[List[int]]:
+    """
+    This function follows the reverse shortest path tree from the spur station to the destination.
+    If that path avoids every blocked station and connection, it is the shortest spur path and no
+    search is needed.
+    """
+    path = [spur]
+    current = spur
+    while parents[current] >= 0:
+        following = parents[current]
+        if blocked_nodes[following] or (current, following) in blocked_edges:
+            return None
+        path.append(following)
+        current = following
+    return path
+
+
+def _spur_search(graph: "CSRGraph", spur: int, dest: int, to_dest, blocked_nodes: bytearray,
+                 blocked_edges: Set[Tuple[int, int]]) -> Optional[Tuple[List[int], float]]:
+    """
+    This function runs A* from the spur station to the destination without the blocked stations and
+    connections. The times to the destination in the full network are the heuristic: removing
+    connections only makes routes longer, so they stay admissible and consistent, and they are
+    exact wherever the shortest route is not blocked.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    times: Dict[int, float] = {spur: 0}
+    parents: Dict[int, int] = {}
+    closed = set()
+    open_list = [(to_dest[spur], spur)]
+
+    while open_list:
+        _, current = heapq.heappop(open_list)
+        if current in closed:
+            continue
+        if current == dest:
+            path = [dest]
+            while path[-1] != spur:
+                path.append(parents[path[-1]])
+            path.reverse()
+            return path, times[dest]
+        closed.add(current)
+
+        time = times[current]
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            if blocked_nodes[neighbor] or neighbor in closed or (current, neighbor) in blocked_edges:
+                continue
+            new_time = time + weights[slot]
+            if new_time < times.get(neighbor, INF) and to_dest[neighbor] != INF:
+                times[neighbor] = new_time
+                parents[neighbor] = current
+                heapq.heappush(open_list, (new_time + to_dest[neighbor], neighbor))
+
+    return None
+
+
+def _overlap(graph: "CSRGraph", path: List[int], total_time: float,
+             used: Dict[Tuple[int, int], float]) -> float:
+    """
+    This function returns the share of a route's travel time spent on connections of another route.
+    """
+    if total_time <= 0:
+        return 1.0
+    shared = sum(used[(u, v)] for u, v in zip(path, path[1:]) if (u, v) in used)
+    return shared / total_time
+
+
+def _connections(path: List[int], graph: "CSRGraph") -> Dict[Tuple[int, int], float]:
+    """
+    This function returns the time of every connection of a route, under both directions.
+    """
+    used = {}
+    for u, v in zip(path, path[1:]):
+        time = _connection_time(graph, u, v)
+        used[(u, v)] = time
+        used[(v, u)] = time
+    return used
+
+
+def k_shortest_routes(graph: "CSRGraph", start: int, dest: int, k: int,
+                      max_overlap: Optional[float] = None) -> List[Tuple[List[int], float]]:
+    """
+    This function finds up to k fastest loopless routes between two stations with Yen's algorithm.
+
+    Every route found is split at each of its stations (the spur station): the part before it is kept,
+    and a spur path to the destination is searched that avoids the stations of that part and the next
+    connection of every earlier route with the same beginning. The shortest path tree towards the
+    destination is computed once (connections are two-way, so a search from the destination gives
+    it) and reused by every spur search: its path is taken directly when nothing on it is blocked,
+    otherwise its times guide an A* search.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        start (int): The index of the start station.
+        dest (int): The index of the destination station.
+        k (int): The maximum number of routes.
+        max_overlap (float, optional): The largest share (0..1) of a route's travel time that may be
+            spent on connections of a faster returned route; routes above it are skipped. No limit by default.
+
+    Returns:
+        List[Tuple[List[int], float]]: (station indices, total time) per route, fastest first.
+    """
+    to_dest, parents = shortest_path_tree(graph, dest)
+    if k <= 0 or to_dest[start] == INF:
+        return []
+
+    first = _tree_spur(parents, start, bytearray(len(graph)), set())
+    candidates = [(to_dest[start], first)]
+    seen = {tuple(first)}
+    found: List[List[int]] = [] # Every path taken from the queue, also those skipped for their overlap
+    routes: List[Tuple[List[int], float]] = []
+    used_connections: List[Dict[Tuple[int, int], float]] = []
+
+    while candidates and len(routes) < k and len(found) < k * MAX_PATHS_PER_ROUTE:
+        total_time, path = heapq.heappop(candidates)
+        found.append(path)
+
+        if max_overlap is None or all(_overlap(graph, path, total_time, used) <= max_overlap
+                                      for used in used_connections):
+            routes.append((path, total_time))
+            if max_overlap is not None:
+                used_connections.append(_connections(path, graph))
+            if len(routes) == k:
+                break
+
+        # Spur paths of the new path, one per station before the destination
+        blocked_nodes = bytearray(len(graph))
+        root_time = 0
+        for position in range(len(path) - 1):
+            spur = path[position]
+            root = path[:position + 1]
+            blocked_edges = {(spur, other[position + 1]) for other in found
+                             if len(other) > position + 1 and other[:position + 1] == root}
+
+            spur_path = _tree_spur(parents, spur, blocked_nodes, blocked_edges)
+            if spur_path is not None:
+                spur_time = to_dest[spur]
+            else:
+                result = _spur_search(graph, spur, dest, to_dest, blocked_nodes, blocked_edges)
+                if result is not None:
+                    spur_path, spur_time = result
+
+            if spur_path is not None:
+                candidate = root[:-1] + spur_path
+                key = tuple(candidate)
+                if key not in seen:
+                    seen.add(key)
+                    heapq.heappush(candidates, (root_time + spur_time, candidate))
+
+            # The spur station is part of the root of the next spur stations
+            blocked_nodes[spur] = 1
+            root_time += _connection_time(graph, spur, path[position + 1])
+
+    return routes
@@ -0,0 +1,91 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from network_snapshot import open_snapshot_graph
+from route_search import shortest_times_from
+
+INF = float("inf")
+
+# Frozen graph of a worker process, opened once from the shared snapshot (see _init_worker)
+_worker_graph = None
+
+
+def _init_worker(snapshot_path: str) -> None:
+    """
+    This function opens the network snapshot in a worker process. The arrays are memory-mapped,
+    so all workers read the same physical pages instead of receiving a pickled copy of the network,
+    and no Station objects are created (the workers only see station indices).
+    """
+    global _worker_graph
+    _worker_graph = open_snapshot_graph(snapshot_path)
+
+
+def _times_to_targets(sources: List[int], targets: List[int]) -> List[Tuple[int, array]]:
+    """
+    This function runs one Dijkstra tree per source station in a worker process and keeps
+    only the times to the target stations.
+    """
+    rows = []
+    for source in sources:
+        times = shortest_times_from(_worker_graph, source)
+        rows.append((source, array("d", (times[target] for target in targets))))
+    return rows
+
+
+def _chunks(items: List[int], count: int) -> List[List[int]]:
+    size = max(1, -(-len(items) // count))
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def many_to_many_times(network: "MetroNetwork", sources: Sequence[int], targets: Sequence[int],
+                       workers: Optional[int] = None) -> Dict[int, array]:
+    """
+    This function computes the fastest times from every source station to every target station.
+
+    The source stations are spread over a ProcessPoolExecutor. The network is shared read-only:
+    it is written once to a binary snapshot (see network_snapshot) that every worker memory-maps,
+    and only station indices and the resulting time rows cross process boundaries.
+
+    Args:
+        network (MetroNetwork): The network.
+        sources (Sequence[int]): The indices of the source stations.
+        targets (Sequence[int]): The indices of the target stations.
+        workers (int, optional): The number of processes, os.cpu_count() by default. With 1 the
+            searches run in the calling process.
+
+    Returns:
+        Dict[int, array]: Times to the targets (in the given order, inf if unreachable) per source index.
+    """
+    sources = list(dict.fromkeys(sources))
+    targets = list(targets)
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(sources) <= 1:
+        graph = network.freeze()
+        result = {}
+        for source in sources:
+            times = shortest_times_from(graph, source)
+            result[source] = array("d", (times[target] for target in targets))
+        return result
+
+    directory = tempfile.mkdtemp(prefix="metro_batch_")
+    try:
+        snapshot_path = os.path.join(directory, "network.bin")
+        network.save(snapshot_path)
+
+        result = {}
+        # Several chunks per worker keep the processes busy when some sources take longer
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(snapshot_path,)) as executor:
+            futures = [executor.submit(_times_to_targets, chunk, targets)
+                       for chunk in _chunks(sources, workers * 4)]
+            for future in futures:
+                for source, row in future.result():
+                    result[source] = row
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,449 @@
+import argparse
+from datetime import datetime, timezone
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from MuhammedMusabKaya_MetroSimulation import FASTEST_ROUTE_METHODS, MetroNetwork
+from metro_simulation import MetroAgi
+import route_search
+from route_search import SearchStats
+from route_service import LatencyRecorder
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_QUERIES = 200
+# Queries measured under tracemalloc for the per-query peak memory (tracemalloc slows them down a lot)
+MEMORY_SAMPLE = 20
+# Passes over the query pairs of adapter_overhead (more passes, less noise)
+ADAPTER_ROUNDS = 5
+
+
+def grid_city(size: int, seed: int = 0, **network_options) -> MetroNetwork:
+    """
+    This function generates a grid city: every row of the grid is a line, and neighboring stations
+    of two rows are connected by transfer connections (as in Manhattan-like street grids).
+
+    Args:
+        size (int): The approximate number of stations (rounded to a square grid).
+        seed (int): The random seed of the travel times.
+        **network_options: Arguments of MetroNetwork.
+
+    Returns:
+        MetroNetwork: The network.
+    """
+    rng = random.Random(seed)
+    side = max(2, math.isqrt(size))
+    network = MetroNetwork(**network_options)
+    network.add_stations((f"G{row}_{col}", f"Grid {row}/{col}", f"Row {row}")
+                         for row in range(side) for col in range(side))
+
+    connections = []
+    for row in range(side):
+        for col in range(side):
+            if col + 1 < side:
+                connections.append((f"G{row}_{col}", f"G{row}_{col + 1}", rng.randint(1, 5)))
+            if row + 1 < side:
+                connections.append((f"G{row}_{col}", f"G{row + 1}_{col}", rng.randint(2, 6)))
+    network.add_connections(connections)
+    return network
+
+
+def radial_city(size: int, seed: int = 0, num_lines: int = 8, ring_every: int = 10,
+                **network_options) -> MetroNetwork:
+    """
+    This function generates a radial city: lines run outwards from a central hub station and
+    are linked by transfer hubs on rings every `ring_every` stations (like Moscow or Paris).
+
+    Args:
+        size (int): The approximate number of stations.
+        seed (int): The random seed of the travel times.
+        num_lines (int): The number of radial lines.
+        ring_every (int): Distance between two rings, in stations along a line.
+        **network_options: Arguments of MetroNetwork.
+
+    Returns:
+        MetroNetwork: The network.
+    """
+    rng = random.Random(seed)
+    length = max(1, (size - 1) // num_lines)
+    network = MetroNetwork(**network_options)
+    network.add_station("HUB", "Central Hub", "Hub")
+    network.add_stations((f"R{line}_{stop}", f"Radial {line}/{stop}", f"Line {line}")
+                         for line in range(num_lines) for stop in range(length))
+
+    connections = []
+    for line in range(num_lines):
+        connections.append(("HUB", f"R{line}_0", 2))
+        for stop in range(1, length):
+            connections.append((f"R{line}_{stop - 1}", f"R{line}_{stop}", rng.randint(2, 4)))
+        for stop in range(ring_every - 1, length, ring_every):
+            # Ring connection to the same distance on the next line, longer further out
+            other = (line + 1) % num_lines
+            connections.append((f"R{line}_{stop}", f"R{other}_{stop}", 2 + stop // ring_every))
+    network.add_connections(connections)
+    return network
+
+
+def scale_free_city(size: int, seed: int = 0, attachments: int = 2, num_lines: int = 20,
+                    **network_options) -> MetroNetwork:
+    """
+    This function generates a scale-free network with preferential attachment (Barabási-Albert):
+    every new station connects to `attachments` stations picked with probability proportional
+    to their number of connections, which gives a few very busy hubs. A new station mostly joins
+    the line of the first station it connects to.
+
+    Args:
+        size (int): The number of stations.
+        seed (int): The random seed.
+        attachments (int): Connections added with every new station.
+        num_lines (int): The number of lines.
+        **network_options: Arguments of MetroNetwork.
+
+    Returns:
+        MetroNetwork: The network.
+    """
+    rng = random.Random(seed)
+    size = max(size, attachments + 1)
+    lines = [f"Line {rng.randrange(num_lines)}" for _ in range(attachments + 1)]
+    connections = []
+    # Every station appears once per connection end, so a uniform pick is a pick by degree
+    ends: List[int] = []
+
+    for first in range(attachments + 1):
+        for second in range(first):
+            connections.append((f"S{first}", f"S{second}", rng.randint(1, 8)))
+            ends.extend((first, second))
+
+    for station in range(attachments + 1, size):
+        chosen = set()
+        while len(chosen) < attachments:
+            chosen.add(ends[rng.randrange(len(ends))])
+        chosen = sorted(chosen)
+        first_line = lines[chosen[0]]
+        lines.append(first_line if rng.random() < 0.8 else f"Line {rng.randrange(num_lines)}")
+        for other in chosen:
+            connections.append((f"S{station}", f"S{other}", rng.randint(1, 8)))
+            ends.extend((station, other))
+
+    network = MetroNetwork(**network_options)
+    network.add_stations((f"S{station}", f"Station {station}", lines[station]) for station in range(size))
+    network.add_connections(connections)
+    return network
+
+
+GENERATORS: Dict[str, Callable[..., MetroNetwork]] = {
+    "grid": grid_city,
+    "radial": radial_city,
+    "scale_free": scale_free_city,
+}
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """
+    This function returns the mean, median and maximum of a list of counters.
+    """
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {"mean": sum(ordered) / len(ordered), "p50": ordered[(len(ordered) - 1) // 2], "max": ordered[-1]}
+
+
+def _search(network: MetroNetwork, mode: str) -> Callable[[int, int, Optional[SearchStats]], object]:
+    """
+    This function returns the engine call behind a query mode, on the frozen graph, so the
+    counters of exactly the search that find_fastest_route / find_least_transfer run can be read.
+    """
+    graph = network.freeze()
+    if mode == "least_transfer":
+        return lambda start, dest, stats: route_search.least_transfers(graph, start, dest, stats)
+    if mode == "fastest:bidirectional":
+        return lambda start, dest, stats: route_search.bidirectional_dijkstra(graph, start, dest, stats)
+    if mode == "fastest:ch":
+        hierarchy = network.contraction_hierarchy()
+        return lambda start, dest, stats: hierarchy.query(start, dest, stats)
+    estimate = network.landmark_heuristic().estimate
+    return lambda start, dest, stats: route_search.a_star(graph, start, dest, estimate, stats)
+
+
+def _api_call(network: MetroNetwork, mode: str) -> Callable[[str, str], object]:
+    if mode == "least_transfer":
+        return network.find_least_transfer
+    method = mode.split(":", 1)[1]
+    return lambda start_id, dest_id: network.find_fastest_route(start_id, dest_id, method)
+
+
+def _query_peak(call: Callable[[], object]) -> int:
+    """
+    This function returns the memory allocated at the peak of one call, in bytes.
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        call()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_network(network: MetroNetwork, pairs: List[Tuple[str, str]],
+                      modes: List[str]) -> Dict[str, Dict[str, object]]:
+    """
+    This function runs every query mode on the same station pairs and measures them.
+
+    Latencies are measured through the public MetroNetwork API (the network should be created
+    with cache_size=0, so every query is a real search); expanded stations and queue pushes are
+    read from the same search run on the frozen graph with a SearchStats.
+
+    Args:
+        network (MetroNetwork): The network, already preprocessed.
+        pairs (List[Tuple[str, str]]): (start_id, dest_id) queries.
+        modes (List[str]): "least_transfer", "fastest:astar", "fastest:bidirectional", "fastest:ch".
+
+    Returns:
+        Dict[str, Dict[str, object]]: Latency percentiles (ms), expanded, pushes and queue size
+        summaries and peak query memory per mode, plus the latency of calculate_heuristic.
+    """
+    results = {}
+    index_pairs = [(network.stations[start_id].index, network.stations[dest_id].index) for start_id, dest_id in pairs]
+
+    for mode in modes:
+        call = _api_call(network, mode)
+        latency = LatencyRecorder(len(pairs))
+        for start_id, dest_id in pairs:
+            started = time.perf_counter()
+            call(start_id, dest_id)
+            latency.record(time.perf_counter() - started)
+
+        search = _search(network, mode)
+        expanded, pushes, high_water = [], [], []
+        for start, dest in index_pairs:
+            stats = SearchStats()
+            search(start, dest, stats)
+            expanded.append(stats.expanded)
+            pushes.append(stats.pushes)
+            high_water.append(stats.heap_high_water)
+
+        peak = max((_query_peak(lambda pair=pair: call(*pair)) for pair in pairs[:MEMORY_SAMPLE]), default=0)
+        results[mode] = {
+            "latency_ms": latency.percentiles(),
+            "expanded": summarize(expanded),
+            "pushes": summarize(pushes),
+            "heap_high_water": summarize(high_water),
+            "peak_query_bytes": peak,
+        }
+
+    # One call per pair, it reads the precomputed landmark tables only
+    latency = LatencyRecorder(len(pairs))
+    stations = [(network.stations[start_id], network.stations[dest_id]) for start_id, dest_id in pairs]
+    for current_station, dest_station in stations:
+        started = time.perf_counter()
+        network.calculate_heuristic(current_station, dest_station)
+        latency.record(time.perf_counter() - started)
+    results["calculate_heuristic"] = {"latency_ms": latency.percentiles()}
+    return results
+
+
+def _preprocess(network: MetroNetwork, modes: List[str]) -> None:
+    network.freeze()
+    network.landmark_heuristic()
+    if "fastest:ch" in modes:
+        network.contraction_hierarchy()
+
+
+def run(generators: List[str], sizes: List[int], queries: int = DEFAULT_QUERIES, seed: int = 0,
+        modes: Optional[List[str]] = None, measure_memory: bool = True) -> Dict[str, object]:
+    """
+    This function generates every network, preprocesses it and benchmarks the route queries.
+
+    Args:
+        generators (List[str]): Names from GENERATORS.
+        sizes (List[int]): Approximate numbers of stations.
+        queries (int): Random station pairs per network.
+        seed (int): Seed of the generators and of the query pairs.
+        modes (List[str], optional): Query modes (see benchmark_network), all but "fastest:ch" by default.
+        measure_memory (bool): Build every network a second time under tracemalloc for its peak memory.
+
+    Returns:
+        Dict[str, object]: The report, ready to be written as JSON.
+    """
+    modes = modes or ["least_transfer", "fastest:astar", "fastest:bidirectional"]
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "queries": queries,
+        "runs": [],
+    }
+
+    for name in generators:
+        for size in sizes:
+            started = time.perf_counter()
+            network = GENERATORS[name](size, seed, cache_size=0)
+            built = time.perf_counter()
+            _preprocess(network, modes)
+            preprocessed = time.perf_counter()
+
+            build_peak = None
+            if measure_memory:
+                # Separate pass: tracemalloc slows the build down too much to time it at the same time
+                tracemalloc.start()
+                _preprocess(GENERATORS[name](size, seed, cache_size=0), modes)
+                build_peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            rng = random.Random(seed)
+            ids = list(network.stations)
+            pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(queries)]
+
+            run_report = {
+                "generator": name,
+                "size": size,
+                "stations": len(network.stations),
+                "connections": network.freeze().num_edges // 2,
+                "build_seconds": built - started,
+                "preprocess_seconds": preprocessed - built,
+                "peak_build_bytes": build_peak,
+                "modes": benchmark_network(network, pairs, modes),
+            }
+            report["runs"].append(run_report)
+            print(format_run(run_report), file=sys.stderr)
+    return report
+
+
+def adapter_overhead(generator: str, size: int, queries: int = DEFAULT_QUERIES, seed: int = 0) -> Dict[str, object]:
+    """
+    This function measures what the Turkish API of metro_simulation (MetroAgi) adds to a query.
+    The same network is built as a MetroNetwork and as a MetroAgi, and both answer the same station
+    pairs; the two calls of a pair run back to back, in alternating order, ADAPTER_ROUNDS times.
+
+    Args:
+        generator (str): A name from GENERATORS.
+        size (int): The approximate number of stations.
+        queries (int): Random station pairs.
+        seed (int): Seed of the generator and of the query pairs.
+
+    Returns:
+        Dict[str, object]: Median latency (ms) of both APIs and the overhead in percent, per query mode.
+    """
+    network = GENERATORS[generator](size, seed, cache_size=0)
+    adapter = MetroAgi(cache_size=0)
+    adapter.add_stations((station.idx, station.name, station.line) for station in network.stations.values())
+    adapter.add_connections((station.idx, neighbor.idx, time) for station in network.stations.values()
+                            for neighbor, time in station.neighbors if station.index < neighbor.index)
+    for metro in (network, adapter):
+        _preprocess(metro, ["fastest:astar"])
+
+    rng = random.Random(seed)
+    ids = list(network.stations)
+    pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(queries)]
+    calls = {
+        "least_transfer": (network.find_least_transfer, adapter.en_az_aktarma_bul),
+        "fastest:astar": (network.find_fastest_route, adapter.en_hizli_rota_bul),
+    }
+
+    modes = {}
+    for mode, (direct_call, adapter_call) in calls.items():
+        direct = LatencyRecorder(len(pairs) * ADAPTER_ROUNDS)
+        adapted = LatencyRecorder(len(pairs) * ADAPTER_ROUNDS)
+        for round_number in range(ADAPTER_ROUNDS):
+            order = ((direct_call, direct), (adapter_call, adapted))
+            for start_id, dest_id in pairs:
+                for call, latency in (order if round_number % 2 == 0 else order[::-1]):
+                    started = time.perf_counter()
+                    call(start_id, dest_id)
+                    latency.record(time.perf_counter() - started)
+        direct_p50 = direct.percentiles()["p50"]
+        adapter_p50 = adapted.percentiles()["p50"]
+        modes[mode] = {
+            "direct_p50_ms": direct_p50,
+            "adapter_p50_ms": adapter_p50,
+            "overhead_percent": 100 * (adapter_p50 - direct_p50) / direct_p50 if direct_p50 else 0.0,
+        }
+    return {"generator": generator, "size": size, "stations": len(network.stations), "modes": modes}
+
+
+def format_run(run_report: Dict[str, object]) -> str:
+    lines = [f"{run_report['generator']} n={run_report['stations']} e={run_report['connections']} "
+             f"build={run_report['build_seconds']:.2f}s preprocess={run_report['preprocess_seconds']:.2f}s"
+             + ("" if run_report["peak_build_bytes"] is None else
+                f" peak={run_report['peak_build_bytes'] / 2 ** 20:.1f} MiB")]
+    for mode, values in run_report["modes"].items():
+        latency = " ".join(f"{point}={value:.3f}ms" for point, value in values["latency_ms"].items())
+        expanded = values.get("expanded", {}).get("mean")
+        lines.append(f"  {mode:<22} {latency}" + ("" if expanded is None else f" expanded={expanded:.0f}"))
+    return "\n".join(lines)
+
+
+def compare(previous: Dict[str, object], current: Dict[str, object]) -> List[str]:
+    """
+    This function compares the median latencies of two reports, for the runs and modes both contain.
+
+    Returns:
+        List[str]: One line per run and mode, e.g. "grid 10000 fastest:astar p50 0.812 -> 0.640 ms (0.79x)".
+    """
+    old_runs = {(run_report["generator"], run_report["size"]): run_report for run_report in previous["runs"]}
+    lines = []
+    for run_report in current["runs"]:
+        old = old_runs.get((run_report["generator"], run_report["size"]))
+        if old is None:
+            continue
+        for mode, values in run_report["modes"].items():
+            old_p50 = old["modes"].get(mode, {}).get("latency_ms", {}).get("p50")
+            new_p50 = values["latency_ms"].get("p50")
+            if old_p50 and new_p50 is not None:
+                lines.append(f"{run_report['generator']} {run_report['size']} {mode} p50 "
+                             f"{old_p50:.3f} -> {new_p50:.3f} ms ({new_p50 / old_p50:.2f}x)")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the route queries on synthetic metro networks.")
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help="approximate numbers of stations, e.g. 100 1000 10000 100000 1000000")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--methods", nargs="+", choices=FASTEST_ROUTE_METHODS, default=["astar", "bidirectional"],
+                        help="find_fastest_route methods to measure (ch needs a long preprocessing on big networks)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc build pass (halves the run time on big networks)")
+    parser.add_argument("--output", help="JSON file to write the report to (default: standard output)")
+    parser.add_argument("--compare", help="earlier JSON report to compare median latencies with")
+    parser.add_argument("--adapter", action="store_true",
+                        help="also compare the Turkish metro_simulation API with MetroNetwork")
+    args = parser.parse_args(argv)
+
+    modes = ["least_transfer"] + ["fastest:" + method for method in args.methods]
+    report = run(args.generators, args.sizes, args.queries, args.seed, modes, not args.no_memory)
+    if args.adapter:
+        report["adapter"] = []
+        for name in args.generators:
+            for size in args.sizes:
+                overhead = adapter_overhead(name, size, args.queries, args.seed)
+                report["adapter"].append(overhead)
+                for mode, values in overhead["modes"].items():
+                    print(f"adapter {name} n={overhead['stations']} {mode:<16} direct={values['direct_p50_ms']:.3f}ms "
+                          f"MetroAgi={values['adapter_p50_ms']:.3f}ms ({values['overhead_percent']:+.1f}%)",
+                          file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            previous = json.load(file)
+        print("\n".join(compare(previous, report)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+from array import array
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+from csr_graph import typecode_of
+
+INF = float("inf")
+
+# Stations settled by one witness search before it gives up (the shortcut is then added to be safe)
+WITNESS_SETTLE_LIMIT = 60
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy (CH) over the station graph.
+
+    During preprocessing stations are removed ("contracted") one by one, from the least to the most
+    important. When a station v is removed, a shortcut u-w with the time of u-v-w is added for every
+    pair of its neighbors whose shortest route goes through v. Every station gets a rank (the order of
+    contraction), and every original or shortcut connection is stored once, at its lower-ranked end,
+    in an upward CSR graph. A query then only has to run two tiny Dijkstra searches that move upwards
+    in rank, one from each end, and meet at the most important station of the route.
+    """
+
+    def __init__(self, version: int, rank: array, up_offsets: array, up_targets: array, up_weights: array,
+                 middles: Dict[Tuple[int, int], int]):
+        # Graph version the hierarchy was built for (see MetroNetwork.version)
+        self.version = version
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        # Contracted station of every shortcut, keyed by (smaller index, larger index)
+        self.middles = middles
+
+    def _upward_search(self, open_list: list, times: Dict[int, float], parents: Dict[int, int],
+                       closed: set, other_times: Dict[int, float], best: list) -> int:
+        """
+        This function settles one station of an upward search and updates the best meeting point.
+        It returns the number of queue insertions.
+        """
+        time, current = heapq.heappop(open_list)
+        if current in closed:
+            return 0 # Outdated queue entry
+        closed.add(current)
+
+        if current in other_times and time + other_times[current] < best[0]:
+            best[0] = time + other_times[current]
+            best[1] = current
+
+        up_targets = self.up_targets
+        up_weights = self.up_weights
+        pushes = 0
+        for slot in range(self.up_offsets[current], self.up_offsets[current + 1]):
+            neighbor = up_targets[slot]
+            new_time = time + up_weights[slot]
+            if new_time < times.get(neighbor, INF):
+                times[neighbor] = new_time
+                parents[neighbor] = current
+                heapq.heappush(open_list, (new_time, neighbor))
+                pushes += 1
+        return pushes
+
+    def query(self, start: int, dest: int, stats: Optional["SearchStats"] = None) -> Optional[Tuple[List[int], float]]:
+        """
+        This function finds the fastest route between two stations with the hierarchy.
+
+        Args:
+            start (int): The index of the start station.
+            dest (int): The index of the destination station.
+            stats (SearchStats, optional): Filled in with the work done by both upward searches.
+
+        Returns:
+            Optional[Tuple[List[int], float]]: (station indices with shortcuts unpacked, total_time)
+            or None if the destination cannot be reached.
+        """
+        if start == dest:
+            return [start], 0
+
+        forward = ([(0, start)], {start: 0}, {}, set())
+        backward = ([(0, dest)], {dest: 0}, {}, set())
+        best = [INF, None] # [time, meeting station]
+        pushes = 2
+        high_water = 2
+
+        # Each side may stop once its smallest key cannot improve the best meeting point
+        while True:
+            forward_active = forward[0] and forward[0][0][0] < best[0]
+            backward_active = backward[0] and backward[0][0][0] < best[0]
+            if not forward_active and not backward_active:
+                break
+            if stats is not None and len(forward[0]) + len(backward[0]) > high_water:
+                high_water = len(forward[0]) + len(backward[0])
+            if forward_active:
+                pushes += self._upward_search(*forward, backward[1], best)
+            if backward_active:
+                pushes += self._upward_search(*backward, forward[1], best)
+
+        if stats is not None:
+            stats.record(self.up_offsets, list(forward[3]) + list(backward[3]), True, dest, pushes,
+                         len(forward[0]) + len(backward[0]), high_water)
+        best_time, meeting = best
+        if meeting is None:
+            return None
+
+        # Chain of hierarchy edges start -> meeting -> dest
+        chain = []
+        current = meeting
+        while current is not None:
+            chain.append(current)
+            current = forward[2].get(current)
+        chain.reverse()
+        current = backward[2].get(meeting)
+        while current is not None:
+            chain.append(current)
+            current = backward[2].get(current)
+
+        if stats is None:
+            return self.unpack(chain), best_time
+        started = time.perf_counter()
+        path = self.unpack(chain)
+        stats.trace_seconds += time.perf_counter() - started
+        return path, best_time
+
+    def unpack(self, chain: List[int]) -> List[int]:
+        """
+        This function replaces every shortcut of a route by the stations it skips.
+
+        Args:
+            chain (List[int]): Station indices connected by original or shortcut connections.
+
+        Returns:
+            List[int]: The station indices connected by original connections only.
+        """
+        path = [chain[0]]
+        middles = self.middles
+        for first, second in zip(chain, chain[1:]):
+            stack = [(first, second)]
+            while stack:
+                u, w = stack.pop()
+                middle = middles.get((u, w) if u < w else (w, u), -1)
+                if middle < 0:
+                    path.append(w)
+                else:
+                    # Unpack u -> middle before middle -> w
+                    stack.append((middle, w))
+                    stack.append((u, middle))
+        return path
+
+
+def _witness_times(adjacency: List[Dict[int, Tuple[float, int]]], contracted: bytearray, source: int,
+                   excluded: int, limit: float) -> Dict[int, float]:
+    """
+    This function returns the shortest times from source that avoid the excluded station,
+    searching only until the limit time or WITNESS_SETTLE_LIMIT settled stations.
+    """
+    times = {source: 0}
+    open_list = [(0, source)]
+    settled = 0
+
+    while open_list:
+        time, current = heapq.heappop(open_list)
+        if time > times[current]:
+            continue
+        if time > limit or settled >= WITNESS_SETTLE_LIMIT:
+            break
+        settled += 1
+
+        for neighbor, (weight, _) in adjacency[current].items():
+            if neighbor == excluded or contracted[neighbor]:
+                continue
+            new_time = time + weight
+            if new_time < times.get(neighbor, INF):
+                times[neighbor] = new_time
+                heapq.heappush(open_list, (new_time, neighbor))
+
+    return times
+
+
+def _shortcuts(adjacency: List[Dict[int, Tuple[float, int]]], contracted: bytearray,
+               station: int) -> List[Tuple[int, int, float]]:
+    """
+    This function returns the shortcuts needed if the station is contracted now.
+    One bounded witness search is run per neighbor, covering all of its pairs.
+    """
+    neighbors = [(neighbor, weight) for neighbor, (weight, _) in adjacency[station].items()
+                 if not contracted[neighbor]]
+    shortcuts = []
+    for position, (u, weight_u) in enumerate(neighbors):
+        others = neighbors[position + 1:]
+        if not others:
+            break
+        limit = weight_u + max(weight_w for _, weight_w in others)
+        witness = _witness_times(adjacency, contracted, u, station, limit)
+        for w, weight_w in others:
+            via_time = weight_u + weight_w
+            if witness.get(w, INF) > via_time:
+                shortcuts.append((u, w, via_time))
+    return shortcuts
+
+
+def build_contraction_hierarchy(graph: "CSRGraph") -> ContractionHierarchy:
+    """
+    This function contracts every station of the graph and builds the upward search graph.
+
+    Stations are contracted in order of priority = edge difference (shortcuts added minus
+    connections removed) + number of already contracted neighbors, with lazy updates of the
+    priority queue. Witness searches are bounded, so an unnecessary shortcut may be added
+    but a needed one is never missed.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+
+    Returns:
+        ContractionHierarchy: The hierarchy, tagged with the version of the graph.
+    """
+    size = len(graph)
+
+    # Remaining graph: station -> {neighbor: (time, middle station or -1)}, the fastest of parallel connections
+    adjacency: List[Dict[int, Tuple[float, int]]] = [dict() for _ in range(size)]
+    for station in range(size):
+        for neighbor, weight in graph.neighbors(station):
+            if neighbor != station and weight < adjacency[station].get(neighbor, (INF, -1))[0]:
+                adjacency[station][neighbor] = (weight, -1)
+                adjacency[neighbor][station] = (weight, -1)
+
+    contracted = bytearray(size)
+    contracted_neighbors = array("i", bytes(4 * size))
+    rank = array("i", bytes(4 * size))
+
+    def priority(station: int) -> int:
+        removed = sum(1 for neighbor in adjacency[station] if not contracted[neighbor])
+        return len(_shortcuts(adjacency, contracted, station)) - removed + contracted_neighbors[station]
+
+    queue = [(priority(station), station) for station in range(size)]
+    heapq.heapify(queue)
+    next_rank = 0
+
+    while queue:
+        _, station = heapq.heappop(queue)
+        if contracted[station]:
+            continue
+
+        # Lazy update: contract only if the station is still the least important one
+        current_priority = priority(station)
+        if queue and current_priority > queue[0][0]:
+            heapq.heappush(queue, (current_priority, station))
+            continue
+
+        for u, w, via_time in _shortcuts(adjacency, contracted, station):
+            if via_time < adjacency[u].get(w, (INF, -1))[0]:
+                adjacency[u][w] = (via_time, station)
+                adjacency[w][u] = (via_time, station)
+
+        contracted[station] = 1
+        rank[station] = next_rank
+        next_rank += 1
+        for neighbor in adjacency[station]:
+            contracted_neighbors[neighbor] += 1
+
+    # Upward graph: every connection is stored at its lower-ranked end
+    up_offsets = array("q", [0])
+    up_targets = array("i")
+    up_weights = array(typecode_of(graph.weights))
+    middles: Dict[Tuple[int, int], int] = {}
+
+    for station in range(size):
+        for neighbor, (weight, middle) in adjacency[station].items():
+            if rank[neighbor] > rank[station]:
+                up_targets.append(neighbor)
+                up_weights.append(weight)
+                if middle >= 0:
+                    middles[(station, neighbor) if station < neighbor else (neighbor, station)] = middle
+        up_offsets.append(len(up_targets))
+
+    return ContractionHierarchy(graph.version, rank, up_offsets, up_targets, up_weights, middles)
@@ -0,0 +1,177 @@
+from array import array
+import hashlib
+from typing import Dict, List
+
+INF = float("inf")
+
+class CSRGraph:
+    """
+    Frozen, array-backed (Compressed Sparse Row) view of a MetroNetwork.
+
+    Stations are numbered by their `index` (0 .. n-1). The connections of station `i` are
+    stored in the slots `offsets[i] .. offsets[i + 1] - 1` of the `targets` and `weights`
+    arrays, so a neighbor scan is a walk over two flat typed arrays instead of a list of
+    (Station, time) tuples. The view is tagged with the network version it was built from
+    and is not changed by add_station / add_connection. Connection times changed with
+    update_connection_time / remove_connection are patched into a copy of the view: a removed
+    connection keeps its slot with an inf time (a tombstone), which every search skips.
+    """
+
+    __slots__ = ("version", "stations", "station_ids", "line_names", "station_lines",
+                 "offsets", "targets", "weights")
+
+    def __init__(self, version: int, stations: List["Station"], line_names: List[str],
+                 station_lines: array, offsets: array, targets: array, weights: array):
+        self.version = version
+        # Station objects in index order, used to turn index paths back into stations
+        self.stations = stations
+        self.station_ids: Dict[str, int] = {station.idx: station.index for station in stations}
+        self.line_names = line_names
+        # Line number of every station (position in line_names)
+        self.station_lines = station_lines
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def fingerprint(self) -> str:
+        """
+        This function returns a hash of the station order and the connections, used to check
+        that data saved to disk (e.g. a travel time matrix) belongs to this graph.
+
+        Returns:
+            str: The hex digest.
+        """
+        digest = hashlib.sha1()
+        digest.update("\n".join(self.station_ids).encode("utf-8"))
+        for values in (self.offsets, self.targets, self.weights):
+            digest.update(typecode_of(values).encode("ascii"))
+            digest.update(memoryview(values).cast("B"))
+        return digest.hexdigest()
+
+    def copy(self) -> "CSRGraph":
+        """
+        This function returns a copy whose weights can be changed without affecting searches that
+        run on this graph. Only the weights are copied, the other arrays are shared.
+
+        Returns:
+            CSRGraph: The copy, with the same version.
+        """
+        graph = CSRGraph.__new__(CSRGraph)
+        for name in CSRGraph.__slots__:
+            setattr(graph, name, getattr(self, name))
+        graph.weights = array(typecode_of(self.weights))
+        graph.weights.frombytes(memoryview(self.weights).cast("B"))
+        return graph
+
+    def neighbors(self, index: int):
+        """
+        This function yields the (neighbor index, travel time) pairs of a station.
+
+        Args:
+            index (int): The index of the station.
+        """
+        targets = self.targets
+        weights = self.weights
+        for slot in range(self.offsets[index], self.offsets[index + 1]):
+            if weights[slot] != INF:
+                yield targets[slot], weights[slot]
+
+    def _live_slot(self, index: int, neighbor: int, occurrence: int) -> int:
+        """
+        This function returns the slot of the n-th connection (not removed) from index to neighbor.
+        """
+        targets = self.targets
+        weights = self.weights
+        for slot in range(self.offsets[index], self.offsets[index + 1]):
+            if targets[slot] == neighbor and weights[slot] != INF:
+                if occurrence == 0:
+                    return slot
+                occurrence -= 1
+        raise KeyError(f"No connection between station {index} and station {neighbor}")
+
+    def set_connection_time(self, u: int, v: int, occurrence: int, time: float) -> float:
+        """
+        This function changes the time of one two-way connection in place, in both directions.
+
+        Integer weights are widened to doubles when the new time is not a whole number or is inf
+        (a removed connection). Weights of a graph loaded from a snapshot are a copy-on-write
+        memory map, so the change never reaches the file.
+
+        Args:
+            u (int): The index of one end of the connection.
+            v (int): The index of the other end of the connection.
+            occurrence (int): Which of several parallel u-v connections to change (0 for the first).
+            time (float): The new travel time, inf to remove the connection.
+
+        Returns:
+            float: The previous travel time.
+        """
+        forward = self._live_slot(u, v, occurrence)
+        backward = self._live_slot(v, u, occurrence)
+        if weight_typecode([time]) != "i" and typecode_of(self.weights) != "d":
+            self.weights = array("d", self.weights)
+
+        old_time = self.weights[forward]
+        self.weights[forward] = time
+        self.weights[backward] = time
+        return old_time
+
+
+def typecode_of(values) -> str:
+    """
+    This function returns the element type of an array, or of a typed memoryview (snapshot arrays).
+    """
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def weight_typecode(times) -> str:
+    """
+    This function picks the smallest array type that stores the travel times exactly:
+    32-bit integers when every time is a whole number (the usual case), doubles otherwise.
+
+    Args:
+        times (Iterable): The travel times.
+
+    Returns:
+        str: The array typecode.
+    """
+    for time in times:
+        if not isinstance(time, int) or not -2 ** 31 <= time < 2 ** 31:
+            return "d"
+    return "i"
+
+
+def build_csr(network) -> CSRGraph:
+    """
+    This function builds the CSR view of a network from the builder adjacency lists.
+
+    Args:
+        network (MetroNetwork): The network to freeze.
+
+    Returns:
+        CSRGraph: The frozen graph, tagged with the current network version.
+    """
+    stations = list(network.stations.values())
+
+    line_numbers: Dict[str, int] = {}
+    station_lines = array("i", bytes(4 * len(stations)))
+    offsets = array("q", [0])
+    targets = array("i")
+    times = []
+
+    for station in stations:
+        station_lines[station.index] = line_numbers.setdefault(station.line, len(line_numbers))
+        for neighbor_station, travel_time in station.neighbors:
+            targets.append(neighbor_station.index)
+            times.append(travel_time)
+        offsets.append(len(targets))
+
+    weights = array(weight_typecode(times), times)
+    return CSRGraph(network.version, stations, list(line_numbers), station_lines, offsets, targets, weights)
@@ -0,0 +1,115 @@
+import heapq
+
+INF = float("inf")
+
+
+def repair_distances(graph: "CSRGraph", times, source: int, u: int, v: int, old_time: float, new_time: float) -> None:
+    """
+    This function repairs a table of shortest times from one source after the time of the
+    connection u-v changed from old_time to new_time (inf when it was removed).
+
+    The CSR graph must already contain the new time. Only the stations whose shortest time
+    can change are visited:
+    - A faster connection can only improve stations reached through it, so a Dijkstra search
+      is started from its endpoints and stops wherever it does not improve anything.
+    - A slower (or removed) connection only affects stations that depended on it: the stations
+      left without a "supporting" neighbor (one that still gives them the same time) are collected,
+      reset, and recomputed from their unaffected neighbors. The source itself is never reset,
+      and only a neighbor with a strictly smaller time counts as support: with 0-minute
+      connections two stations could otherwise support each other after both lost the source.
+
+    Args:
+        graph (CSRGraph): The network with the changed connection.
+        times (array or memoryview): Shortest times from the source, indexed by station index (changed in place).
+        source (int): The index of the station the times are measured from.
+        u (int): The index of one end of the connection.
+        v (int): The index of the other end of the connection.
+        old_time (float): The previous travel time of the connection.
+        new_time (float): The new travel time of the connection (inf if removed).
+    """
+    if new_time < old_time:
+        seeds = []
+        if times[u] + new_time < times[v]:
+            times[v] = times[u] + new_time
+            seeds.append((times[v], v))
+        elif times[v] + new_time < times[u]:
+            times[u] = times[v] + new_time
+            seeds.append((times[u], u))
+        _propagate(graph, times, seeds, None)
+    elif new_time > old_time:
+        for first, second in ((u, v), (v, u)):
+            if second != source and times[second] != INF and times[first] + old_time == times[second]:
+                _repair_increase(graph, times, source, second)
+
+
+def _propagate(graph: "CSRGraph", times, open_list: list, allowed) -> None:
+    """
+    This function runs Dijkstra from already improved stations, changing only stations it improves.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    heapq.heapify(open_list)
+
+    while open_list:
+        time, current = heapq.heappop(open_list)
+        if time > times[current]:
+            continue
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            if allowed is not None and neighbor not in allowed:
+                continue # Stations outside the affected set already have their final time
+            new_time = time + weights[slot]
+            if new_time < times[neighbor]:
+                times[neighbor] = new_time
+                heapq.heappush(open_list, (new_time, neighbor))
+
+
+def _repair_increase(graph: "CSRGraph", times, source: int, root: int) -> None:
+    """
+    This function recomputes the stations whose shortest time depended on a connection that became slower.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    # Candidates are visited in order of their old time, so every neighbor with a smaller time is decided
+    # when a station is checked. Equal-time neighbors (0-minute connections) may still be undecided and
+    # never count as support; a station reset because of that is restored by the recomputation below.
+    affected = set()
+    candidates = [(times[root], root)]
+    while candidates:
+        time, current = heapq.heappop(candidates)
+        if current in affected or current == source:
+            continue
+
+        supported = False
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            if neighbor not in affected and weights[slot] > 0 and times[neighbor] + weights[slot] == time:
+                supported = True
+                break
+        if supported:
+            continue # Still reachable in the same time without the changed connection
+
+        affected.add(current)
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            if neighbor not in affected and times[neighbor] != INF and time + weights[slot] == times[neighbor]:
+                heapq.heappush(candidates, (times[neighbor], neighbor))
+
+    # Reset the affected stations and restart them from their best unaffected neighbor
+    for station in affected:
+        times[station] = INF
+    open_list = []
+    for station in affected:
+        best = INF
+        for slot in range(offsets[station], offsets[station + 1]):
+            neighbor = targets[slot]
+            if neighbor not in affected and times[neighbor] + weights[slot] < best:
+                best = times[neighbor] + weights[slot]
+        if best < INF:
+            times[station] = best
+            open_list.append((best, station))
+
+    _propagate(graph, times, open_list, affected)
@@ -0,0 +1,177 @@
+from array import array
+from typing import Hashable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from csr_graph import INF, CSRGraph
+
+# A graph is either a dict adjacency (node -> iterable of neighbors) or the frozen CSR view of a MetroNetwork
+Graph = Union[Mapping[Hashable, object], CSRGraph]
+
+# Returned by next() when a node of the DFS stack has no more neighbors
+_EXHAUSTED = object()
+
+
+def _csr_children(graph: CSRGraph, index: int) -> Iterator[int]:
+    """
+    This function yields the neighbor indices of a station, skipping removed connections.
+    """
+    targets = graph.targets
+    weights = graph.weights
+    for slot in range(graph.offsets[index], graph.offsets[index + 1]):
+        if weights[slot] != INF:
+            yield targets[slot]
+
+
+def _csr_levels(graph: CSRGraph, source: int, max_depth: Optional[int]) -> Iterator[array]:
+    """
+    This function is bfs_levels for the CSR view: the frontier is a flat int array, the visited
+    set one byte per station index and the neighbors are read straight from the offsets / targets /
+    weights arrays.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    visited = bytearray(len(graph))
+    visited[source] = 1
+    frontier = array("i", [source])
+    depth = 0
+
+    while frontier:
+        yield frontier
+        if max_depth is not None and depth >= max_depth:
+            return
+        next_frontier = array("i")
+        append = next_frontier.append
+        for index in frontier:
+            for slot in range(offsets[index], offsets[index + 1]):
+                neighbor = targets[slot]
+                if not visited[neighbor] and weights[slot] != INF: # Skip removed connections
+                    visited[neighbor] = 1
+                    append(neighbor)
+        frontier = next_frontier
+        depth += 1
+
+
+def bfs_levels(graph: Graph, source, max_depth: Optional[int] = None) -> Iterator[List]:
+    """
+    This function runs a level-synchronous breadth-first search and yields one level at a time:
+    first [source], then every node one edge away, then two edges away, ...
+
+    Every node is yielded once, also on cyclic graphs. The search is lazy, so breaking out of
+    the loop stops it (early termination) and nothing beyond the current level is built.
+
+    Args:
+        graph (Graph): A dict adjacency or a CSRGraph (nodes are then station indices).
+        source (Hashable): The start node.
+        max_depth (int, optional): The last level to yield, no limit by default.
+
+    Returns:
+        Iterator[List]: The nodes of every level (an int array for a CSRGraph).
+    """
+    if isinstance(graph, CSRGraph):
+        yield from _csr_levels(graph, source, max_depth)
+        return
+
+    visited = {source}
+    frontier = [source]
+    depth = 0
+    while frontier:
+        yield frontier
+        if max_depth is not None and depth >= max_depth:
+            return
+        next_frontier = []
+        for node in frontier:
+            for neighbor in graph.get(node, ()):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+        depth += 1
+
+
+def bfs(graph: Graph, source, max_depth: Optional[int] = None) -> Iterator[Tuple[Hashable, int]]:
+    """
+    This function yields the nodes reachable from source in breadth-first order, with their
+    depth (number of edges from the source).
+
+    Args:
+        graph (Graph): A dict adjacency or a CSRGraph.
+        source (Hashable): The start node.
+        max_depth (int, optional): Nodes farther away than this are not visited.
+
+    Returns:
+        Iterator[Tuple[Hashable, int]]: (node, depth) pairs.
+    """
+    for depth, level in enumerate(bfs_levels(graph, source, max_depth)):
+        for node in level:
+            yield node, depth
+
+
+def _csr_dfs(graph: CSRGraph, source: int, max_depth: Optional[int]) -> Iterator[Tuple[int, int]]:
+    """
+    This function is dfs for the CSR view, with the same one byte per station visited set as _csr_levels.
+    """
+    visited = bytearray(len(graph))
+    visited[source] = 1
+    yield source, 0
+    stack = [_csr_children(graph, source)] if max_depth is None or max_depth > 0 else []
+    while stack:
+        neighbor = next(stack[-1], -1)
+        if neighbor < 0:
+            stack.pop()
+        elif not visited[neighbor]:
+            visited[neighbor] = 1
+            yield neighbor, len(stack)
+            if max_depth is None or len(stack) < max_depth:
+                stack.append(_csr_children(graph, neighbor))
+
+
+def dfs(graph: Graph, source, max_depth: Optional[int] = None) -> Iterator[Tuple[Hashable, int]]:
+    """
+    This function yields the nodes reachable from source in depth-first (preorder) order, with
+    the depth at which they were reached. It uses an explicit stack, so deep graphs do not hit
+    the recursion limit.
+
+    Args:
+        graph (Graph): A dict adjacency or a CSRGraph.
+        source (Hashable): The start node.
+        max_depth (int, optional): The search does not go deeper than this.
+
+    Returns:
+        Iterator[Tuple[Hashable, int]]: (node, depth) pairs.
+    """
+    if isinstance(graph, CSRGraph):
+        yield from _csr_dfs(graph, source, max_depth)
+        return
+
+    visited = {source}
+    yield source, 0
+    stack = [iter(graph.get(source, ()))] if max_depth is None or max_depth > 0 else []
+    while stack:
+        neighbor = next(stack[-1], _EXHAUSTED)
+        if neighbor is _EXHAUSTED:
+            stack.pop()
+        elif neighbor not in visited:
+            visited.add(neighbor)
+            yield neighbor, len(stack)
+            if max_depth is None or len(stack) < max_depth:
+                stack.append(iter(graph.get(neighbor, ())))
+
+
+def hop_distance(graph: Graph, source, dest, max_depth: Optional[int] = None) -> Optional[int]:
+    """
+    This function returns the smallest number of edges between two nodes, stopping the search
+    at the level that contains the destination.
+
+    Args:
+        graph (Graph): A dict adjacency or a CSRGraph.
+        source (Hashable): The start node.
+        dest (Hashable): The destination node.
+        max_depth (int, optional): Give up after this many edges.
+
+    Returns:
+        Optional[int]: The number of edges, None if dest is not reachable (within max_depth).
+    """
+    for depth, level in enumerate(bfs_levels(graph, source, max_depth)):
+        if dest in level:
+            return depth
+    return None
@@ -0,0 +1,154 @@
+import csv
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+
+def parse_gtfs_time(value: str) -> int:
+    """
+    This function converts a GTFS time ("HH:MM:SS", hours may be 24 or more after midnight) to seconds.
+
+    Args:
+        value (str): The GTFS time.
+
+    Returns:
+        int: Seconds after the start of the service day.
+    """
+    hours, minutes, seconds = value.strip().split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def seconds_to_minutes(seconds: int) -> Union[int, float]:
+    # Whole minutes stay integers, so the CSR view can keep its compact integer weights
+    return seconds // 60 if seconds % 60 == 0 else seconds / 60
+
+
+def iter_stops(stops_path: str, line_column: str = "route_id", default_line: str = "") -> Iterator[Tuple[str, str, str]]:
+    """
+    This function streams the stations of a GTFS `stops.txt` file.
+
+    GTFS stops have no line; the line is read from the optional `line_column` column
+    (not part of the GTFS standard) and falls back to `default_line`.
+
+    Args:
+        stops_path (str): The path of `stops.txt`.
+        line_column (str): The column holding the line of the stop.
+        default_line (str): The line of stops without that column.
+
+    Yields:
+        Tuple[str, str, str]: (stop_id, stop_name, line)
+    """
+    with open(stops_path, newline="", encoding="utf-8-sig") as file:
+        for row in csv.DictReader(file):
+            yield row["stop_id"], row["stop_name"], row.get(line_column) or default_line
+
+
+def iter_segments(stop_times_path: str) -> Iterator[Tuple[str, str, Union[int, float]]]:
+    """
+    This function streams the segments travelled by the trips of a GTFS `stop_times.txt` file.
+
+    Rows of one trip must be consecutive and sorted by `stop_sequence`, as in the feeds published
+    by agencies. Only the previous row is kept, so memory use does not depend on the file size.
+
+    Args:
+        stop_times_path (str): The path of `stop_times.txt`.
+
+    Yields:
+        Tuple[str, str, Union[int, float]]: (from_stop_id, to_stop_id, travel time in minutes)
+
+    Raises:
+        ValueError: If the rows of a trip are not sorted by stop_sequence.
+    """
+    with open(stop_times_path, newline="", encoding="utf-8-sig") as file:
+        previous_trip = None
+        previous_stop = None
+        previous_sequence = 0
+        previous_departure = 0
+
+        for row in csv.DictReader(file):
+            trip_id = row["trip_id"]
+            stop_id = row["stop_id"]
+            sequence = int(row["stop_sequence"])
+            arrival = parse_gtfs_time(row["arrival_time"] or row["departure_time"])
+            departure = parse_gtfs_time(row["departure_time"] or row["arrival_time"])
+
+            if trip_id == previous_trip:
+                if sequence <= previous_sequence:
+                    raise ValueError(f"stop_times of trip {trip_id} are not sorted by stop_sequence")
+                if stop_id != previous_stop:
+                    yield previous_stop, stop_id, seconds_to_minutes(max(0, arrival - previous_departure))
+
+            previous_trip = trip_id
+            previous_stop = stop_id
+            previous_sequence = sequence
+            previous_departure = departure
+
+
+def fastest_segments(segments: Iterable[Tuple[str, str, Union[int, float]]]) -> Dict[Tuple[str, str], Union[int, float]]:
+    """
+    This function keeps the fastest time of every distinct segment. Thousands of trips run over
+    the same pair of stops, so the result grows with the network and not with the feed.
+
+    Args:
+        segments (Iterable): (from_stop_id, to_stop_id, minutes) tuples.
+
+    Returns:
+        Dict[Tuple[str, str], Union[int, float]]: Fastest time per unordered stop pair.
+    """
+    fastest: Dict[Tuple[str, str], Union[int, float]] = {}
+    for stop1, stop2, minutes in segments:
+        key = (stop1, stop2) if stop1 < stop2 else (stop2, stop1)
+        if minutes < fastest.get(key, float("inf")):
+            fastest[key] = minutes
+    return fastest
+
+
+def batched(items: Iterable, batch_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_gtfs(stops_path: str, stop_times_path: str, network: Optional["MetroNetwork"] = None,
+              batch_size: int = 10000, line_column: str = "route_id", default_line: str = "") -> "MetroNetwork":
+    """
+    This function loads the stations and connections of a GTFS feed (a `stops.txt` / `stop_times.txt` subset).
+
+    Both files are parsed row by row with generators and inserted in batches with
+    MetroNetwork.add_stations / add_connections, so peak memory is proportional to the
+    resulting graph and not to the size of the input files.
+
+    Args:
+        stops_path (str): The path of `stops.txt`.
+        stop_times_path (str): The path of `stop_times.txt`.
+        network (MetroNetwork, optional): The network to add to. A new one is created by default.
+        batch_size (int): The number of rows inserted at once.
+        line_column (str): The `stops.txt` column holding the line of the stop (see iter_stops).
+        default_line (str): The line of stops without that column.
+
+    Returns:
+        MetroNetwork: The loaded network.
+
+    Raises:
+        ValueError: If stop_times refers to a stop that is not in stops.txt.
+    """
+    if network is None:
+        from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+        network = MetroNetwork()
+
+    for batch in batched(iter_stops(stops_path, line_column, default_line), batch_size):
+        network.add_stations(batch)
+
+    connections = fastest_segments(iter_segments(stop_times_path))
+    for (stop1, stop2) in connections:
+        if stop1 not in network.stations or stop2 not in network.stations:
+            missing = stop1 if stop1 not in network.stations else stop2
+            raise ValueError(f"stop_times refers to unknown stop {missing}")
+
+    items = ((stop1, stop2, minutes) for (stop1, stop2), minutes in connections.items())
+    for batch in batched(items, batch_size):
+        network.add_connections(batch)
+
+    return network
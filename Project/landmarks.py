@@ -0,0 +1,124 @@
+from array import array
+from typing import List, Optional
+
+from dynamic_updates import repair_distances
+from route_search import shortest_times_from
+
+INF = float("inf")
+
+
+class LandmarkHeuristic:
+    """
+    ALT (A*, Landmarks, Triangle inequality) heuristic.
+
+    A few landmark stations are chosen and the shortest travel time from each landmark
+    to every station is computed once. Because every connection is two-way, the triangle
+    inequality gives |d(L, dest) - d(L, current)| <= d(current, dest) for each landmark L,
+    so the largest of these differences is an admissible estimate that costs O(1) per landmark.
+    """
+
+    def __init__(self, graph: "CSRGraph", num_landmarks: int = 8):
+        # Graph version the tables were built for (see MetroNetwork.version)
+        self.version = graph.version
+        self.landmarks: List[int] = []
+        self.tables: List[array] = []
+        self._select_landmarks(graph, num_landmarks)
+
+    def _select_landmarks(self, graph: "CSRGraph", num_landmarks: int) -> None:
+        """
+        This function picks the landmarks with the farthest-point strategy: every new landmark is the
+        station that is farthest from all landmarks chosen so far. Unreachable stations (another
+        component of the network) are preferred, so every component gets at least one landmark.
+
+        Args:
+            graph (CSRGraph): The frozen network to build the tables for.
+            num_landmarks (int): The maximum number of landmarks.
+        """
+        if not len(graph):
+            return
+
+        # Closest landmark distance of each station so far
+        closest = array("d", [INF]) * len(graph)
+        candidate = 0
+
+        for _ in range(min(num_landmarks, len(graph))):
+            table = shortest_times_from(graph, candidate)
+            self.landmarks.append(candidate)
+            self.tables.append(table)
+
+            for index, time in enumerate(table):
+                if time < closest[index]:
+                    closest[index] = time
+
+            candidate = max(range(len(graph)), key=closest.__getitem__)
+            if closest[candidate] == 0:
+                break # Every station is a landmark already
+
+    def copy(self) -> "LandmarkHeuristic":
+        """
+        This function returns a copy of the heuristic with its own tables, to be repaired while
+        searches keep using this one.
+        """
+        heuristic = LandmarkHeuristic.__new__(LandmarkHeuristic)
+        heuristic.version = self.version
+        heuristic.landmarks = list(self.landmarks)
+        heuristic.tables = [array("d", table) for table in self.tables]
+        return heuristic
+
+    def repair(self, graph: "CSRGraph", u: int, v: int, old_time: float, new_time: float) -> None:
+        """
+        This function updates the landmark tables after the time of the connection u-v changed
+        (see dynamic_updates.repair_distances). The landmarks themselves are kept.
+
+        Args:
+            graph (CSRGraph): The network, already holding the new time.
+            u (int): The index of one end of the connection.
+            v (int): The index of the other end of the connection.
+            old_time (float): The previous travel time.
+            new_time (float): The new travel time (inf if removed).
+        """
+        for landmark, table in zip(self.landmarks, self.tables):
+            repair_distances(graph, table, landmark, u, v, old_time, new_time)
+
+    def estimate(self, current: int, dest: int) -> float:
+        """
+        This function returns a lower bound of the travel time between two stations.
+
+        Args:
+            current (int): The index of the current station.
+            dest (int): The index of the destination station.
+
+        Returns:
+            float: The lower bound, or inf when the destination cannot be reached.
+        """
+        best = 0
+        for table in self.tables:
+            current_time = table[current]
+            dest_time = table[dest]
+
+            if current_time == INF and dest_time == INF:
+                continue # Landmark is in another component, it tells nothing
+            if current_time == INF or dest_time == INF:
+                return INF # Stations are in different components
+
+            difference = dest_time - current_time if dest_time > current_time else current_time - dest_time
+            if difference > best:
+                best = difference
+
+        return best
+
+
+def build_landmark_heuristic(graph: "CSRGraph", num_landmarks: Optional[int] = None) -> LandmarkHeuristic:
+    """
+    This function builds the landmark tables of a network.
+
+    Args:
+        graph (CSRGraph): The frozen network to build the tables for.
+        num_landmarks (int, optional): The number of landmarks. By default it grows slowly with the network size.
+
+    Returns:
+        LandmarkHeuristic: The heuristic, tagged with the version of the graph.
+    """
+    if num_landmarks is None:
+        num_landmarks = max(1, min(16, len(graph).bit_length()))
+    return LandmarkHeuristic(graph, num_landmarks)
@@ -1,80 +1,65 @@
-from collections import defaultdict, deque
-import heapq
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
-class Istasyon:
-    def __init__(self, idx: str, ad: str, hat: str):
-        self.idx = idx
-        self.ad = ad
-        self.hat = hat
-        self.komsular: List[Tuple['Istasyon', int]] = []  # (istasyon, süre) tuple'ları
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork, Station
+
+class Istasyon(Station):
+    """Station nesnesinin Türkçe adlarla kullanımı: ad -> name, hat -> line, komsular -> neighbors
+
+    Ayrı bir kopya değildir; MetroAgi bu sınıfın nesnelerini oluşturur ve tüm aramalar
+    MetroNetwork üzerinde çalışır.
+    """
+    __slots__ = ()
+
+    @property
+    def ad(self) -> str:
+        return self.name
+
+    @property
+    def hat(self) -> str:
+        return self.line
+
+    @property
+    def komsular(self) -> List[Tuple['Istasyon', int]]:
+        return self.neighbors  # (istasyon, süre) tuple'ları
 
     def komsu_ekle(self, istasyon: 'Istasyon', sure: int):
-        self.komsular.append((istasyon, sure))
+        self.add_neighbor(istasyon, sure)
+
+class MetroAgi(MetroNetwork):
+    """MetroNetwork'ün Türkçe arayüzü
+
+    Her metot MetroNetwork'teki karşılığını çağırır, böylece önbellek, CSR dizileri ve
+    arama algoritmalarındaki tüm iyileştirmeler iki arayüz için de geçerlidir.
+    """
+    station_class = Istasyon
 
-class MetroAgi:
-    def __init__(self):
-        self.istasyonlar: Dict[str, Istasyon] = {}
-        self.hatlar: Dict[str, List[Istasyon]] = defaultdict(list)
+    @property
+    def istasyonlar(self) -> Dict[str, Istasyon]:
+        return self.stations
+
+    @property
+    def hatlar(self) -> Dict[str, List[Istasyon]]:
+        return self.lines
 
     def istasyon_ekle(self, idx: str, ad: str, hat: str) -> None:
-        if id not in self.istasyonlar:
-            istasyon = Istasyon(idx, ad, hat)
-            self.istasyonlar[idx] = istasyon
-            self.hatlar[hat].append(istasyon)
+        self.add_station(idx, ad, hat)
 
     def baglanti_ekle(self, istasyon1_id: str, istasyon2_id: str, sure: int) -> None:
-        istasyon1 = self.istasyonlar[istasyon1_id]
-        istasyon2 = self.istasyonlar[istasyon2_id]
-        istasyon1.komsu_ekle(istasyon2, sure)
-        istasyon2.komsu_ekle(istasyon1, sure)
-    
+        self.add_connection(istasyon1_id, istasyon2_id, sure)
+
     def en_az_aktarma_bul(self, baslangic_id: str, hedef_id: str) -> Optional[List[Istasyon]]:
-        """BFS algoritması kullanarak en az aktarmalı rotayı bulur
-        
-        Bu fonksiyonu tamamlayın:
-        1. Başlangıç ve hedef istasyonların varlığını kontrol edin
-        2. BFS algoritmasını kullanarak en az aktarmalı rotayı bulun
-        3. Rota bulunamazsa None, bulunursa istasyon listesi döndürün
-        4. Fonksiyonu tamamladıktan sonra, # TODO ve pass satırlarını kaldırın
-        
-        İpuçları:
-        - collections.deque kullanarak bir kuyruk oluşturun, HINT: kuyruk = deque([(baslangic, [baslangic])])
-        - Ziyaret edilen istasyonları takip edin
-        - Her adımda komşu istasyonları keşfedin
-        """
-        # TODO: Bu fonksiyonu tamamlayın
-        pass
-        if baslangic_id not in self.istasyonlar or hedef_id not in self.istasyonlar:
-            return None
-        baslangic = self.istasyonlar[baslangic_id]
-        hedef = self.istasyonlar[hedef_id]
-        ziyaret_edildi = {baslangic}        
+        """En az aktarmalı rotayı bulur (bkz. MetroNetwork.find_least_transfer)
 
+        Rota bulunamazsa None, bulunursa istasyon listesi döndürülür.
+        """
+        return self.find_least_transfer(baslangic_id, hedef_id)
 
     def en_hizli_rota_bul(self, baslangic_id: str, hedef_id: str) -> Optional[Tuple[List[Istasyon], int]]:
-        """A* algoritması kullanarak en hızlı rotayı bulur
-        
-        Bu fonksiyonu tamamlayın:
-        1. Başlangıç ve hedef istasyonların varlığını kontrol edin
-        2. A* algoritmasını kullanarak en hızlı rotayı bulun
-        3. Rota bulunamazsa None, bulunursa (istasyon_listesi, toplam_sure) tuple'ı döndürün
-        4. Fonksiyonu tamamladıktan sonra, # TODO ve pass satırlarını kaldırın
-        
-        İpuçları:
-        - heapq modülünü kullanarak bir öncelik kuyruğu oluşturun, HINT: pq = [(0, id(baslangic), baslangic, [baslangic])]
-        - Ziyaret edilen istasyonları takip edin
-        - Her adımda toplam süreyi hesaplayın
-        - En düşük süreye sahip rotayı seçin
+        """A* algoritması kullanarak en hızlı rotayı bulur (bkz. MetroNetwork.find_fastest_route)
+
+        Rota bulunamazsa None, bulunursa (istasyon_listesi, toplam_sure) tuple'ı döndürülür.
         """
-        # TODO: Bu fonksiyonu tamamlayın
-        pass
-        if baslangic_id not in self.istasyonlar or hedef_id not in self.istasyonlar:
-            return None
-
-        baslangic = self.istasyonlar[baslangic_id]
-        hedef = self.istasyonlar[hedef_id]
-        ziyaret_edildi = set()
+        return self.find_fastest_route(baslangic_id, hedef_id)
 
 # Örnek Kullanım
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+from array import array
+import mmap
+import struct
+import sys
+from typing import List
+
+from csr_graph import CSRGraph, typecode_of
+
+# File layout (every section starts at an 8-byte boundary):
+#   header        HEADER struct below
+#   offsets       int64   x (stations + 1)
+#   targets       int32   x edges
+#   weights       int32 or float64 x edges (typecode in the header)
+#   station_lines int32   x stations
+#   3 string blocks (station ids, station names, line names): uint64 length + NUL separated UTF-8
+MAGIC = b"METRONET"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIcc2xQQQ") # magic, format version, byte order, weight typecode, stations, lines, edges
+BYTE_ORDER = b"L" if sys.byteorder == "little" else b"B"
+
+
+def _pad(file) -> None:
+    file.write(b"\0" * (-file.tell() % 8))
+
+
+def _write_strings(file, strings: List[str]) -> None:
+    blob = "\0".join(strings).encode("utf-8")
+    file.write(struct.pack("<Q", len(blob)))
+    file.write(blob)
+    _pad(file)
+
+
+def save_snapshot(graph: CSRGraph, path: str) -> None:
+    """
+    This function writes the frozen network to a compact binary snapshot.
+
+    Args:
+        graph (CSRGraph): The frozen network (see MetroNetwork.freeze).
+        path (str): The path of the snapshot file.
+    """
+    with open(path, "wb") as file:
+        weight_typecode = typecode_of(graph.weights)
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER, weight_typecode.encode("ascii"),
+                               len(graph), len(graph.line_names), graph.num_edges))
+        for values, typecode in ((graph.offsets, "q"), (graph.targets, "i"), (graph.weights, weight_typecode),
+                                 (graph.station_lines, "i")):
+            if not isinstance(values, array) or values.typecode != typecode:
+                values = array(typecode, values) # Views opened from another snapshot
+            values.tofile(file)
+            _pad(file)
+
+        _write_strings(file, [station.idx for station in graph.stations])
+        _write_strings(file, [station.name for station in graph.stations])
+        _write_strings(file, graph.line_names)
+
+
+class SnapshotReader:
+    """
+    Reads the sections of a snapshot from a memory map without copying the arrays.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            # Private (copy-on-write) mapping: pages are shared between all processes that open
+            # the snapshot and are only copied for a process that changes them
+            self.mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.view = memoryview(self.mapped)
+        self.position = HEADER.size
+
+        magic, format_version, byte_order, typecode, self.num_stations, self.num_lines, self.num_edges = \
+            HEADER.unpack_from(self.mapped, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a metro network snapshot (format {FORMAT_VERSION})")
+        if byte_order != BYTE_ORDER:
+            raise ValueError(f"{path} was written on a machine with another byte order")
+        self.weight_typecode = typecode.decode("ascii")
+
+    def array(self, typecode: str, length: int) -> memoryview:
+        size = struct.calcsize(typecode) * length
+        values = self.view[self.position:self.position + size].cast(typecode)
+        self.position += size + (-size % 8)
+        return values
+
+    def strings(self) -> List[str]:
+        (length,) = struct.unpack_from("<Q", self.mapped, self.position)
+        start = self.position + 8
+        self.position = start + length + (-length % 8)
+        if length == 0:
+            return [""]
+        return bytes(self.view[start:start + length]).decode("utf-8").split("\0")
+
+
+def _read_arrays(reader: SnapshotReader):
+    """
+    This function returns the memory-mapped offsets, targets, weights and station lines of a snapshot.
+    """
+    offsets = reader.array("q", reader.num_stations + 1)
+    targets = reader.array("i", reader.num_edges)
+    weights = reader.array(reader.weight_typecode, reader.num_edges)
+    station_lines = reader.array("i", reader.num_stations)
+    return offsets, targets, weights, station_lines
+
+
+def open_snapshot_graph(path: str) -> CSRGraph:
+    """
+    This function opens only the adjacency arrays of a snapshot, as a CSRGraph without a network
+    behind it: no Station objects are created and the string blocks are not read, so the cost does
+    not grow with the network. It is meant for processes that search on station indices only
+    (see batch_queries); graph.stations, graph.station_ids and graph.line_names are empty.
+
+    Args:
+        path (str): The path of the snapshot file.
+
+    Returns:
+        CSRGraph: The graph, with version -1 (it belongs to no network).
+
+    Raises:
+        ValueError: If the file is not a snapshot that can be read on this machine.
+    """
+    reader = SnapshotReader(path)
+    offsets, targets, weights, station_lines = _read_arrays(reader)
+    return CSRGraph(-1, [], [], station_lines, offsets, targets, weights)
+
+
+def load_snapshot(path: str, network: "MetroNetwork") -> "MetroNetwork":
+    """
+    This function opens a snapshot written by save_snapshot into an empty network.
+
+    The adjacency arrays (offsets, targets, weights, station lines) are memory-mapped and used
+    by the searches directly, so their size does not add to the opening time. The station ids,
+    names and line names are read and one Station object per station is created, which is the
+    cost of opening a large network (about a second per few hundred thousand stations); processes
+    that only need the arrays use open_snapshot_graph instead. The builder adjacency lists
+    (Station.neighbors) are filled in lazily, when they are first read or the network is changed.
+
+    Args:
+        path (str): The path of the snapshot file.
+        network (MetroNetwork): The empty network to fill.
+
+    Returns:
+        MetroNetwork: The network.
+
+    Raises:
+        ValueError: If the file is not a snapshot that can be read on this machine.
+    """
+    reader = SnapshotReader(path)
+    offsets, targets, weights, station_lines = _read_arrays(reader)
+
+    station_ids = reader.strings() if reader.num_stations else []
+    names = reader.strings() if reader.num_stations else []
+    line_names = reader.strings() if reader.num_lines else []
+
+    network.add_stations((idx, name, line_names[station_lines[index]])
+                         for index, (idx, name) in enumerate(zip(station_ids, names)))
+
+    graph = CSRGraph(network.version, list(network.stations.values()), line_names, station_lines,
+                     offsets, targets, weights)
+    network.attach_frozen_graph(graph, reader.mapped)
+    return network
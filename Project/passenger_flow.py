@@ -0,0 +1,396 @@
+from array import array
+from collections import Counter
+import heapq
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from route_search import shortest_path_tree
+from timetable_routing import DEFAULT_HEADWAY, line_segments
+
+# Riders one train of a line can carry when the line has no capacity of its own
+DEFAULT_CAPACITY = 1000
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """
+    This function draws a Poisson distributed number of arrivals (normal approximation for large means).
+    """
+    if mean <= 0:
+        return 0
+    if mean > 50:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    limit = math.exp(-mean)
+    count = 0
+    product = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+class PassengerFlowResult:
+    """
+    Totals and crowding figures of a passenger flow simulation.
+    """
+
+    def __init__(self, minutes: float):
+        self.minutes = minutes
+        # Riders that appeared at their origin / reached their destination
+        self.generated = 0
+        self.completed = 0
+        # Riders whose destination cannot be reached from their origin
+        self.unroutable = 0
+        # Riders on a platform / on a train / walking a connection when the run ended
+        self.waiting = 0
+        self.riding = 0
+        self.walking = 0
+        # Sum over time of the riders in the system (waiting, on a train or walking), in rider-minutes
+        self.rider_minutes = 0.0
+        # Riders left on a platform because the train was full (counted at every full train)
+        self.denied_boardings = 0
+        # Most riders waiting at a time, per station id
+        self.peak_waiting: Dict[str, int] = {}
+        # Highest load / capacity of a train between two consecutive stops, per (line, from id, to id)
+        self.segment_peak_load: Dict[Tuple[str, str, str], float] = {}
+
+    @property
+    def in_system(self) -> int:
+        # Equal to waiting + riding + walking
+        return self.generated - self.completed - self.unroutable
+
+    def average_trip_minutes(self) -> float:
+        """
+        This function estimates the average door-to-door time of a trip with Little's law
+        (rider-minutes spent in the system per rider).
+        """
+        riders = self.generated - self.unroutable
+        return self.rider_minutes / riders if riders else 0.0
+
+    def line_peak_load(self) -> Dict[str, float]:
+        """
+        This function returns the highest load factor of any segment of every line.
+        """
+        peaks: Dict[str, float] = {}
+        for (line, _, _), load in self.segment_peak_load.items():
+            peaks[line] = max(load, peaks.get(line, 0.0))
+        return peaks
+
+    def crowded_segments(self, threshold: float = 0.9) -> List[Tuple[Tuple[str, str, str], float]]:
+        """
+        This function returns the segments whose peak load factor reached the threshold, most crowded first.
+        """
+        segments = [(segment, load) for segment, load in self.segment_peak_load.items() if load >= threshold]
+        segments.sort(key=lambda item: -item[1])
+        return segments
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"minutes": self.minutes, "generated": self.generated, "completed": self.completed,
+                "unroutable": self.unroutable, "in_system": self.in_system, "waiting": self.waiting,
+                "riding": self.riding, "walking": self.walking,
+                "average_trip_minutes": round(self.average_trip_minutes(), 3),
+                "denied_boardings": self.denied_boardings, "line_peak_load": self.line_peak_load()}
+
+    def __repr__(self):
+        return (f"PassengerFlowResult(generated={self.generated}, completed={self.completed}, "
+                f"in_system={self.in_system}, denied_boardings={self.denied_boardings})")
+
+
+class PassengerFlowSimulation:
+    """
+    Discrete-time simulation of riders and trains on a MetroNetwork.
+
+    Riders are not objects: they are counts grouped by destination. Every destination has a
+    shortest path tree, and a rider at station S always moves to the tree parent of S next, so
+    the rest of a trip depends only on (station, destination). Riders wait at a station per next
+    station, board any train whose next stop it is (up to the train's capacity), leave it where
+    their route leaves the train's line, and walk connections that no line runs over. Trains run
+    along every line (see timetable_routing.line_segments) in both directions, one every headway.
+
+    The state of the trains is kept in parallel arrays, so a step costs time proportional to the
+    trains and rider groups that move, not to the number of riders.
+    """
+
+    def __init__(self, network: "MetroNetwork", demand: Iterable[Tuple[str, str, float]],
+                 headways: Optional[Dict[str, float]] = None, capacities: Optional[Dict[str, int]] = None,
+                 default_headway: float = DEFAULT_HEADWAY, default_capacity: int = DEFAULT_CAPACITY,
+                 step: float = 1.0, seed: int = 0):
+        """
+        Args:
+            network (MetroNetwork): The network.
+            demand (Iterable[Tuple[str, str, float]]): (origin id, destination id, riders per hour) triples.
+            headways (Dict[str, float], optional): Minutes between two trains, per line name.
+            capacities (Dict[str, int], optional): Riders per train, per line name.
+            default_headway (float): Headway of lines missing from headways.
+            default_capacity (int): Capacity of lines missing from capacities.
+            step (float): Minutes per simulation step.
+            seed (int): Seed of the random arrivals, the same seed gives the same run.
+
+        Raises:
+            KeyError: If a station of the demand is unknown.
+            ValueError: If a headway, capacity or the step is not positive.
+        """
+        if step <= 0:
+            raise ValueError("The simulation step must be positive")
+        headways = headways or {}
+        capacities = capacities or {}
+        graph = network.freeze()
+        self.graph = graph
+        self.step = step
+        self.rng = random.Random(seed)
+
+        # Destinations: one shortest path tree each, parents[d][station] is the next station towards it
+        self.destinations: List[int] = []
+        self.parents: List[array] = []
+        destination_slots: Dict[int, int] = {}
+        origins, slots, rates = array("i"), array("i"), array("d")
+        for start_id, dest_id, riders_per_hour in demand:
+            origin = network.stations[start_id].index
+            dest = network.stations[dest_id].index
+            if dest not in destination_slots:
+                destination_slots[dest] = len(self.destinations)
+                self.destinations.append(dest)
+                self.parents.append(shortest_path_tree(graph, dest)[1])
+            origins.append(origin)
+            slots.append(destination_slots[dest])
+            rates.append(riders_per_hour / 60 * step) # Mean arrivals per step
+        self.demand_origins = origins
+        self.demand_destinations = slots
+        self.demand_rates = rates
+        self.total_rate = sum(rates)
+        self.cumulative_rates = [0.0] * len(rates)
+        running = 0.0
+        for position, rate in enumerate(rates):
+            running += rate
+            self.cumulative_rates[position] = running
+
+        # Services: one per line run and direction, with flat stop and segment time arrays
+        self.service_lines: List[str] = []
+        self.service_offsets = array("q", [0])
+        self.service_stops = array("i")
+        self.service_minutes = array("d") # Minutes to the next stop, 0 at the last stop
+        self.service_headways = array("d")
+        self.service_capacities = array("q")
+        self.served = set() # (station, next station) pairs some train runs over
+        for line, runs in line_segments(network).items():
+            headway = headways.get(line, default_headway)
+            capacity = capacities.get(line, default_capacity)
+            if headway <= 0 or capacity <= 0:
+                raise ValueError(f"Headway and capacity of {line} must be positive")
+            for run in runs:
+                backward = [(second, first, minutes) for first, second, minutes in reversed(run)]
+                for segments in (run, backward):
+                    self.service_lines.append(line)
+                    self.service_headways.append(headway)
+                    self.service_capacities.append(capacity)
+                    for first, second, minutes in segments:
+                        self.service_stops.append(first)
+                        self.service_minutes.append(minutes)
+                        self.served.add((first, second))
+                    self.service_stops.append(segments[-1][1])
+                    self.service_minutes.append(0)
+                    self.service_offsets.append(len(self.service_stops))
+
+        # Walking time of the connections no train runs over
+        self.walk_minutes: Dict[Tuple[int, int], float] = {}
+        for station in range(len(graph)):
+            for neighbor, minutes in graph.neighbors(station):
+                pair = (station, neighbor)
+                if pair not in self.served and minutes < self.walk_minutes.get(pair, math.inf):
+                    self.walk_minutes[pair] = minutes
+
+    def run(self, minutes: float) -> PassengerFlowResult:
+        """
+        This function simulates the given number of minutes from an empty network: riders arrive at
+        their origins (Poisson arrivals at the demand rates) and the first train of every service
+        leaves at minute 0.
+
+        Args:
+            minutes (float): The simulated time.
+
+        Returns:
+            PassengerFlowResult: The totals and crowding figures of the run.
+        """
+        rng = self.rng
+        step = self.step
+        graph = self.graph
+        parents = self.parents
+        destinations = self.destinations
+        served = self.served
+        walk_minutes = self.walk_minutes
+        offsets = self.service_offsets
+        stops = self.service_stops
+        segment_minutes = self.service_minutes
+        capacities = self.service_capacities
+        result = PassengerFlowResult(minutes)
+
+        # waiting[station][next station][destination slot] = riders
+        waiting: List[Dict[int, Dict[int, int]]] = [{} for _ in range(len(graph))]
+        waiting_count = array("q", bytes(8 * len(graph)))
+        peak_waiting = array("q", bytes(8 * len(graph)))
+        walking: List[Tuple[float, int, int, int]] = [] # (arrival, station, destination slot, riders)
+        segment_peak = array("d", bytes(8 * len(stops)))
+
+        # Trains: parallel arrays indexed by train slot, slots of finished trains are reused
+        train_services = array("i")
+        train_positions = array("i") # Position of the next stop in the service's stop array
+        train_arrivals = array("d") # Time of arrival at that stop
+        train_loads = array("q")
+        train_riders: List[Dict[int, int]] = [] # Destination slot -> riders on board
+        active: List[int] = []
+        free: List[int] = []
+        next_departures = array("d", bytes(8 * len(self.service_lines)))
+
+        def place(station: int, slot: int, riders: int, now: float) -> None:
+            # Riders at a station: done, waiting for a train to the next station, or walking to it
+            if station == destinations[slot]:
+                result.completed += riders
+                return
+            following = parents[slot][station]
+            if following < 0:
+                result.unroutable += riders
+            elif (station, following) in served:
+                by_destination = waiting[station].setdefault(following, {})
+                by_destination[slot] = by_destination.get(slot, 0) + riders
+                waiting_count[station] += riders
+                if waiting_count[station] > peak_waiting[station]:
+                    peak_waiting[station] = waiting_count[station]
+            else:
+                heapq.heappush(walking, (now + walk_minutes[(station, following)], following, slot, riders))
+
+        def board(train: int, station: int, following: int) -> None:
+            group = waiting[station].get(following)
+            if not group:
+                return
+            room = capacities[train_services[train]] - train_loads[train]
+            total = sum(group.values())
+            riders = train_riders[train]
+            if total <= room:
+                boarding = group
+                del waiting[station][following]
+            else:
+                # Full train: every destination boards in proportion to its share of the platform
+                result.denied_boardings += total - room
+                boarding = {slot: count * room // total for slot, count in group.items()}
+                left = room - sum(boarding.values())
+                for slot, count in group.items():
+                    if left == 0:
+                        break
+                    if boarding[slot] < count:
+                        boarding[slot] += 1
+                        left -= 1
+                for slot, count in boarding.items():
+                    group[slot] -= count
+                    if not group[slot]:
+                        del group[slot]
+            boarded = 0
+            for slot, count in boarding.items():
+                if count:
+                    riders[slot] = riders.get(slot, 0) + count
+                    boarded += count
+            train_loads[train] += boarded
+            waiting_count[station] -= boarded
+
+        for tick in range(int(minutes / step)):
+            now = tick * step
+
+            # New trains at the first stop of every service
+            for service in range(len(next_departures)):
+                while next_departures[service] <= now:
+                    if free:
+                        train = free.pop()
+                        train_services[train] = service
+                        train_positions[train] = offsets[service]
+                        train_arrivals[train] = next_departures[service]
+                        train_loads[train] = 0
+                    else:
+                        train = len(train_services)
+                        train_services.append(service)
+                        train_positions.append(offsets[service])
+                        train_arrivals.append(next_departures[service])
+                        train_loads.append(0)
+                        train_riders.append({})
+                    active.append(train)
+                    next_departures[service] += self.service_headways[service]
+
+            # Riders appearing at their origin. With fewer expected riders than demand pairs, one Poisson
+            # total is drawn and spread over the pairs by rate (the same distribution, fewer draws)
+            if self.total_rate < len(self.demand_rates):
+                total = _poisson(rng, self.total_rate)
+                picks = Counter(rng.choices(range(len(self.demand_rates)), cum_weights=self.cumulative_rates, k=total))
+                for pair, riders in sorted(picks.items()):
+                    result.generated += riders
+                    place(self.demand_origins[pair], self.demand_destinations[pair], riders, now)
+            else:
+                for pair, rate in enumerate(self.demand_rates):
+                    riders = _poisson(rng, rate)
+                    if riders:
+                        result.generated += riders
+                        place(self.demand_origins[pair], self.demand_destinations[pair], riders, now)
+
+            while walking and walking[0][0] <= now:
+                _, station, slot, riders = heapq.heappop(walking)
+                place(station, slot, riders, now)
+
+            # Trains reaching stops: riders get off where their route leaves the train, then board
+            still_running = []
+            for train in active:
+                position = train_positions[train]
+                end = offsets[train_services[train] + 1] - 1
+                finished = False
+                while train_arrivals[train] <= now:
+                    station = stops[position]
+                    following = stops[position + 1] if position < end else -1
+                    riders = train_riders[train]
+                    for slot in [slot for slot in riders if parents[slot][station] != following or following < 0]:
+                        count = riders.pop(slot)
+                        train_loads[train] -= count
+                        place(station, slot, count, train_arrivals[train])
+                    if following < 0:
+                        finished = True
+                        break
+                    board(train, station, following)
+                    load = train_loads[train] / capacities[train_services[train]]
+                    if load > segment_peak[position]:
+                        segment_peak[position] = load
+                    train_arrivals[train] += segment_minutes[position]
+                    position += 1
+                train_positions[train] = position
+                if finished:
+                    free.append(train)
+                else:
+                    still_running.append(train)
+            active = still_running
+
+            result.rider_minutes += result.in_system * step
+
+        result.waiting = sum(waiting_count)
+        result.riding = sum(train_loads[train] for train in active)
+        result.walking = sum(riders for _, _, _, riders in walking)
+        stations = graph.stations
+        for station in range(len(graph)):
+            if peak_waiting[station]:
+                result.peak_waiting[stations[station].idx] = peak_waiting[station]
+        for service, line in enumerate(self.service_lines):
+            for position in range(offsets[service], offsets[service + 1] - 1):
+                if segment_peak[position] > 0:
+                    key = (line, stations[stops[position]].idx, stations[stops[position + 1]].idx)
+                    result.segment_peak_load[key] = max(segment_peak[position], result.segment_peak_load.get(key, 0.0))
+        return result
+
+
+def simulate_passenger_flow(network: "MetroNetwork", demand: Iterable[Tuple[str, str, float]],
+                            minutes: float, **kwargs) -> PassengerFlowResult:
+    """
+    This function runs a PassengerFlowSimulation for the given number of minutes.
+
+    Args:
+        network (MetroNetwork): The network.
+        demand (Iterable[Tuple[str, str, float]]): (origin id, destination id, riders per hour) triples.
+        minutes (float): The simulated time.
+        **kwargs: headways, capacities, default_headway, default_capacity, step, seed.
+
+    Returns:
+        PassengerFlowResult: The totals and crowding figures of the run.
+    """
+    return PassengerFlowSimulation(network, demand, **kwargs).run(minutes)
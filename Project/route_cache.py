@@ -0,0 +1,146 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+# Returned by RouteCache.get when the key is not cached (None is a valid cached result: "no route")
+MISSING = object()
+
+
+class CacheStats:
+    """
+    Counters of a RouteCache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        # Entries dropped because the cache was full
+        self.evictions = 0
+        # Entries dropped because they were older than the time-to-live
+        self.expirations = 0
+        # Entries dropped because the network changed
+        self.invalidations = 0
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions}, "
+                f"expirations={self.expirations}, invalidations={self.invalidations})")
+
+
+class RouteCache:
+    """
+    Bounded LRU cache (with an optional time-to-live) for route query results.
+
+    Keys are (start_id, dest_id, mode) tuples. Every entry belongs to one network version;
+    when a lookup or insert comes with a newer version, the whole cache is dropped, so a
+    result computed before add_station / add_connection is never returned. Connection updates
+    use retain() to keep the entries they cannot have changed.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int): The maximum number of cached routes (0 disables the cache).
+            ttl (float, optional): Seconds an entry stays valid, None for no expiry.
+            clock (Callable): Time source for the time-to-live.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.version = None
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict() # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self, version: int) -> bool:
+        """
+        This function drops every entry when the network has a newer version.
+
+        Returns:
+            bool: False if the given version is older than the cached one (a stale caller).
+        """
+        if self.version is not None and version < self.version:
+            return False
+        if version != self.version:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self.version = version
+        return True
+
+    def get(self, key: Hashable, version: int) -> Any:
+        """
+        This function returns a cached result and marks it as recently used.
+
+        Args:
+            key (Hashable): The (start_id, dest_id, mode) key.
+            version (int): The current network version.
+
+        Returns:
+            Any: The cached value or MISSING.
+        """
+        with self._lock:
+            entry = self._entries.get(key) if self._check_version(version) else None
+            if entry is None:
+                self.stats.misses += 1
+                return MISSING
+
+            stored_at, value = entry
+            if self.ttl is not None and self.clock() - stored_at > self.ttl:
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """
+        This function stores a result, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (Hashable): The (start_id, dest_id, mode) key.
+            version (int): The network version the value was computed for.
+            value (Any): The result to cache.
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if not self._check_version(version):
+                return # Computed for an older network, it must not replace newer results
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def retain(self, version: int, keep: Callable[[Hashable, Any], bool]) -> None:
+        """
+        This function moves the cache to a newer network version, keeping only the entries that
+        are still correct for it instead of dropping everything (see MetroNetwork.update_connection_time).
+
+        Args:
+            version (int): The new network version.
+            keep (Callable): keep(key, value) is True if the cached value is still valid.
+        """
+        with self._lock:
+            if self.version is not None and version < self.version:
+                return
+            for key in [key for key, (_, value) in self._entries.items() if not keep(key, value)]:
+                del self._entries[key]
+                self.stats.invalidations += 1
+            self.version = version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,546 @@
+from array import array
+from collections import deque
+import heapq
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+INF = float("inf")
+
+
+class SearchStats:
+    """
+    Work done by one search, for profiling slow queries.
+
+    Pass an instance as the `stats` argument of a search (or of MetroNetwork.find_fastest_route /
+    find_least_transfer_route) to have it filled in. Without one, a search only keeps a push counter;
+    everything else is derived once at the end or measured only when stats are requested.
+    """
+
+    __slots__ = ("popped", "expanded", "relaxed", "pushes", "heap_high_water",
+                 "heuristic_calls", "heuristic_seconds", "trace_seconds", "seconds", "cached")
+
+    def __init__(self):
+        # Queue entries taken out, including outdated ones
+        self.popped = 0
+        # Stations settled (taken out for the first time)
+        self.expanded = 0
+        # Connections scanned from the settled stations
+        self.relaxed = 0
+        # Queue insertions
+        self.pushes = 0
+        # Largest queue size during the search
+        self.heap_high_water = 0
+        # Calls of the A* heuristic and the time spent in them
+        self.heuristic_calls = 0
+        self.heuristic_seconds = 0.0
+        # Time spent rebuilding the route from the parent pointers
+        self.trace_seconds = 0.0
+        # Wall time of the whole query (set by MetroNetwork)
+        self.seconds = 0.0
+        # True if the route came from the route cache and no search ran (set by MetroNetwork)
+        self.cached = False
+
+    def timed(self, heuristic: Callable[[int, int], float]) -> Callable[[int, int], float]:
+        """
+        This function wraps a heuristic so its calls are counted and timed in these stats.
+        """
+        clock = time.perf_counter
+
+        def timed_heuristic(current: int, dest: int) -> float:
+            started = clock()
+            estimate = heuristic(current, dest)
+            self.heuristic_seconds += clock() - started
+            self.heuristic_calls += 1
+            return estimate
+
+        return timed_heuristic
+
+    def record(self, offsets, settled, scanned_all: bool, dest: int, pushes: int,
+               queue_left: int, high_water: int) -> None:
+        """
+        This function stores the counters of a finished search. Connections scanned are counted
+        from the degrees of the settled stations (in the CSR offsets the search ran on),
+        so the search loop does not count them.
+        """
+        self.expanded = len(settled)
+        self.relaxed = sum(offsets[station + 1] - offsets[station] for station in settled
+                           if scanned_all or station != dest)
+        self.pushes = pushes
+        self.popped = pushes - queue_left
+        self.heap_high_water = high_water
+
+    def as_dict(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return "SearchStats(" + ", ".join(f"{name}={value}" for name, value in self.as_dict().items()) + ")"
+
+
+def _traced(stats: Optional[SearchStats], parents: Dict[int, int], destination: int) -> List[int]:
+    """
+    This function runs trace_path and adds its time to the stats, if any.
+    """
+    if stats is None:
+        return trace_path(parents, destination)
+    started = time.perf_counter()
+    path = trace_path(parents, destination)
+    stats.trace_seconds += time.perf_counter() - started
+    return path
+
+
+def trace_path(parents: Dict[int, int], destination: int) -> List[int]:
+    """
+    This function traces the path from destination station to the start station
+    using the parent mapping of a single query. (Backtracking)
+
+    Args:
+        parents (Dict[int, int]): Parent station index of every reached station, keyed by station index.
+        destination (int): The index of the destination station.
+
+    Returns:
+        List[int]: The station indices from the start station to the destination station.
+    """
+    path = []
+    current = destination
+
+    while current is not None:
+        path.append(current)
+        current = parents.get(current) # go back to the parent station
+
+    path.reverse() # Reverse the path to get the path from start to destination
+
+    return path
+
+
+def a_star(graph: "CSRGraph", start: int, dest: int, heuristic: Callable[[int, int], float],
+           stats: Optional[SearchStats] = None) -> Optional[Tuple[List[int], float]]:
+    """
+    This function runs the A* algorithm between two stations of a CSR graph.
+
+    All search state (g values, parents, closed set) lives in dictionaries local to this call
+    and keyed by the integer station index, so nothing is written to the graph or the stations.
+    Many queries can therefore run at the same time on one shared network and no reset of
+    the whole network is needed before a query.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        start (int): The index of the start station.
+        dest (int): The index of the destination station.
+        heuristic (Callable): Admissible estimate of the time between a station index and the destination index.
+        stats (SearchStats, optional): Filled in with the work done by the search.
+
+    Returns:
+        Optional[Tuple[List[int], float]]: (station indices, total_time) or None if the destination cannot be reached.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    g: Dict[int, float] = {start: 0}
+    parents: Dict[int, int] = {}
+    closed = set()
+
+    if stats is not None:
+        heuristic = stats.timed(heuristic)
+    open_list = [(heuristic(start, dest), start)] # (f, station index)
+    pushes = 1
+    high_water = 1
+    result = None
+
+    while open_list:
+        if stats is not None and len(open_list) > high_water:
+            high_water = len(open_list)
+        f, current = heapq.heappop(open_list)
+        if current in closed:
+            continue # Outdated queue entry
+        closed.add(current)
+
+        # Check if destination is reached and return the path
+        if current == dest:
+            result = _traced(stats, parents, dest), g[current]
+            break
+
+        current_g = g[current]
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            if neighbor in closed:
+                continue
+
+            g_new = current_g + weights[slot]
+            if g_new < g.get(neighbor, INF):
+                h_new = heuristic(neighbor, dest)
+                if h_new == INF:
+                    continue # Destination cannot be reached from this station
+                g[neighbor] = g_new
+                parents[neighbor] = current
+                heapq.heappush(open_list, (g_new + h_new, neighbor))
+                pushes += 1
+
+    if stats is not None:
+        stats.record(offsets, closed, False, dest, pushes, len(open_list), high_water)
+    # If no path is found, result is None
+    return result
+
+
+def bidirectional_dijkstra(graph: "CSRGraph", start: int, dest: int,
+                           stats: Optional[SearchStats] = None) -> Optional[Tuple[List[int], float]]:
+    """
+    This function runs Dijkstra's algorithm from both ends of the query at the same time.
+
+    The forward search grows from the start station and the backward search from the destination
+    (connections are two-way, so both use the same CSR arrays). The side with the smaller queue
+    key is expanded next, and the search stops once the two smallest keys add up to at least the
+    best meeting point found, so a long cross-city trip explores two small balls instead of one big one.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        start (int): The index of the start station.
+        dest (int): The index of the destination station.
+        stats (SearchStats, optional): Filled in with the work done by both searches.
+
+    Returns:
+        Optional[Tuple[List[int], float]]: (station indices, total_time) or None if the destination cannot be reached.
+    """
+    if start == dest:
+        return [start], 0
+
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    # Index 0 is the forward search, index 1 the backward search
+    times: Tuple[Dict[int, float], Dict[int, float]] = ({start: 0}, {dest: 0})
+    parents: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+    closed = (set(), set())
+    open_lists = ([(0, start)], [(0, dest)])
+
+    best_time = INF
+    meeting = None
+    pushes = 2
+    high_water = 2
+
+    while open_lists[0] and open_lists[1]:
+        if open_lists[0][0][0] + open_lists[1][0][0] >= best_time:
+            break # No shorter route can pass through the unexplored stations
+        if stats is not None and len(open_lists[0]) + len(open_lists[1]) > high_water:
+            high_water = len(open_lists[0]) + len(open_lists[1])
+
+        side = 0 if open_lists[0][0][0] <= open_lists[1][0][0] else 1
+        time, current = heapq.heappop(open_lists[side])
+        if current in closed[side]:
+            continue # Outdated queue entry
+        closed[side].add(current)
+
+        side_times = times[side]
+        other_times = times[1 - side]
+        side_parents = parents[side]
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            new_time = time + weights[slot]
+            if new_time == INF:
+                continue # Removed connection
+            if new_time < side_times.get(neighbor, INF):
+                side_times[neighbor] = new_time
+                side_parents[neighbor] = current
+                heapq.heappush(open_lists[side], (new_time, neighbor))
+                pushes += 1
+
+            if neighbor in other_times:
+                total_time = side_times[neighbor] + other_times[neighbor]
+                if total_time < best_time:
+                    best_time = total_time
+                    meeting = neighbor
+
+    if stats is not None:
+        # A station settled by both searches is counted twice, it was scanned twice
+        stats.record(offsets, list(closed[0]) + list(closed[1]), True, dest, pushes,
+                     len(open_lists[0]) + len(open_lists[1]), high_water)
+    if meeting is None:
+        return None
+
+    # start -> meeting from the forward parents, meeting -> dest from the backward parents
+    path = _traced(stats, parents[0], meeting)
+    path.extend(reversed(_traced(stats, parents[1], meeting)[:-1]))
+    return path, best_time
+
+
+def least_transfers(graph: "CSRGraph", start: int, dest: int,
+                    stats: Optional[SearchStats] = None) -> Optional[Tuple[List[int], int]]:
+    """
+    This function finds the route with the minimum number of line changes with 0-1 BFS.
+
+    Moving between two stations of the same line costs 0 and moving to a station of another
+    line costs 1 (a transfer). Zero-cost moves are pushed to the front of the deque and transfers
+    to the back, so stations leave the deque in order of transfer count and the search is
+    O(V + E). Only one parent pointer is stored per station instead of a copy of the path.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        start (int): The index of the start station.
+        dest (int): The index of the destination station.
+        stats (SearchStats, optional): Filled in with the work done by the search (pushes are deque insertions).
+
+    Returns:
+        Optional[Tuple[List[int], int]]: (station indices, number of transfers) or None if the destination cannot be reached.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    station_lines = graph.station_lines
+
+    transfers: Dict[int, int] = {start: 0}
+    parents: Dict[int, int] = {}
+    done = set()
+    queue = deque([start])
+    pushes = 1
+    high_water = 1
+    result = None
+
+    while queue:
+        if stats is not None and len(queue) > high_water:
+            high_water = len(queue)
+        current = queue.popleft()
+        if current in done:
+            continue # Already left the deque with fewer transfers
+        done.add(current)
+
+        if current == dest:
+            result = _traced(stats, parents, dest), transfers[dest]
+            break
+
+        current_transfers = transfers[current]
+        current_line = station_lines[current]
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            if neighbor in done or weights[slot] == INF:
+                continue # Already done, or a removed connection
+
+            if station_lines[neighbor] == current_line:
+                if current_transfers < transfers.get(neighbor, current_transfers + 2):
+                    transfers[neighbor] = current_transfers
+                    parents[neighbor] = current
+                    queue.appendleft(neighbor)
+                    pushes += 1
+            elif current_transfers + 1 < transfers.get(neighbor, current_transfers + 2):
+                transfers[neighbor] = current_transfers + 1
+                parents[neighbor] = current
+                queue.append(neighbor)
+                pushes += 1
+
+    if stats is not None:
+        stats.record(offsets, done, False, dest, pushes, len(queue), high_water)
+    # If no path is found, result is None
+    return result
+
+
+def pareto_routes(graph: "CSRGraph", start: int, dest: int) -> List[Tuple[List[int], float, int]]:
+    """
+    This function finds the Pareto front of (total time, number of line changes) between two stations
+    in a single label-setting pass.
+
+    A label is one way of reaching a station: (time, transfers, parent label). Labels are stored in
+    parallel arrays and every station keeps only its non-dominated labels, i.e. those that are not
+    both slower and with more transfers than another label. Labels leave the queue in (time, transfers)
+    order, so every label that reaches the destination and is not dominated there is part of the front.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        start (int): The index of the start station.
+        dest (int): The index of the destination station.
+
+    Returns:
+        List[Tuple[List[int], float, int]]: (station indices, total_time, transfers) per Pareto-optimal
+        route, fastest first (and so with the most transfers first). Empty if there is no route.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    station_lines = graph.station_lines
+
+    # Label storage: label i is label_stations[i] reached at label_times[i] with label_transfers[i]
+    label_times = array("d", [0])
+    label_transfers = array("i", [0])
+    label_stations = array("i", [start])
+    label_parents = array("i", [-1])
+    dominated = bytearray(1)
+
+    bags: Dict[int, List[int]] = {start: [0]} # Non-dominated label ids per station
+    front: List[int] = []
+    open_list = [(0, 0, 0)] # (time, transfers, label id)
+
+    while open_list:
+        time, transfers, label = heapq.heappop(open_list)
+        if dominated[label]:
+            continue
+        current = label_stations[label]
+
+        if current == dest:
+            front.append(label)
+            continue
+
+        # The destination labels are final; anything they dominate can never join the front
+        if front and label_transfers[front[-1]] <= transfers:
+            continue
+
+        current_line = station_lines[current]
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            new_time = time + weights[slot]
+            if new_time == INF:
+                continue # Removed connection
+            new_transfers = transfers + (station_lines[neighbor] != current_line)
+
+            bag = bags.setdefault(neighbor, [])
+            if any(label_times[other] <= new_time and label_transfers[other] <= new_transfers for other in bag):
+                continue
+            for other in bag:
+                if new_time <= label_times[other] and new_transfers <= label_transfers[other]:
+                    dominated[other] = 1
+            bag[:] = [other for other in bag if not dominated[other]]
+
+            new_label = len(label_times)
+            label_times.append(new_time)
+            label_transfers.append(new_transfers)
+            label_stations.append(neighbor)
+            label_parents.append(label)
+            dominated.append(0)
+            bag.append(new_label)
+            heapq.heappush(open_list, (new_time, new_transfers, new_label))
+
+    routes = []
+    for label in front:
+        path = []
+        current = label
+        while current >= 0:
+            path.append(label_stations[current])
+            current = label_parents[current]
+        path.reverse()
+        routes.append((path, label_times[label], label_transfers[label]))
+    return routes
+
+
+def shortest_path_tree(graph: "CSRGraph", source: int) -> Tuple[array, array]:
+    """
+    This function runs Dijkstra's algorithm from the source station over the whole network
+    and keeps the shortest path tree, so routes to every station can be read from one search.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        source (int): The index of the station to start from.
+
+    Returns:
+        Tuple[array, array]: Shortest travel time (inf if unreachable) and parent station index
+        (-1 for the source and unreachable stations) of every station, indexed by station index.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    times = array("d", [INF]) * len(graph)
+    parents = array("i", [-1]) * len(graph)
+    times[source] = 0
+    open_list = [(0, source)]
+
+    while open_list:
+        time, current = heapq.heappop(open_list)
+        if time > times[current]:
+            continue # Outdated queue entry
+
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            new_time = time + weights[slot]
+            if new_time < times[neighbor]:
+                times[neighbor] = new_time
+                parents[neighbor] = current
+                heapq.heappush(open_list, (new_time, neighbor))
+
+    return times, parents
+
+
+def tree_path(parents: array, destination: int) -> List[int]:
+    """
+    This function traces a route back through the parent array of a shortest path tree.
+
+    Args:
+        parents (array): Parent station index of every station (-1 for the root).
+        destination (int): The index of the destination station.
+
+    Returns:
+        List[int]: The station indices from the root of the tree to the destination.
+    """
+    path = []
+    current = destination
+    while current >= 0:
+        path.append(current)
+        current = parents[current]
+    path.reverse()
+    return path
+
+
+def shortest_times_from(graph: "CSRGraph", source: int) -> array:
+    """
+    This function runs Dijkstra's algorithm from the source station over the whole network.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        source (int): The index of the station to start from.
+
+    Returns:
+        array: Shortest travel time from the source to every station, indexed by station index (inf if unreachable).
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    times = array("d", [INF]) * len(graph)
+    times[source] = 0
+    open_list = [(0, source)]
+
+    while open_list:
+        time, current = heapq.heappop(open_list)
+        if time > times[current]:
+            continue # Outdated queue entry
+
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            new_time = time + weights[slot]
+            if new_time < times[neighbor]:
+                times[neighbor] = new_time
+                heapq.heappush(open_list, (new_time, neighbor))
+
+    return times
+
+
+def times_within(graph: "CSRGraph", source: int, budget: float) -> Iterator[Tuple[int, float]]:
+    """
+    This function runs Dijkstra's algorithm from the source station but never goes beyond the
+    time budget, and yields every station as soon as its travel time is final (nearest first).
+    Times are kept in a dict, so the cost depends on the stations reached, not on the network size.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        source (int): The index of the station to start from.
+        budget (float): The maximum travel time.
+
+    Returns:
+        Iterator[Tuple[int, float]]: (station index, travel time) pairs in increasing time order.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    times = {source: 0}
+    open_list = [(0, source)]
+
+    while open_list:
+        time, current = heapq.heappop(open_list)
+        if time > times[current]:
+            continue # Outdated queue entry
+        yield current, time
+
+        for slot in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[slot]
+            new_time = time + weights[slot]
+            if new_time <= budget and new_time < times.get(neighbor, INF):
+                times[neighbor] = new_time
+                heapq.heappush(open_list, (new_time, neighbor))
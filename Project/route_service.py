@@ -0,0 +1,149 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Deque, Dict, List, Tuple
+
+# Route query modes and the MetroNetwork method that answers them
+QUERY_MODES = {
+    "fastest": "find_fastest_route",
+    "least_transfer": "find_least_transfer_route",
+}
+
+
+class LatencyRecorder:
+    """
+    Keeps the latencies of the most recent requests and reports percentiles.
+    """
+
+    def __init__(self, window: int = 10000):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentiles(self, points=(50, 90, 99)) -> Dict[str, float]:
+        """
+        This function returns latency percentiles (nearest-rank method) in milliseconds.
+
+        Args:
+            points (Iterable[int]): The percentiles to report.
+
+        Returns:
+            Dict[str, float]: e.g. {"p50": 0.4, "p90": 1.2, "p99": 3.0}, empty if nothing was recorded.
+        """
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {}
+        result = {}
+        for point in points:
+            rank = max(0, min(len(ordered) - 1, -(-point * len(ordered) // 100) - 1))
+            result[f"p{point}"] = ordered[rank] * 1000
+        return result
+
+
+class RouteService:
+    """
+    Asyncio front-end for route queries on one shared MetroNetwork.
+
+    Searches run in a bounded thread pool (the route searches keep their state per query,
+    so they can share the network). Identical requests that arrive while the same
+    (start_id, dest_id, mode) query is still running are coalesced: they wait for the
+    running computation instead of starting their own.
+    """
+
+    def __init__(self, network: "MetroNetwork", max_workers: int = 4, latency_window: int = 10000):
+        self.network = network
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="route")
+        self.latency = LatencyRecorder(latency_window)
+        self.requests = 0
+        self.computations = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    async def query(self, start_id: str, dest_id: str, mode: str = "fastest"):
+        """
+        This function answers one route request.
+
+        Args:
+            start_id (str): The index of the start station.
+            dest_id (str): The index of the destination station.
+            mode (str): "fastest" or "least_transfer".
+
+        Returns:
+            The result of MetroNetwork.find_fastest_route / find_least_transfer_route.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in QUERY_MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {tuple(QUERY_MODES)}")
+
+        started = time.perf_counter()
+        self.requests += 1
+        key = (start_id, dest_id, mode)
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            search = getattr(self.network, QUERY_MODES[mode])
+            future = loop.run_in_executor(self.executor, search, start_id, dest_id)
+            self.computations += 1
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done, key=key: self._forget(key, done))
+
+        try:
+            # shield: a cancelled client must not cancel the computation other clients wait for
+            result = await asyncio.shield(future)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+        # Every caller gets its own route list
+        return None if result is None else (list(result[0]), result[1])
+
+    def _forget(self, key: Tuple[str, str, str], future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    async def query_many(self, requests: List[Tuple[str, str, str]]) -> list:
+        """
+        This function answers many (start_id, dest_id, mode) requests concurrently.
+        """
+        return await asyncio.gather(*(self.query(*request) for request in requests))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "requests": self.requests,
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "latency_ms": self.latency.percentiles(),
+        }
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "RouteService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Waiting for the workers blocks, so it runs in the default executor and the event loop keeps serving
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+class LocalClient:
+    """
+    In-process client of a RouteService, with the same call shape a remote client would have.
+    """
+
+    def __init__(self, service: RouteService):
+        self.service = service
+
+    async def fastest_route(self, start_id: str, dest_id: str):
+        return await self.service.query(start_id, dest_id, "fastest")
+
+    async def least_transfer_route(self, start_id: str, dest_id: str):
+        return await self.service.query(start_id, dest_id, "least_transfer")
+
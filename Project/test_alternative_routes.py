@@ -0,0 +1,104 @@
+import random
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+from alternative_routes import MAX_PATHS_PER_ROUTE, k_shortest_routes
+
+
+def random_network(rng: random.Random, size: int, connections: int, times) -> MetroNetwork:
+    # Parallel connections and a removed connection (an inf tombstone in the frozen graph) included
+    network = MetroNetwork(cache_size=0)
+    for index in range(size):
+        network.add_station(f"S{index}", f"Station {index}", "Line")
+    for _ in range(connections):
+        first, second = rng.sample(range(size), 2)
+        network.add_connection(f"S{first}", f"S{second}", times())
+    network.freeze()
+    pairs = [(station.idx, neighbor.idx) for station in network.stations.values() for neighbor, _ in station.neighbors]
+    if pairs and rng.random() < 0.5:
+        network.remove_connection(*rng.choice(pairs))
+    return network
+
+
+def simple_paths(graph, start: int, dest: int):
+    # Every loopless route with its time (fastest connection per hop), fastest first
+    fastest = {}
+    for index in range(len(graph)):
+        for neighbor, time in graph.neighbors(index):
+            fastest[index, neighbor] = min(time, fastest.get((index, neighbor), float("inf")))
+    paths = []
+
+    def extend(path, time):
+        if path[-1] == dest:
+            paths.append((time, path))
+            return
+        for (index, neighbor), hop in fastest.items():
+            if index == path[-1] and neighbor not in path:
+                extend(path + [neighbor], time + hop)
+
+    extend([start], 0)
+    paths.sort(key=lambda item: item[0])
+    return paths, fastest
+
+
+def overlap(path, total_time, accepted_path, fastest) -> float:
+    if total_time <= 0:
+        return 1.0
+    shared = {frozenset(hop) for hop in zip(accepted_path, accepted_path[1:])}
+    return sum(fastest[hop] for hop in zip(path, path[1:]) if frozenset(hop) in shared) / total_time
+
+
+class KShortestRoutesTest(unittest.TestCase):
+    def assert_valid(self, routes, start, dest, fastest):
+        self.assertEqual(len({tuple(path) for path, _ in routes}), len(routes))
+        for path, total_time in routes:
+            self.assertEqual((path[0], path[-1]), (start, dest))
+            self.assertEqual(len(set(path)), len(path))
+            self.assertAlmostEqual(sum(fastest[hop] for hop in zip(path, path[1:])), total_time)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(12)
+        for _ in range(150):
+            size = rng.randint(2, 8)
+            network = random_network(rng, size, rng.randint(1, 14), lambda: rng.choice([0, 1, 1, 2, 3, 5]))
+            graph = network.freeze()
+            start, dest = rng.randrange(size), rng.randrange(size)
+            paths, fastest = simple_paths(graph, start, dest)
+            for k in (1, 3, 6):
+                routes = k_shortest_routes(graph, start, dest, k)
+                # Equal times may come in another order, so only the times are compared
+                self.assertEqual([total_time for _, total_time in routes], [time for time, _ in paths[:k]])
+                self.assert_valid(routes, start, dest, fastest)
+
+    def test_max_overlap_matches_brute_force(self):
+        # Times without ties, so the order in which routes are considered is unique
+        rng = random.Random(13)
+        for _ in range(150):
+            size = rng.randint(2, 8)
+            network = random_network(rng, size, rng.randint(1, 14), lambda: round(rng.uniform(0.5, 9.5), 6))
+            graph = network.freeze()
+            start, dest = rng.randrange(size), rng.randrange(size)
+            paths, fastest = simple_paths(graph, start, dest)
+            for k, max_overlap in ((2, 0.0), (3, 0.5), (4, 0.8)):
+                expected = []
+                for time, path in paths[:k * MAX_PATHS_PER_ROUTE]:
+                    if len(expected) < k and all(overlap(path, time, other, fastest) <= max_overlap
+                                                 for other, _ in expected):
+                        expected.append((path, time))
+                routes = k_shortest_routes(graph, start, dest, k, max_overlap)
+                self.assertEqual([path for path, _ in routes], [path for path, _ in expected])
+                self.assert_valid(routes, start, dest, fastest)
+
+    def test_no_route(self):
+        network = MetroNetwork(cache_size=0)
+        for idx in ("A", "B", "C"):
+            network.add_station(idx, idx, "Line")
+        network.add_connection("A", "B", 2)
+        self.assertEqual(network.find_alternative_routes("A", "C"), [])
+        self.assertEqual(network.find_alternative_routes("A", "B", k=0), [])
+        routes = network.find_alternative_routes("A", "A")
+        self.assertEqual([([station.idx for station in route], time) for route, time in routes], [(["A"], 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import random
+import sys
+import threading
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+from route_search import shortest_times_from
+
+
+def random_network(rng: random.Random, size: int, connections: int) -> MetroNetwork:
+    network = MetroNetwork(cache_size=0)
+    for index in range(size):
+        network.add_station(f"S{index}", f"Station {index}", f"Line {index % 3}")
+    for _ in range(connections):
+        first, second = rng.sample(range(size), 2)
+        network.add_connection(f"S{first}", f"S{second}", rng.choice([0, 0, 1, 2, 3, 5]))
+    return network
+
+
+class RepairTest(unittest.TestCase):
+    def assert_matches_recompute(self, network: MetroNetwork) -> None:
+        graph = network.freeze()
+        matrix = network.travel_time_matrix()
+        heuristic = network.landmark_heuristic()
+        for start in range(len(graph)):
+            self.assertEqual(list(matrix.row(start)), list(shortest_times_from(graph, start)))
+        for landmark, table in zip(heuristic.landmarks, heuristic.tables):
+            self.assertEqual(list(table), list(shortest_times_from(graph, landmark)))
+
+    def test_zero_minute_connection_removed(self):
+        network = MetroNetwork(cache_size=0)
+        network.add_station("S0", "Station 0", "Line")
+        network.add_station("S1", "Station 1", "Line")
+        network.add_connection("S0", "S1", 1)
+        network.travel_time_matrix()
+        network.landmark_heuristic()
+
+        network.update_connection_time("S0", "S1", 0)
+        network.remove_connection("S0", "S1")
+
+        self.assertIsNone(network.travel_time("S1", "S0"))
+        self.assertEqual(network.travel_time("S1", "S1"), 0)
+        self.assert_matches_recompute(network)
+
+    def test_random_updates_with_zero_weights(self):
+        rng = random.Random(7)
+        for _ in range(40):
+            network = random_network(rng, rng.randint(2, 12), rng.randint(1, 20))
+            network.travel_time_matrix()
+            network.landmark_heuristic()
+            for _ in range(8):
+                pairs = [(station.idx, neighbor.idx) for station in network.stations.values()
+                         for neighbor, _ in station.neighbors]
+                if not pairs:
+                    break
+                first, second = rng.choice(pairs)
+                action = rng.random()
+                if action < 0.6:
+                    network.update_connection_time(first, second, rng.choice([0, 0, 1, 4, 9]))
+                elif action < 0.9:
+                    network.remove_connection(first, second)
+                else:
+                    network.close_station(first)
+                self.assert_matches_recompute(network)
+
+
+class ConcurrentUpdateTest(unittest.TestCase):
+    def test_queries_during_updates(self):
+        rng = random.Random(11)
+        network = MetroNetwork(cache_size=0)
+        for index in range(80):
+            network.add_station(f"S{index}", f"Station {index}", f"Line {index % 5}")
+        for index in range(1, 80):
+            network.add_connection(f"S{rng.randrange(index)}", f"S{index}", rng.randint(1, 9))
+        for _ in range(80):
+            first, second = rng.sample(range(80), 2)
+            network.add_connection(f"S{first}", f"S{second}", rng.randint(1, 9))
+        pairs = [(station.idx, neighbor.idx) for station in network.stations.values()
+                 for neighbor, _ in station.neighbors]
+        updates = [(*rng.choice(pairs), rng.randint(1, 30)) for _ in range(150)]
+        queries = [(f"S{rng.randrange(80)}", f"S{rng.randrange(80)}") for _ in range(30)]
+
+        # Travel times of the queried pairs in every state the network goes through
+        replica = MetroNetwork(cache_size=0)
+        replica.add_stations((station.idx, station.name, station.line) for station in network.stations.values())
+        replica.add_connections((station.idx, neighbor.idx, time) for station in network.stations.values()
+                                for neighbor, time in station.neighbors if station.index < neighbor.index)
+        valid = {query: set() for query in queries}
+        for update in [None] + updates:
+            if update is not None:
+                replica.update_connection_time(*update)
+            graph = replica.freeze()
+            for start_id, dest_id in queries:
+                valid[start_id, dest_id].add(shortest_times_from(graph, graph.station_ids[start_id])[graph.station_ids[dest_id]])
+
+        network.landmark_heuristic()
+        network.travel_time_matrix()
+        done = threading.Event()
+        wrong = []
+
+        def query_loop():
+            while not done.is_set():
+                for start_id, dest_id in queries:
+                    _, total_time = network.find_fastest_route(start_id, dest_id)
+                    if total_time not in valid[start_id, dest_id]:
+                        wrong.append(("astar", start_id, dest_id, total_time))
+                    total_time = network.travel_time(start_id, dest_id)
+                    if total_time not in valid[start_id, dest_id]:
+                        wrong.append(("matrix", start_id, dest_id, total_time))
+
+        # Switch threads often, so queries run in the middle of the repairs
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-5)
+        threads = [threading.Thread(target=query_loop) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        try:
+            for update in updates:
+                network.update_connection_time(*update)
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(wrong, [])
+        self.assert_current(network, replica)
+
+    def assert_current(self, network: MetroNetwork, replica: MetroNetwork) -> None:
+        graph = replica.freeze()
+        for start_id in ("S0", "S40", "S79"):
+            expected = list(shortest_times_from(graph, graph.station_ids[start_id]))
+            self.assertEqual(list(network.travel_time_matrix().row(network.stations[start_id].index)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
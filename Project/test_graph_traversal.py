@@ -0,0 +1,114 @@
+import random
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+from graph_traversal import bfs, bfs_levels, dfs, hop_distance
+
+# Cyclic graph, None is an ordinary node
+CYCLIC = {
+    "A": ["B", "C"],
+    "B": ["A", "D", None],
+    "C": ["A", "D"],
+    "D": ["B", "C", "E"],
+    "E": ["D", "A"],
+    None: ["B"],
+}
+
+
+def reference_dfs(graph, node, max_depth=None, depth=0, visited=None, order=None):
+    # Recursive preorder depth-first search
+    if visited is None:
+        visited, order = set(), []
+    visited.add(node)
+    order.append((node, depth))
+    if max_depth is None or depth < max_depth:
+        for neighbor in graph.get(node, ()):
+            if neighbor not in visited:
+                reference_dfs(graph, neighbor, max_depth, depth + 1, visited, order)
+    return order
+
+
+def random_graph(rng: random.Random, size: int, edges: int):
+    graph = {node: [] for node in range(size)}
+    for _ in range(edges):
+        first, second = rng.randrange(size), rng.randrange(size)
+        graph[first].append(second)
+        graph[second].append(first)
+    return graph
+
+
+class CountingGraph(dict):
+    # Counts the neighbor lookups, to check that a search stops when the caller stops iterating
+    lookups = 0
+
+    def get(self, node, default=None):
+        self.lookups += 1
+        return super().get(node, default)
+
+
+class TraversalTest(unittest.TestCase):
+    def test_bfs_levels(self):
+        levels = [sorted(level, key=str) for level in bfs_levels(CYCLIC, "A")]
+        self.assertEqual(levels, [["A"], ["B", "C"], ["D", None], ["E"]])
+        self.assertEqual([sorted(level, key=str) for level in bfs_levels(CYCLIC, "A", max_depth=1)],
+                         [["A"], ["B", "C"]])
+        self.assertEqual(list(bfs_levels(CYCLIC, "X")), [["X"]])
+        self.assertEqual(dict(bfs(CYCLIC, "E")), {"E": 0, "D": 1, "A": 1, "B": 2, "C": 2, None: 3})
+
+    def test_bfs_stops_with_the_caller(self):
+        graph = CountingGraph(CYCLIC)
+        levels = bfs_levels(graph, "A")
+        self.assertEqual(next(levels), ["A"])
+        self.assertEqual(graph.lookups, 0)
+        next(levels)
+        self.assertEqual(graph.lookups, 1)
+
+    def test_dfs_on_cyclic_graphs(self):
+        for source in CYCLIC:
+            for max_depth in (None, 0, 1, 2):
+                self.assertEqual(list(dfs(CYCLIC, source, max_depth)), reference_dfs(CYCLIC, source, max_depth))
+        rng = random.Random(8)
+        for _ in range(50):
+            graph = random_graph(rng, rng.randint(1, 30), rng.randint(0, 60))
+            source = rng.randrange(len(graph))
+            order = list(dfs(graph, source))
+            self.assertEqual(order, reference_dfs(graph, source))
+            self.assertEqual(len({node for node, _ in order}), len(order)) # Every node once
+
+    def test_deep_graph(self):
+        # Deeper than the recursion limit
+        chain = {node: [node + 1] for node in range(5000)}
+        self.assertEqual(list(dfs(chain, 0))[-1], (5000, 5000))
+
+    def test_hop_distance(self):
+        self.assertEqual(hop_distance(CYCLIC, "A", "A"), 0)
+        self.assertEqual(hop_distance(CYCLIC, "A", "E"), 3)
+        self.assertEqual(hop_distance(CYCLIC, "A", "E", max_depth=3), 3)
+        self.assertIsNone(hop_distance(CYCLIC, "A", "E", max_depth=2))
+        self.assertIsNone(hop_distance(CYCLIC, "A", "X"))
+        self.assertIsNone(hop_distance({"A": [], "B": []}, "A", "B"))
+
+    def test_csr_graph_matches_dict_graph(self):
+        rng = random.Random(6)
+        network = MetroNetwork(cache_size=0)
+        for index in range(40):
+            network.add_station(f"S{index}", f"Station {index}", "Line")
+        for _ in range(60):
+            first, second = rng.sample(range(40), 2)
+            network.add_connection(f"S{first}", f"S{second}", rng.randint(1, 5))
+        network.remove_connection(*rng.choice([(station.idx, neighbor.idx) for station in network.stations.values()
+                                               for neighbor, _ in station.neighbors]))
+        graph = network.freeze()
+        adjacency = {station.index: [neighbor.index for neighbor, _ in station.neighbors]
+                     for station in network.stations.values()}
+        for source in range(0, 40, 7):
+            for max_depth in (None, 2):
+                self.assertEqual([sorted(level) for level in bfs_levels(graph, source, max_depth)],
+                                 [sorted(level) for level in bfs_levels(adjacency, source, max_depth)])
+                self.assertEqual(list(dfs(graph, source, max_depth)), reference_dfs(adjacency, source, max_depth))
+            for dest in range(40):
+                self.assertEqual(hop_distance(graph, source, dest, 3), hop_distance(adjacency, source, dest, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+from metro_simulation import MetroAgi
+from network_snapshot import open_snapshot_graph
+from route_search import shortest_times_from
+
+
+def adjacency(network: MetroNetwork):
+    return {station.idx: sorted((neighbor.idx, time) for neighbor, time in station.neighbors)
+            for station in network.stations.values()}
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(4)
+        self.network = MetroNetwork(cache_size=0)
+        for index in range(30):
+            self.network.add_station(f"S{index}", f"Station {index}", f"Line {index % 3}")
+        for _ in range(50):
+            first, second = rng.sample(range(30), 2)
+            self.network.add_connection(f"S{first}", f"S{second}", rng.randint(1, 9))
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "network.snapshot")
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(os.remove, self.path)
+        self.network.save(self.path)
+
+    def test_neighbors_are_readable_after_load(self):
+        loaded = MetroNetwork.load(self.path)
+        self.assertEqual(adjacency(loaded), adjacency(self.network))
+
+    def test_turkish_adapter_sees_the_neighbors(self):
+        loaded = MetroAgi.load(self.path)
+        for station in self.network.stations.values():
+            komsular = sorted((komsu.idx, sure) for komsu, sure in loaded.istasyonlar[station.idx].komsular)
+            self.assertEqual(komsular, sorted((neighbor.idx, time) for neighbor, time in station.neighbors))
+
+    def test_change_after_partly_read_neighbors(self):
+        loaded = MetroNetwork.load(self.path)
+        station = loaded.stations["S0"]
+        neighbor, _ = station.neighbors[0]
+        loaded.remove_connection("S0", neighbor.idx)
+        self.network.remove_connection("S0", neighbor.idx)
+        self.assertEqual(adjacency(loaded), adjacency(self.network))
+        for dest_id in self.network.stations:
+            expected = self.network.find_fastest_route("S0", dest_id)
+            result = loaded.find_fastest_route("S0", dest_id)
+            self.assertEqual(None if result is None else result[1], None if expected is None else expected[1])
+
+    def test_graph_without_stations(self):
+        graph = open_snapshot_graph(self.path)
+        frozen = self.network.freeze()
+        self.assertEqual((len(graph), graph.num_edges, graph.stations), (len(frozen), frozen.num_edges, []))
+        for source in (0, 7, 29):
+            self.assertEqual(list(shortest_times_from(graph, source)), list(shortest_times_from(frozen, source)))
+
+    def test_many_to_many_workers(self):
+        start_ids = [f"S{index}" for index in range(0, 30, 3)]
+        dest_ids = [f"S{index}" for index in range(30)]
+        self.assertEqual(self.network.many_to_many(start_ids, dest_ids, workers=2),
+                         self.network.many_to_many(start_ids, dest_ids, workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
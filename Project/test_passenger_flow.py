@@ -0,0 +1,72 @@
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+from passenger_flow import PassengerFlowSimulation
+
+
+def small_network() -> MetroNetwork:
+    # Line 1 A-B-C-D, line 2 E-K-F, a walk between C and K, and G that no route reaches
+    network = MetroNetwork(cache_size=0)
+    for idx, line in (("A", "1"), ("B", "1"), ("C", "1"), ("D", "1"), ("E", "2"), ("K", "2"), ("F", "2"), ("G", "3")):
+        network.add_station(idx, idx, f"Line {line}")
+    for first, second, minutes in (("A", "B", 2), ("B", "C", 3), ("C", "D", 2), ("E", "K", 2), ("K", "F", 3),
+                                   ("C", "K", 1)):
+        network.add_connection(first, second, minutes)
+    return network
+
+
+DEMAND = [("A", "D", 600), ("A", "F", 300), ("E", "B", 240), ("F", "A", 120), ("D", "C", 60), ("A", "G", 30)]
+
+
+class PassengerFlowTest(unittest.TestCase):
+    def assert_conserved(self, result) -> None:
+        self.assertEqual(result.completed + result.unroutable + result.waiting + result.riding + result.walking,
+                         result.generated)
+        self.assertEqual(result.waiting + result.riding + result.walking, result.in_system)
+
+    def test_same_seed_same_run(self):
+        network = small_network()
+        first = network.simulate_passenger_flow(DEMAND, 90, seed=3)
+        second = network.simulate_passenger_flow(DEMAND, 90, seed=3)
+        other = network.simulate_passenger_flow(DEMAND, 90, seed=4)
+        self.assertEqual(first.as_dict(), second.as_dict())
+        self.assertEqual(first.peak_waiting, second.peak_waiting)
+        self.assertEqual(first.segment_peak_load, second.segment_peak_load)
+        self.assertNotEqual(first.as_dict(), other.as_dict())
+
+    def test_riders_are_conserved(self):
+        network = small_network()
+        for seed in range(5):
+            for minutes in (1, 7, 45, 120):
+                result = network.simulate_passenger_flow(DEMAND, minutes, seed=seed, default_capacity=40)
+                self.assert_conserved(result)
+        # Mostly walking and unroutable riders, and riders still on the move at the end
+        result = network.simulate_passenger_flow(DEMAND, 30, seed=1, default_headway=20)
+        self.assert_conserved(result)
+        self.assertGreater(result.unroutable, 0)
+        self.assertGreater(result.in_system, 0)
+
+    def test_capacity(self):
+        network = small_network()
+        result = network.simulate_passenger_flow(DEMAND, 120, seed=2, capacities={"Line 1": 15}, default_headway=6)
+        self.assert_conserved(result)
+        self.assertGreater(result.denied_boardings, 0)
+        self.assertLessEqual(max(result.segment_peak_load.values()), 1.0)
+        self.assertEqual(result.line_peak_load()["Line 1"], 1.0)
+
+        roomy = network.simulate_passenger_flow(DEMAND, 120, seed=2, default_headway=6)
+        self.assertEqual(roomy.denied_boardings, 0)
+        self.assertLess(roomy.line_peak_load()["Line 1"], 1.0)
+
+    def test_invalid_arguments(self):
+        network = small_network()
+        with self.assertRaises(ValueError):
+            PassengerFlowSimulation(network, DEMAND, step=0)
+        with self.assertRaises(ValueError):
+            PassengerFlowSimulation(network, DEMAND, capacities={"Line 2": 0})
+        with self.assertRaises(KeyError):
+            PassengerFlowSimulation(network, [("A", "X", 10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import random
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import FASTEST_ROUTE_METHODS, MetroNetwork
+from route_search import pareto_routes, shortest_times_from
+
+
+def random_network(rng: random.Random, size: int, connections: int) -> MetroNetwork:
+    # Few connections per station, so some pairs are not connected at all
+    network = MetroNetwork(cache_size=0)
+    for index in range(size):
+        network.add_station(f"S{index}", f"Station {index}", f"Line {index % 4}")
+    for _ in range(connections):
+        first, second = rng.sample(range(size), 2)
+        network.add_connection(f"S{first}", f"S{second}", rng.randint(1, 9))
+    return network
+
+
+def route_time(route) -> int:
+    total = 0
+    for station, following in zip(route, route[1:]):
+        total += min(time for neighbor, time in station.neighbors if neighbor is following)
+    return total
+
+
+class FastestRouteTest(unittest.TestCase):
+    def test_methods_agree_with_dijkstra(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            size = rng.randint(2, 40)
+            network = random_network(rng, size, rng.randint(size // 2, 2 * size))
+            graph = network.freeze()
+            for _ in range(20):
+                start_id, dest_id = rng.choice(list(network.stations)), rng.choice(list(network.stations))
+                expected = shortest_times_from(graph, network.stations[start_id].index)[network.stations[dest_id].index]
+                for method in FASTEST_ROUTE_METHODS:
+                    result = network.find_fastest_route(start_id, dest_id, method)
+                    if expected == float("inf"):
+                        self.assertIsNone(result, method)
+                        continue
+                    route, total_time = result
+                    self.assertEqual(total_time, expected, method)
+                    self.assertEqual((route[0].idx, route[-1].idx), (start_id, dest_id), method)
+                    self.assertEqual(route_time(route), total_time, method)
+
+    def test_start_is_destination(self):
+        network = random_network(random.Random(1), 10, 15)
+        for method in FASTEST_ROUTE_METHODS:
+            route, total_time = network.find_fastest_route("S4", "S4", method)
+            self.assertEqual([station.idx for station in route], ["S4"], method)
+            self.assertEqual(total_time, 0, method)
+
+    def test_unreachable_and_unknown_stations(self):
+        network = MetroNetwork(cache_size=0)
+        for idx in ("A", "B", "C", "D"):
+            network.add_station(idx, idx, "Line")
+        network.add_connection("A", "B", 3)
+        network.add_connection("C", "D", 4)
+        for method in FASTEST_ROUTE_METHODS:
+            self.assertIsNone(network.find_fastest_route("A", "D", method), method)
+            self.assertIsNone(network.find_fastest_route("A", "X", method), method)
+            self.assertEqual(network.find_fastest_route("C", "D", method)[1], 4, method)
+
+    def test_unknown_method(self):
+        network = random_network(random.Random(2), 5, 5)
+        with self.assertRaises(ValueError):
+            network.find_fastest_route("S0", "S1", "dfs")
+
+
+def brute_force_front(graph, start: int, dest: int):
+    # (time, transfers) of every loopless route, reduced to the non-dominated pairs
+    fastest = {}
+    for index in range(len(graph)):
+        for neighbor, time in graph.neighbors(index):
+            fastest[index, neighbor] = min(time, fastest.get((index, neighbor), float("inf")))
+    values = set()
+
+    def extend(path, time, transfers):
+        current = path[-1]
+        if current == dest:
+            values.add((time, transfers))
+            return
+        for (index, neighbor), hop in fastest.items():
+            if index == current and neighbor not in path:
+                change = graph.station_lines[neighbor] != graph.station_lines[current]
+                extend(path + [neighbor], time + hop, transfers + change)
+
+    extend([start], 0, 0)
+    return sorted(value for value in values
+                  if not any(other != value and other[0] <= value[0] and other[1] <= value[1] for other in values))
+
+
+class ParetoRoutesTest(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(14)
+        for _ in range(60):
+            size = rng.randint(2, 8)
+            network = MetroNetwork(cache_size=0)
+            for index in range(size):
+                network.add_station(f"S{index}", f"Station {index}", f"Line {rng.randrange(3)}")
+            for _ in range(rng.randint(1, 14)):
+                first, second = rng.sample(range(size), 2)
+                # Few distinct times, so routes often tie in time or in transfers
+                network.add_connection(f"S{first}", f"S{second}", rng.choice([0, 1, 2, 4, 8]))
+            graph = network.freeze()
+
+            for start in range(size):
+                for dest in range(size):
+                    routes = pareto_routes(graph, start, dest)
+                    self.assertEqual([(time, transfers) for _, time, transfers in routes],
+                                     brute_force_front(graph, start, dest))
+                    for route, total_time, transfers in routes:
+                        self.assertEqual((route[0], route[-1]), (start, dest))
+                        stations = [graph.stations[index] for index in route]
+                        self.assertEqual(route_time(stations), total_time)
+                        self.assertEqual(sum(first.line != second.line
+                                             for first, second in zip(stations, stations[1:])), transfers)
+
+if __name__ == "__main__":
+    unittest.main()
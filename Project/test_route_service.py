@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+from route_service import LatencyRecorder, LocalClient, RouteService
+
+
+class GatedNetwork(MetroNetwork):
+    # find_fastest_route waits for the gate, so a test decides when the computation finishes
+    def __init__(self):
+        super().__init__(cache_size=0)
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.gate_opened = None
+        for idx in ("A", "B", "C"):
+            self.add_station(idx, idx, "Line")
+        self.add_connection("A", "B", 2)
+        self.add_connection("B", "C", 3)
+
+    def find_fastest_route(self, start_id, dest_id, method="astar", stats=None):
+        self.started.set()
+        self.gate_opened = self.gate.wait(timeout=2)
+        return super().find_fastest_route(start_id, dest_id, method, stats)
+
+
+async def wait_until_started(network: GatedNetwork) -> None:
+    await asyncio.get_running_loop().run_in_executor(None, network.started.wait, 2)
+
+
+class RouteServiceTest(unittest.TestCase):
+    def test_identical_requests_are_coalesced(self):
+        async def scenario():
+            network = GatedNetwork()
+            async with RouteService(network) as service:
+                client = LocalClient(service)
+                tasks = [asyncio.ensure_future(client.fastest_route("A", "C")) for _ in range(50)]
+                await wait_until_started(network)
+                network.gate.set()
+                results = await asyncio.gather(*tasks)
+            return service, results
+
+        service, results = asyncio.run(scenario())
+        stats = service.stats()
+        self.assertEqual((stats["requests"], stats["computations"], stats["coalesced"]), (50, 1, 49))
+        self.assertEqual(stats["in_flight"], 0)
+        for route, total_time in results:
+            self.assertEqual(([station.idx for station in route], total_time), (["A", "B", "C"], 5))
+        # Every caller gets its own list
+        self.assertEqual(len({id(route) for route, _ in results}), 50)
+
+    def test_cancelled_waiter_does_not_cancel_the_others(self):
+        async def scenario():
+            network = GatedNetwork()
+            async with RouteService(network) as service:
+                client = LocalClient(service)
+                tasks = [asyncio.ensure_future(client.fastest_route("A", "C")) for _ in range(3)]
+                await wait_until_started(network)
+                tasks[0].cancel()
+                network.gate.set()
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+            return service, results
+
+        service, results = asyncio.run(scenario())
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+        for route, total_time in results[1:]:
+            self.assertEqual(([station.idx for station in route], total_time), (["A", "B", "C"], 5))
+        self.assertEqual(service.stats()["computations"], 1)
+
+    def test_percentiles(self):
+        recorder = LatencyRecorder()
+        self.assertEqual(recorder.percentiles(), {})
+        for millisecond in range(1, 101):
+            recorder.record(millisecond / 1000)
+        percentiles = recorder.percentiles((1, 50, 90, 99, 100))
+        self.assertEqual({point: round(value, 6) for point, value in percentiles.items()},
+                         {"p1": 1, "p50": 50, "p90": 90, "p99": 99, "p100": 100})
+
+        recorder = LatencyRecorder(window=3)
+        for seconds in (9.0, 0.001, 0.002, 0.003):
+            recorder.record(seconds) # The first sample falls out of the window
+        self.assertAlmostEqual(recorder.percentiles((100,))["p100"], 3)
+        self.assertAlmostEqual(recorder.percentiles((0,))["p0"], 1)
+
+    def test_exit_closes_the_executor_without_blocking_the_loop(self):
+        async def open_gate(network: GatedNetwork):
+            await wait_until_started(network)
+            await asyncio.sleep(0.05)
+            network.gate.set()
+
+        async def scenario():
+            network = GatedNetwork()
+            async with RouteService(network) as service:
+                query = asyncio.ensure_future(service.query("A", "C"))
+                await wait_until_started(network)
+                # Still running when the service closes: __aexit__ waits for it while open_gate runs on the loop
+                opener = asyncio.ensure_future(open_gate(network))
+            await opener
+            return network, service, await query
+
+        network, service, result = asyncio.run(scenario())
+        self.assertTrue(network.gate_opened) # Opened by the loop, not by the timeout
+        self.assertEqual(result[1], 5)
+        with self.assertRaises(RuntimeError):
+            service.executor.submit(print)
+
+
+if __name__ == "__main__":
+    unittest.main()
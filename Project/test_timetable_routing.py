@@ -0,0 +1,37 @@
+import unittest
+
+from MuhammedMusabKaya_MetroSimulation import MetroNetwork
+
+
+def chained_transfers() -> MetroNetwork:
+    # Three lines whose first stations are only linked through a chain of two transfer connections
+    network = MetroNetwork(cache_size=0)
+    for line in "XYZ":
+        network.add_station(f"{line}1", f"{line} 1", f"Line {line}")
+        network.add_station(f"{line}2", f"{line} 2", f"Line {line}")
+        network.add_connection(f"{line}1", f"{line}2", 3)
+    network.add_connection("X1", "Y1", 2)
+    network.add_connection("Y1", "Z1", 2)
+    return network
+
+
+class EarliestArrivalTest(unittest.TestCase):
+    def test_walks_over_several_transfers(self):
+        network = chained_transfers()
+        route, arrival = network.earliest_arrival("X1", "Z1", 480)
+        self.assertEqual(arrival, 484)
+        self.assertEqual((route[0].idx, route[-1].idx), ("X1", "Z1"))
+
+    def test_trains_around_a_transfer_chain(self):
+        network = chained_transfers()
+        network.build_timetable(default_headway=5, service_start=480)
+        _, fastest = network.find_fastest_route("X2", "Z2")
+        route, arrival = network.earliest_arrival("X2", "Z2", 480)
+        self.assertEqual((route[0].idx, route[-1].idx), ("X2", "Z2"))
+        self.assertGreaterEqual(arrival - 480, fastest)
+        # Leaves X2 at once, walks X1 -> Z1 and waits at most one headway there
+        self.assertLessEqual(arrival, 480 + fastest + 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+from array import array
+from bisect import bisect_left
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+INF = float("inf")
+
+# Service day in minutes after midnight
+SERVICE_START = 6 * 60
+SERVICE_END = 24 * 60
+DEFAULT_HEADWAY = 5
+
+
+class Timetable:
+    """
+    Elementary connections of every train of the day, for the Connection Scan Algorithm (CSA).
+
+    Connection `i` is one train running from `departure_stops[i]` at `departure_times[i]` to
+    `arrival_stops[i]` at `arrival_times[i]` without stopping; all arrays are sorted by departure
+    time. Footpaths are the connections of the network that no line runs over (e.g. the transfer
+    connection between the two Kızılay stations); they can be walked at any time.
+    """
+
+    def __init__(self, version: int, departure_times: array, arrival_times: array, departure_stops: array,
+                 arrival_stops: array, trips: array, footpaths: List[List[Tuple[int, float]]], num_trips: int,
+                 parameters: Optional[Dict[str, object]] = None):
+        # Graph version the timetable was built for (see MetroNetwork.version)
+        self.version = version
+        self.departure_times = departure_times
+        self.arrival_times = arrival_times
+        self.departure_stops = departure_stops
+        self.arrival_stops = arrival_stops
+        self.trips = trips
+        # footpaths[stop] = [(other stop, walking minutes), ...]
+        self.footpaths = footpaths
+        self.num_trips = num_trips
+        # Arguments of build_timetable, so the timetable can be generated again after a network change
+        self.parameters = parameters or {}
+
+    def __len__(self) -> int:
+        return len(self.departure_times)
+
+    def earliest_arrival(self, start: int, dest: int, departure_time: float) -> Optional[Tuple[List[int], float]]:
+        """
+        This function finds the earliest arrival at the destination when leaving the start station
+        at the departure time. The connections departing after that time are scanned once, in order,
+        and the scan stops as soon as a connection departs after the best known arrival.
+
+        Args:
+            start (int): The index of the start station.
+            dest (int): The index of the destination station.
+            departure_time (float): Minutes after midnight.
+
+        Returns:
+            Optional[Tuple[List[int], float]]: (station indices, arrival time in minutes after midnight)
+            or None if the destination cannot be reached that day.
+        """
+        earliest: Dict[int, float] = {start: departure_time}
+        parents: Dict[int, int] = {}
+        reached_trips = bytearray(self.num_trips)
+
+        for neighbor, minutes in self.footpaths[start]:
+            if departure_time + minutes < earliest.get(neighbor, INF):
+                earliest[neighbor] = departure_time + minutes
+                parents[neighbor] = start
+
+        departure_times = self.departure_times
+        arrival_times = self.arrival_times
+        departure_stops = self.departure_stops
+        arrival_stops = self.arrival_stops
+        trips = self.trips
+        footpaths = self.footpaths
+
+        for connection in range(bisect_left(departure_times, departure_time), len(departure_times)):
+            departure = departure_times[connection]
+            if departure >= earliest.get(dest, INF):
+                break # Every later train leaves after we have already arrived
+
+            trip = trips[connection]
+            if not reached_trips[trip]:
+                if earliest.get(departure_stops[connection], INF) > departure:
+                    continue # This train cannot be caught
+                reached_trips[trip] = 1
+
+            arrival = arrival_times[connection]
+            stop = arrival_stops[connection]
+            if arrival < earliest.get(stop, INF):
+                earliest[stop] = arrival
+                parents[stop] = departure_stops[connection]
+                for neighbor, minutes in footpaths[stop]:
+                    if arrival + minutes < earliest.get(neighbor, INF):
+                        earliest[neighbor] = arrival + minutes
+                        parents[neighbor] = stop
+
+        if dest not in earliest:
+            return None
+
+        # Every parent was reached no later than the train or walk that left it, so the chain is a valid journey
+        path = [dest]
+        while path[-1] != start and len(path) <= len(parents):
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path, earliest[dest]
+
+
+def line_segments(network: "MetroNetwork") -> Dict[str, List[List[Tuple[int, int, float]]]]:
+    """
+    This function follows every line in the order of MetroNetwork.lines and returns its runs of
+    consecutive stations that are connected, as (from index, to index, minutes) segments.
+    """
+    graph = network.freeze()
+    runs: Dict[str, List[List[Tuple[int, int, float]]]] = {}
+    for line, stations in network.lines.items():
+        line_runs = []
+        current_run: List[Tuple[int, int, float]] = []
+        for first, second in zip(stations, stations[1:]):
+            times = [time for neighbor, time in graph.neighbors(first.index) if neighbor == second.index]
+            if times:
+                current_run.append((first.index, second.index, min(times)))
+            elif current_run:
+                line_runs.append(current_run)
+                current_run = []
+        if current_run:
+            line_runs.append(current_run)
+        runs[line] = line_runs
+    return runs
+
+
+def close_footpaths(transfers: List[List[Tuple[int, float]]]) -> List[List[Tuple[int, float]]]:
+    """
+    This function makes the footpaths transitively closed, as the Connection Scan Algorithm assumes:
+    a stop gets a footpath to every stop it can walk to over several transfer connections, with the
+    shortest walking time. One small Dijkstra runs per stop, over transfer connections only.
+    A journey lists the stop where a walk starts and the stop where it ends.
+
+    Args:
+        transfers (List[List[Tuple[int, float]]]): (other stop, minutes) per stop, the walkable connections.
+
+    Returns:
+        List[List[Tuple[int, float]]]: (other stop, walking minutes) per stop, the stop itself excluded.
+    """
+    footpaths: List[List[Tuple[int, float]]] = [[] for _ in range(len(transfers))]
+    for start, direct in enumerate(transfers):
+        if not direct:
+            continue
+        times = {start: 0}
+        open_list = [(0, start)]
+        while open_list:
+            time, current = heapq.heappop(open_list)
+            if time > times[current]:
+                continue
+            if current != start:
+                footpaths[start].append((current, time))
+            for neighbor, minutes in transfers[current]:
+                if time + minutes < times.get(neighbor, INF):
+                    times[neighbor] = time + minutes
+                    heapq.heappush(open_list, (time + minutes, neighbor))
+    return footpaths
+
+
+def build_timetable(network: "MetroNetwork", headways: Optional[Dict[str, float]] = None,
+                    default_headway: float = DEFAULT_HEADWAY, service_start: float = SERVICE_START,
+                    service_end: float = SERVICE_END) -> Timetable:
+    """
+    This function generates the trains of every line for one service day and sorts their connections.
+
+    A line runs along its stations in the order they were added to MetroNetwork.lines, in both
+    directions, every `headway` minutes from service_start until service_end (last departure
+    from the first station). Connections between stations that are not consecutive on a line
+    become footpaths.
+
+    Args:
+        network (MetroNetwork): The network.
+        headways (Dict[str, float], optional): Minutes between two trains, per line name.
+        default_headway (float): Headway of lines missing from headways.
+        service_start (float): First departure, minutes after midnight.
+        service_end (float): Last departure, minutes after midnight.
+
+    Returns:
+        Timetable: The timetable, tagged with the current network version.
+    """
+    headways = headways or {}
+    rows: List[Tuple[float, float, int, int, int]] = [] # (departure, arrival, from, to, trip)
+    line_pairs = set()
+    num_trips = 0
+
+    for line, runs in line_segments(network).items():
+        headway = headways.get(line, default_headway)
+        if headway <= 0:
+            raise ValueError(f"Headway of {line} must be positive")
+
+        for run in runs:
+            backward = [(second, first, minutes) for first, second, minutes in reversed(run)]
+            for first, second, _ in run:
+                line_pairs.add((first, second))
+                line_pairs.add((second, first))
+
+            for segments in (run, backward):
+                start_time = service_start
+                while start_time <= service_end:
+                    time = start_time
+                    for first, second, minutes in segments:
+                        rows.append((time, time + minutes, first, second, num_trips))
+                        time += minutes
+                    num_trips += 1
+                    start_time += headway
+
+    rows.sort()
+
+    graph = network.freeze()
+    transfers: List[List[Tuple[int, float]]] = [[] for _ in range(len(graph))]
+    for station in range(len(graph)):
+        for neighbor, time in graph.neighbors(station):
+            if (station, neighbor) not in line_pairs:
+                transfers[station].append((neighbor, time))
+    footpaths = close_footpaths(transfers)
+
+    return Timetable(graph.version,
+                     array("d", (row[0] for row in rows)),
+                     array("d", (row[1] for row in rows)),
+                     array("i", (row[2] for row in rows)),
+                     array("i", (row[3] for row in rows)),
+                     array("i", (row[4] for row in rows)),
+                     footpaths, num_trips,
+                     {"headways": headways, "default_headway": default_headway,
+                      "service_start": service_start, "service_end": service_end})
@@ -0,0 +1,211 @@
+from array import array
+import ast
+import json
+import mmap
+import os
+import sys
+from typing import List, Optional
+
+from dynamic_updates import repair_distances
+from route_search import shortest_times_from
+
+INF = float("inf")
+
+# .npy format version 1.0, see numpy.lib.format; the file can also be opened with numpy.load(path, mmap_mode="r")
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_DESCR = "<f8" if sys.byteorder == "little" else ">f8"
+
+
+class TravelTimeMatrix:
+    """
+    Fastest travel time between every pair of stations.
+
+    Row `i` holds the times from the station with index `i`, so a lookup is a single
+    array access. The matrix is either kept in memory or memory-mapped from a `.npy` file,
+    in which case rows are paged in by the operating system only when they are used.
+    """
+
+    def __init__(self, station_ids: List[str], version: int, fingerprint: str, times,
+                 mapped: Optional[mmap.mmap] = None):
+        self.station_ids = station_ids
+        # Network version the matrix was computed for (see MetroNetwork.version)
+        self.version = version
+        # Hash of the graph the matrix was computed for (see CSRGraph.fingerprint)
+        self.fingerprint = fingerprint
+        # Flat row-major n x n array of doubles (array or memoryview over the mapped file)
+        self.times = times
+        self._mapped = mapped
+        self._size = len(station_ids)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def time(self, start: int, dest: int) -> float:
+        """
+        This function returns the fastest travel time between two stations.
+
+        Args:
+            start (int): The index of the start station.
+            dest (int): The index of the destination station.
+
+        Returns:
+            float: The travel time, or inf if the destination cannot be reached.
+        """
+        return self.times[start * self._size + dest]
+
+    def row(self, start: int):
+        """
+        This function returns the travel times from one station to every station (without copying).
+
+        Args:
+            start (int): The index of the start station.
+        """
+        return memoryview(self.times)[start * self._size:(start + 1) * self._size]
+
+    def copy(self) -> "TravelTimeMatrix":
+        """
+        This function returns an in-memory copy of the matrix, to be repaired while lookups keep
+        using this one. A matrix mapped from disk is read into memory: the file stays the cache of
+        the graph it was computed for.
+        """
+        times = array("d")
+        times.frombytes(memoryview(self.times).cast("B"))
+        return TravelTimeMatrix(self.station_ids, self.version, self.fingerprint, times)
+
+    def repair(self, graph: "CSRGraph", u: int, v: int, old_time: float, new_time: float) -> None:
+        """
+        This function updates every row after the time of the connection u-v changed
+        (see dynamic_updates.repair_distances). A matrix mapped from disk is copied into memory
+        first: the file stays the cache of the graph it was computed for.
+
+        Args:
+            graph (CSRGraph): The network, already holding the new time.
+            u (int): The index of one end of the connection.
+            v (int): The index of the other end of the connection.
+            old_time (float): The previous travel time.
+            new_time (float): The new travel time (inf if removed).
+        """
+        if self._mapped is not None:
+            times = array("d", self.times)
+            self.close()
+            self.times = times
+            self._mapped = None
+        for start in range(self._size):
+            repair_distances(graph, self.row(start), start, u, v, old_time, new_time)
+
+    def save(self, path: str) -> None:
+        """
+        This function writes the matrix to a `.npy` file and the station order to `<path>.json`.
+
+        Args:
+            path (str): The path of the `.npy` file.
+        """
+        with open(path, "wb") as file:
+            write_npy_header(file, self._size)
+            file.write(memoryview(self.times).cast("B"))
+        write_metadata(path, self.station_ids, self.fingerprint)
+
+    def close(self) -> None:
+        """
+        This function releases the memory map of a matrix opened from disk.
+        """
+        if self._mapped is not None:
+            try:
+                self.times.release()
+                self._mapped.close()
+            except BufferError:
+                return # Rows are still in use, the mapping is closed when they are garbage collected
+            self._mapped = None
+
+
+def write_npy_header(file, size: int) -> None:
+    """
+    This function writes a `.npy` header for a size x size matrix of doubles.
+    The header is padded so the data starts at a 64-byte boundary.
+
+    Args:
+        file (BinaryIO): The opened output file.
+        size (int): The number of stations.
+    """
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d, %d), }" % (NPY_DESCR, size, size)
+    padding = 64 - (len(NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = header + " " * (padding % 64) + "\n"
+    file.write(NPY_MAGIC)
+    file.write(len(header).to_bytes(2, "little"))
+    file.write(header.encode("latin1"))
+
+
+def write_metadata(path: str, station_ids: List[str], fingerprint: str) -> None:
+    with open(path + ".json", "w", encoding="utf-8") as file:
+        json.dump({"fingerprint": fingerprint, "stations": station_ids}, file)
+
+
+def build_travel_time_matrix(graph: "CSRGraph", path: Optional[str] = None) -> TravelTimeMatrix:
+    """
+    This function computes the all-pairs travel time matrix with one Dijkstra run per station
+    over the CSR arrays. When a path is given, every row is streamed to the `.npy` file as soon
+    as it is computed and the result is memory-mapped, so the whole matrix never has to fit in RAM.
+
+    Args:
+        graph (CSRGraph): The frozen network.
+        path (str, optional): The `.npy` file to write the matrix to.
+
+    Returns:
+        TravelTimeMatrix: The matrix, tagged with the version of the graph.
+    """
+    station_ids = [station.idx for station in graph.stations]
+    fingerprint = graph.fingerprint()
+
+    if path is None:
+        times = array("d")
+        for source in range(len(graph)):
+            times.extend(shortest_times_from(graph, source))
+        return TravelTimeMatrix(station_ids, graph.version, fingerprint, times)
+
+    with open(path, "wb") as file:
+        write_npy_header(file, len(graph))
+        for source in range(len(graph)):
+            shortest_times_from(graph, source).tofile(file)
+    write_metadata(path, station_ids, fingerprint)
+
+    return open_travel_time_matrix(path, graph.version)
+
+
+def open_travel_time_matrix(path: str, version: int = -1) -> TravelTimeMatrix:
+    """
+    This function memory-maps a matrix written by build_travel_time_matrix or TravelTimeMatrix.save.
+
+    Args:
+        path (str): The path of the `.npy` file.
+        version (int, optional): The network version to tag the matrix with, once the caller
+            has checked that the fingerprint matches its graph.
+
+    Returns:
+        TravelTimeMatrix: The memory-mapped matrix.
+
+    Raises:
+        ValueError: If the file is not a matrix of doubles in the native byte order.
+    """
+    with open(path + ".json", encoding="utf-8") as file:
+        metadata = json.load(file)
+    station_ids = metadata["stations"]
+    size = len(station_ids)
+
+    with open(path, "rb") as file:
+        if file.read(len(NPY_MAGIC)) != NPY_MAGIC:
+            raise ValueError(f"{path} is not a .npy version 1.0 file")
+        header_length = int.from_bytes(file.read(2), "little")
+        header = ast.literal_eval(file.read(header_length).decode("latin1"))
+        if header["descr"] != NPY_DESCR or header["fortran_order"] or header["shape"] != (size, size):
+            raise ValueError(f"{path} does not hold a {size} x {size} native float64 matrix")
+
+        data_offset = len(NPY_MAGIC) + 2 + header_length
+        if size == 0:
+            return TravelTimeMatrix(station_ids, version, metadata["fingerprint"], array("d"))
+        if os.fstat(file.fileno()).st_size < data_offset + 8 * size * size:
+            raise ValueError(f"{path} is truncated")
+
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    times = memoryview(mapped)[data_offset:data_offset + 8 * size * size].cast("d")
+    return TravelTimeMatrix(station_ids, version, metadata["fingerprint"], times, mapped)